@@ -0,0 +1,247 @@
+import multiprocessing
+import os
+import pandas
+import pathlib
+import sys
+
+from vtam.utils.FileManifest import FileManifest
+from vtam.utils.FileParams import FileParams
+from vtam.utils.FileSampleInformation import FileSampleInformation
+from vtam.utils.LineCounter import LineCounter
+from vtam.utils.RunnerJobPool import RunnerJobPool
+from vtam.utils.RunnerVSearch import RunnerVSearch
+from vtam.utils.SummaryFileMerge import SummaryFileMerge
+from vtam.utils.VTAMexception import VTAMexception
+from vtam.utils.Logger import Logger
+from vtam.utils.FileCompression import FileCompression
+
+
+class CommandMerge(object):
+    """Class for the Merge command"""
+
+    @staticmethod
+    def main(fastqinfo, fastqdir, fastainfo, fastadir, params=None, num_threads=multiprocessing.cpu_count(),
+             forceall=False):
+        ############################################################################################
+        #
+        # params.yml parameters
+        #
+        ############################################################################################
+
+        params_dic = FileParams(params).get_params_dic()
+        merge_params_dic = {k: params_dic[k] for k in params_dic if k.startswith('fastq_')}
+
+        ############################################################################################
+        #
+        # Read fastq information into stats_df
+        #
+        ############################################################################################
+
+        fastqinfo_df = FileSampleInformation(fastqinfo).read_tsv_into_df()
+
+        pathlib.Path(
+            os.path.dirname(fastainfo)).mkdir(
+            parents=True,
+            exist_ok=True)
+        pathlib.Path(fastadir).mkdir(parents=True, exist_ok=True)
+
+        fastainfo_df = pandas.DataFrame()
+
+        ############################################################################################
+        #
+        # Loop over fastq pairs to merge
+        #
+        ############################################################################################
+
+        # One vsearch_args_dic per fastq pair, the merges are run together after the loop
+        vsearch_args_dic_list = []
+        merge_stats_list = []
+
+        # Fastq pairs whose checksums and merge parameters are unchanged since the last run are skipped
+        merge_manifest = FileManifest(manifest_path=os.path.join(fastadir, 'merge_manifest.tsv'),
+                                      key_columns=['fastqfwd', 'fastqrev'])
+        merge_params_md5 = FileManifest.params_md5(merge_params_dic)
+
+        for fastqfwd, fastqrev in fastqinfo_df[[
+                'fastqfwd', 'fastqrev']].drop_duplicates().values:
+
+            fastq_info_df_i = fastqinfo_df.loc[(fastqinfo_df.fastqfwd == fastqfwd) & (
+                fastqinfo_df.fastqrev == fastqrev)]
+
+            fastq_fw_abspath = os.path.join(fastqdir, fastqfwd)
+            fastq_rv_abspath = os.path.join(fastqdir, fastqrev)
+
+            Logger.instance().debug(
+                "Analysing FASTQ files: {} and ".format(
+                    fastqfwd, fastqrev))
+
+            try:
+                pathlib.Path(fastq_fw_abspath).resolve(strict=True)
+            except FileNotFoundError:
+                Logger.instance().error(
+                    VTAMexception(
+                        "VTAMexception: This FASTQ file was not found: {}.".format(fastq_fw_abspath)))
+                sys.exit(1)
+            try:
+                pathlib.Path(fastq_rv_abspath).resolve(strict=True)
+            except FileNotFoundError:
+                Logger.instance().error(
+                    VTAMexception(
+                        "VTAMexception: This FASTQ file was not found: {}.".format(fastq_rv_abspath)))
+                sys.exit(1)
+
+            fasta_merged_basename = os.path.basename(
+                fastq_fw_abspath).replace('.fastq', '.fasta')
+            out_fasta_path = os.path.join(fastadir, fasta_merged_basename)
+
+            fastq_info_df_i = fastq_info_df_i[['run', 'marker', 'sample', 'replicate', 'tagfwd',
+                                               'primerfwd', 'tagrev', 'primerrev']]
+            fastq_info_df_i['mergedfasta'] = fasta_merged_basename
+            fastainfo_df = pandas.concat(
+                [fastainfo_df, fastq_info_df_i], axis=0)
+
+            ########################################################################################
+            #
+            # Skip pair if already merged with the same inputs and parameters
+            #
+            ########################################################################################
+
+            previous_record = merge_manifest.get_record({'fastqfwd': fastqfwd, 'fastqrev': fastqrev})
+            manifest_record = {'fastqfwd': fastqfwd, 'fastqrev': fastqrev,
+                               'params_md5': merge_params_md5, 'mergedfasta': fasta_merged_basename}
+            manifest_record.update(FileManifest.file_md5(
+                fastq_fw_abspath, previous_record=previous_record, column='fastqfwd'))
+            manifest_record.update(FileManifest.file_md5(
+                fastq_rv_abspath, previous_record=previous_record, column='fastqrev'))
+
+            is_merged = False
+            if not forceall and previous_record is not None and os.path.isfile(out_fasta_path):
+                manifest_record.update(FileManifest.file_md5(
+                    out_fasta_path, previous_record=previous_record, column='mergedfasta'))
+                is_merged = FileManifest.is_unchanged(
+                    previous_record=previous_record, record=manifest_record, columns=manifest_record.keys())
+
+            merge_stats_list.append((fastq_fw_abspath, fastq_rv_abspath, out_fasta_path,
+                                     manifest_record, previous_record if is_merged else None))
+
+            if is_merged:
+                Logger.instance().info("FASTQ files already merged, skipping: {} and {}".format(
+                    fastqfwd, fastqrev))
+                continue
+
+            ########################################################################################
+            #
+            # Run vsearch merge
+            #
+            ########################################################################################
+
+            vsearch_args_dic = {}
+
+            vsearch_args_dic['fastq_ascii'] = params_dic['fastq_ascii']
+            vsearch_args_dic['fastq_maxee'] = params_dic['fastq_maxee']
+            vsearch_args_dic['fastq_maxmergelen'] = params_dic['fastq_maxmergelen']
+            vsearch_args_dic['fastq_maxns'] = params_dic['fastq_maxns']
+            vsearch_args_dic['fastq_minlen'] = params_dic['fastq_minlen']
+            vsearch_args_dic['fastq_minmergelen'] = params_dic['fastq_minmergelen']
+            vsearch_args_dic['fastq_minovlen'] = params_dic['fastq_minovlen']
+            vsearch_args_dic['fastq_truncqual'] = params_dic['fastq_truncqual']
+
+            vsearch_args_dic['fastq_mergepairs'] = fastq_fw_abspath
+            vsearch_args_dic['reverse'] = fastq_rv_abspath
+            vsearch_args_dic['fastaout'] = out_fasta_path
+            vsearch_args_dic_list.append(vsearch_args_dic)
+
+        ############################################################################################
+        #
+        # Run vsearch merges concurrently and split the threads among them
+        #
+        ############################################################################################
+
+        job_pool = RunnerJobPool(job_count=len(vsearch_args_dic_list), num_threads=num_threads)
+        for vsearch_args_dic in vsearch_args_dic_list:
+            vsearch_args_dic['threads'] = job_pool.threads_per_job
+        job_pool.run(func=CommandMerge.run_vsearch_merge, args_list=vsearch_args_dic_list)
+
+        ############################################################################################
+        #
+        # Summary file
+        #
+        ############################################################################################
+
+        # File with analysis stats data
+        # Records are counted in chunks, so memory does not depend on the file sizes
+        # Counts of skipped pairs are taken from the manifest
+        stats_records = []
+        for fastq_fw_abspath, fastq_rv_abspath, out_fasta_path, manifest_record, previous_record \
+                in merge_stats_list:
+            if previous_record is None:
+                manifest_record['NbReadsFwd'] = LineCounter(fastq_fw_abspath).fastq_record_counter()
+                manifest_record['NbReadsRev'] = LineCounter(fastq_rv_abspath).fastq_record_counter()
+                manifest_record['NbMergedReads'] = LineCounter(out_fasta_path).fasta_record_counter()
+            else:
+                for k in ['NbReadsFwd', 'NbReadsRev', 'NbMergedReads']:
+                    manifest_record[k] = int(previous_record[k])
+            stats_records.append({
+                'FastqFwd': fastq_fw_abspath, 'FastqRev': fastq_rv_abspath,
+                'NbReadsFwd': manifest_record['NbReadsFwd'],
+                'NbReadsRev': manifest_record['NbReadsRev'],
+                'FastaMerged': out_fasta_path,
+                'NbMergedReads': manifest_record['NbMergedReads']})
+        stats_df = pandas.DataFrame(stats_records, columns=[
+            'FastqFwd', 'FastqRev', 'NbReadsFwd', 'NbReadsRev', 'FastaMerged', 'NbMergedReads'])
+
+        # Compressed outputs were already streamed into the compressor except under windows
+        merged_fasta_path_list = [vsearch_args_dic['fastaout'] for vsearch_args_dic in vsearch_args_dic_list]
+        for mergedfasta in fastainfo_df[['mergedfasta']].drop_duplicates().values:
+            mergedfasta = mergedfasta[0]
+
+            if (mergedfasta.endswith('.bz2') or  mergedfasta.endswith('.gz')) \
+                    and sys.platform.startswith("win") \
+                    and os.path.join(fastadir, mergedfasta) in merged_fasta_path_list:
+                fasta_merged_abspath = os.path.join(fastadir, mergedfasta)
+                mergedfasta_compressor = FileCompression(fasta_merged_abspath)
+            
+                if mergedfasta.endswith('.gz'):
+                    mergedfasta_c = mergedfasta_compressor.pigz_compression()
+                    if mergedfasta_c is None:
+                        mergedfasta_c = mergedfasta_compressor.gzip_compression()
+
+                    
+                elif mergedfasta.endswith('.bz2'):
+                    mergedfasta_c = mergedfasta_compressor.bz2_compression()
+                    
+                mergedfasta_compressor.delete_file()
+                _, relPath = os.path.split(mergedfasta_c)
+                fastainfo_df.loc[fastainfo_df['mergedfasta'] == mergedfasta, 'mergedfasta'] = relPath
+                
+            else: 
+                fastq_info_df_i['mergedfasta'] = fasta_merged_basename
+
+        
+        fastainfo_df.to_csv(fastainfo, sep="\t", header=True, index=False)
+
+        for fastq_fw_abspath, fastq_rv_abspath, out_fasta_path, manifest_record, previous_record \
+                in merge_stats_list:
+            manifest_record.update(FileManifest.file_md5(
+                out_fasta_path, previous_record=previous_record, column='mergedfasta'))
+            merge_manifest.update(manifest_record)
+        merge_manifest.write()
+
+        summary_path = os.path.join(os.path.dirname(fastainfo), 'merge_summary.tsv')
+        SummaryFileMerge(params_dic=merge_params_dic, stats_df=stats_df).write(summary_path)
+
+    @staticmethod
+    def run_vsearch_merge(vsearch_args_dic):
+        """Runs one vsearch merge. If the merged FASTA ends with .gz or .bz2, vsearch writes into
+        a pipe read by the compressor and the uncompressed FASTA never touches the disk.
+
+        :param vsearch_args_dic: Dictionary with the vsearch parameters
+        :return: void
+        """
+        fastaout = vsearch_args_dic['fastaout']
+        vsearch_merge = RunnerVSearch(parameters=vsearch_args_dic)
+        if (fastaout.endswith('.gz') or fastaout.endswith('.bz2')) \
+                and not sys.platform.startswith("win"):
+            vsearch_merge.run_compressed(out_param='fastaout', compressed_path=fastaout)
+        else:
+            vsearch_merge.run()
@@ -0,0 +1,52 @@
+from wopmars.Base import Base
+from sqlalchemy import UniqueConstraint, Index, Boolean, Column, Integer, ForeignKey
+
+
+class FilterLFN(Base):
+    __tablename__ = __qualname__
+    __table_args__ = (
+        UniqueConstraint(
+            'marker_id',
+            'run_id',
+            'variant_id',
+            'sample_id',
+            'replicate',
+            'filter_id'),
+        # Covering index of the selections and deletions by run, marker, sample and replicate
+        Index('ix_FilterLFN_sample',
+              'run_id', 'marker_id', 'sample_id', 'replicate', 'filter_id', 'filter_delete', 'variant_id', 'read_count'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(
+        Integer,
+        ForeignKey(
+            "Run.id",
+            onupdate="CASCADE",
+            ondelete="CASCADE"),
+        nullable=False)
+    marker_id = Column(
+        Integer,
+        ForeignKey(
+            "Marker.id",
+            onupdate="CASCADE",
+            ondelete="CASCADE"),
+        nullable=False)
+    sample_id = Column(
+        Integer,
+        ForeignKey(
+            "Sample.id",
+            onupdate="CASCADE",
+            ondelete="CASCADE"),
+        nullable=False)
+    replicate = Column(Integer, nullable=False)
+    variant_id = Column(
+        Integer,
+        ForeignKey(
+            "Variant.id",
+            onupdate="CASCADE",
+            ondelete="CASCADE"),
+        nullable=False)
+    read_count = Column(Integer, nullable=False)
+    filter_id = Column(Integer, nullable=False)
+    filter_delete = Column(Boolean, nullable=False)
@@ -0,0 +1,8 @@
+from sqlalchemy import event
+from sqlalchemy.pool import Pool
+
+from vtam.utils.SqliteTuning import SqliteTuning
+
+# The SQLite pragmas of the parameters are set on the new connections of all engines, including wopmars
+if not event.contains(Pool, 'connect', SqliteTuning.on_connect):
+    event.listen(Pool, 'connect', SqliteTuning.on_connect)
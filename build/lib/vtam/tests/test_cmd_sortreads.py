@@ -0,0 +1,60 @@
+from unittest import TestCase
+from vtam import CommandSortReads
+from vtam.utils.PathManager import PathManager
+import filecmp
+import os
+import pandas
+import shutil
+
+
+class TestCommandSortReads(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_path = PathManager.get_test_path()
+        cls.outdir_path = os.path.join(cls.test_path, 'outdir')
+
+    def setUp(self):
+        
+        self.fastainfo = os.path.join(self.test_path, "test_files", "mergedinfo.tsv")
+        self.fastadir = os.path.join(self.test_path, "test_files", "merged")
+        self.sorted_dir = os.path.join(self.outdir_path, "sorted")
+        self.sorted_dir_bak = os.path.join(self.test_path, "test_files", "sorted")
+
+    def test_01(self):
+
+        CommandSortReads.main(fastainfo=self.fastainfo, fastadir=self.fastadir, sorteddir=self.sorted_dir)
+
+        self.assertTrue(filecmp.cmpfiles(self.sorted_dir, self.sorted_dir_bak, common=[
+            'sortedinfo.tsv', 'MFZR_14Ben01_Tpos1_1_fw_48_000.fasta', 'MFZR_14Ben01_Tpos1_1_fw_48_001.fasta',
+            'MFZR_14Ben01_Tpos1_1_fw_48_002.fasta', 'MFZR_14Ben01_Tpos1_1_fw_48_003.fasta'], shallow=True))
+
+    def test_02_incremental(self):
+
+        # Sort the first replicate only
+        fastainfo_df = pandas.read_csv(self.fastainfo, sep="\t", header=0)
+        fastainfo_1_path = os.path.join(self.outdir_path, "mergedinfo_1.tsv")
+        fastainfo_2_path = os.path.join(self.outdir_path, "mergedinfo_2.tsv")
+        os.makedirs(self.outdir_path, exist_ok=True)
+        fastainfo_df.loc[fastainfo_df.replicate == 1].to_csv(fastainfo_1_path, sep="\t", index=False)
+        fastainfo_df.loc[fastainfo_df.replicate == 2].to_csv(fastainfo_2_path, sep="\t", index=False)
+
+        CommandSortReads.main(fastainfo=fastainfo_1_path, fastadir=self.fastadir, sorteddir=self.sorted_dir)
+        sorted_fasta_path = os.path.join(self.sorted_dir, pandas.read_csv(os.path.join(
+            self.sorted_dir, 'sortedinfo.tsv'), sep="\t", header=0).sortedfasta.tolist()[0])
+        mtime = os.stat(sorted_fasta_path).st_mtime_ns
+
+        # Unchanged merged FASTA files are skipped and the sorted files of the other replicate are added
+        CommandSortReads.main(fastainfo=fastainfo_2_path, fastadir=self.fastadir, sorteddir=self.sorted_dir)
+        self.assertEqual(os.stat(sorted_fasta_path).st_mtime_ns, mtime)
+        sortedinfo_df = pandas.read_csv(os.path.join(self.sorted_dir, 'sortedinfo.tsv'), sep="\t", header=0)
+        self.assertEqual(sorted(sortedinfo_df.replicate.unique().tolist()), [1, 2])
+
+        # forceall sorts again and keeps only the files of fastainfo
+        CommandSortReads.main(fastainfo=fastainfo_1_path, fastadir=self.fastadir, sorteddir=self.sorted_dir,
+                              forceall=True)
+        sortedinfo_df = pandas.read_csv(os.path.join(self.sorted_dir, 'sortedinfo.tsv'), sep="\t", header=0)
+        self.assertEqual(sortedinfo_df.replicate.unique().tolist(), [1])
+
+    def tearDown(self):
+        shutil.rmtree(self.outdir_path, ignore_errors=True)
@@ -0,0 +1,52 @@
+import os
+import shutil
+import unittest
+
+from vtam.utils.FileManifest import FileManifest
+from vtam.utils.PathManager import PathManager
+
+
+class TestFileManifest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        cls.test_path = PathManager.get_test_path()
+        cls.outdir_path = os.path.join(cls.test_path, 'outdir')
+
+    def setUp(self):
+
+        os.makedirs(self.outdir_path, exist_ok=True)
+        self.fastq_path = os.path.join(self.outdir_path, "MFZR_14Ben01_1_fw_48.fastq")
+        shutil.copyfile(os.path.join(self.test_path, "test_files", "fastq", "MFZR_14Ben01_1_fw_48.fastq"),
+                        self.fastq_path)
+        self.manifest_path = os.path.join(self.outdir_path, "manifest.tsv")
+
+    def test_write_read_is_unchanged(self):
+
+        manifest = FileManifest(manifest_path=self.manifest_path, key_columns=['fastqfwd'])
+        record = {'fastqfwd': 'MFZR_14Ben01_1_fw_48.fastq',
+                  'params_md5': FileManifest.params_md5({'fastq_maxee': 1, 'fastq_minovlen': 50})}
+        record.update(FileManifest.file_md5(self.fastq_path, column='fastqfwd'))
+        manifest.update(record)
+        manifest.write()
+
+        manifest = FileManifest(manifest_path=self.manifest_path, key_columns=['fastqfwd'])
+        previous_record = manifest.get_record({'fastqfwd': 'MFZR_14Ben01_1_fw_48.fastq'})
+        self.assertTrue(FileManifest.is_unchanged(previous_record, record, record.keys()))
+
+        # Other parameters
+        record2 = dict(record, params_md5=FileManifest.params_md5({'fastq_maxee': 2, 'fastq_minovlen': 50}))
+        self.assertFalse(FileManifest.is_unchanged(previous_record, record2, record2.keys()))
+
+        # Other content
+        with open(self.fastq_path, 'a') as fout:
+            fout.write("@extra\nACGT\n+\nIIII\n")
+        record3 = dict(record)
+        record3.update(FileManifest.file_md5(self.fastq_path, previous_record=previous_record, column='fastqfwd'))
+        self.assertFalse(FileManifest.is_unchanged(previous_record, record3, record3.keys()))
+
+        self.assertIsNone(manifest.get_record({'fastqfwd': 'unknown.fastq'}))
+
+    def tearDown(self):
+        shutil.rmtree(self.outdir_path, ignore_errors=True)
@@ -0,0 +1,49 @@
+import bz2
+import os
+import shutil
+import unittest
+
+from vtam.utils.LineCounter import LineCounter
+from vtam.utils.PathManager import PathManager
+
+
+class TestLineCounter(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        cls.test_path = PathManager.get_test_path()
+        cls.outdir_path = os.path.join(cls.test_path, 'outdir')
+
+    def setUp(self):
+
+        self.fastq_path = os.path.join(self.test_path, "test_files", "fastq", "MFZR_14Ben01_1_fw_48.fastq")
+        self.fastq_gz_path = os.path.join(self.test_path, "test_files", "fastq_gz", "MFZR_14Ben01_1_fw_48.fastq.gz")
+        self.fasta_path = os.path.join(self.test_path, "test_files", "merged", "MFZR_14Ben01_1_fw_48.fasta")
+        self.fasta_gz_path = os.path.join(self.test_path, "test_files", "merged_gz", "MFZR_14Ben01_1_fw_48.fasta.gz")
+
+    def test_fastq_record_counter(self):
+
+        self.assertEqual(LineCounter(self.fastq_path).fastq_record_counter(), 12)
+        self.assertEqual(LineCounter(self.fastq_gz_path).fastq_record_counter(), 12)
+
+    def test_fasta_record_counter(self):
+
+        self.assertEqual(LineCounter(self.fasta_path).fasta_record_counter(), 12)
+        self.assertEqual(LineCounter(self.fasta_gz_path).fasta_record_counter(), 12)
+
+    def test_compression_detected_from_content(self):
+
+        # vsearch writes uncompressed files with '.gz' or '.bz2' names before compression
+        os.makedirs(self.outdir_path, exist_ok=True)
+        fasta_named_gz_path = os.path.join(self.outdir_path, "uncompressed.fasta.gz")
+        shutil.copyfile(self.fasta_path, fasta_named_gz_path)
+        self.assertEqual(LineCounter(fasta_named_gz_path).fasta_record_counter(), 12)
+
+        fasta_bz2_path = os.path.join(self.outdir_path, "compressed.fasta")
+        with open(self.fasta_path, 'rb') as fin, bz2.open(fasta_bz2_path, 'wb') as fout:
+            fout.write(fin.read())
+        self.assertEqual(LineCounter(fasta_bz2_path).fasta_record_counter(), 12)
+
+    def tearDown(self):
+        shutil.rmtree(self.outdir_path, ignore_errors=True)
@@ -0,0 +1,64 @@
+import os
+import pandas
+import shutil
+import sqlalchemy
+import unittest
+
+from vtam.models.FilterLFN import FilterLFN
+from vtam.utils.DataframeVariantReadCountLike import DataframeVariantReadCountLike
+from vtam.utils.ModelVariantReadCountLike import ModelVariantReadCountLike
+from vtam.utils.PathManager import PathManager
+from wopmars.Base import Base
+
+
+class TestModelVariantReadCountLike(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        cls.test_path = PathManager.get_test_path()
+        cls.outdir_path = os.path.join(cls.test_path, 'outdir')
+
+    def setUp(self):
+
+        os.makedirs(self.outdir_path, exist_ok=True)
+        db_path = os.path.join(self.outdir_path, "db.sqlite")
+        self.engine = sqlalchemy.create_engine('sqlite:///{}'.format(db_path), echo=False)
+        Base.metadata.create_all(self.engine)
+
+        self.filter_df = pandas.DataFrame({
+            'run_id': [1, 1, 1],
+            'marker_id': [1, 1, 1],
+            'sample_id': [1, 1, 2],
+            'replicate': [1, 2, 1],
+            'variant_id': [5, 5, 7],
+            'read_count': [10, 0, 3],
+            'filter_id': [8, 8, 8],
+            'filter_delete': [False, True, False],
+        })
+
+    def test_filter_delete_df_to_dict(self):
+
+        record_list = ModelVariantReadCountLike.filter_delete_df_to_dict(self.filter_df)
+        self.assertEqual(record_list[1], {'run_id': 1, 'marker_id': 1, 'variant_id': 5, 'sample_id': 1,
+                                          'read_count': 0, 'filter_delete': True, 'filter_id': 8,
+                                          'replicate': 2})
+        self.assertIs(type(record_list[0]['read_count']), int)
+        # Optional columns are only added when present
+        record_list = ModelVariantReadCountLike.filter_delete_df_to_dict(
+            self.filter_df[['run_id', 'marker_id', 'variant_id', 'sample_id', 'read_count']])
+        self.assertEqual(sorted(record_list[2]), ['marker_id', 'read_count', 'run_id', 'sample_id', 'variant_id'])
+
+    def test_to_sql(self):
+
+        DataframeVariantReadCountLike(self.filter_df).to_sql(engine=self.engine, variant_read_count_like_model=FilterLFN)
+        with self.engine.connect() as conn:
+            row_list = conn.execute(sqlalchemy.text(
+                "SELECT sample_id, replicate, variant_id, read_count, filter_delete FROM FilterLFN ORDER BY id")).fetchall()
+            self.assertEqual([tuple(row) for row in row_list], [(1, 1, 5, 10, 0), (1, 2, 5, 0, 1), (2, 1, 7, 3, 0)])
+            # Pragmas of the connection are restored after the load
+            self.assertEqual(conn.execute(sqlalchemy.text("PRAGMA synchronous")).first()[0], 2)
+
+    def tearDown(self):
+        self.engine.dispose()
+        shutil.rmtree(self.outdir_path, ignore_errors=True)
@@ -0,0 +1,72 @@
+import os
+import shutil
+import unittest
+
+from vtam.utils.FilesInputCutadapt import FilesInputCutadapt
+from vtam.utils.PathManager import PathManager
+from vtam.utils.RunnerDemultiplexTags import RunnerDemultiplexTags
+
+
+class TestRunnerDemultiplexTags(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        cls.test_path = PathManager.get_test_path()
+        cls.outdir_path = os.path.join(cls.test_path, 'outdir')
+
+    def setUp(self):
+
+        self.tags_samples = [
+            ('sample1', 'run1', 'mfzr', 's1', '1', 'acgtacgt', 'ttttgggg'),
+            ('sample2', 'run1', 'mfzr', 's2', '1', 'acgtacgt', 'ccccaaaa'),
+            ('sample1_reversed', 'run1', 'mfzr', 's1', '1', 'acgtacgt', 'ttttgggg'),
+        ]
+
+    def test_is_supported(self):
+
+        self.assertTrue(RunnerDemultiplexTags.is_supported(self.tags_samples))
+        # 5' tag prefix of another 5' tag
+        tags_samples = self.tags_samples + [('sample3', 'run1', 'mfzr', 's3', '1', 'acgtacgtt', 'ccccaaaa')]
+        self.assertFalse(RunnerDemultiplexTags.is_supported(tags_samples))
+        # IUPAC code
+        tags_samples = self.tags_samples + [('sample3', 'run1', 'mfzr', 's3', '1', 'acgtnnnn', 'ccccaaaa')]
+        self.assertFalse(RunnerDemultiplexTags.is_supported(tags_samples))
+
+    def test_assign_records(self):
+
+        tag_index = RunnerDemultiplexTags.get_tag_index(self.tags_samples)
+        record_list = [
+            ('read1', 'ACGTACGTAAACCCCAAAA'),  # sample1: 3' tag is revcomp of ttttgggg
+            ('read2', 'ACGTACGTGGGTTTTGGGG'),  # sample2
+            ('read3', 'TTTTGGGGTTTACGTACGT'),  # sample1_reversed
+            ('read4', 'CGTACGTAAACCCCCAAAA'),  # no 5' tag
+            ('read5', 'ACGTACGTCCCCAAAA'),  # 5' and 3' tags without insert
+        ]
+        self.assertEqual(RunnerDemultiplexTags.assign_records(record_list, tag_index), [
+            ('sample1', 'read1', 'AAA'),
+            ('sample2', 'read2', 'GGG'),
+            ('sample1_reversed', 'read3', 'TTT'),
+            ('sample1', 'read5', '')])
+
+    def test_run(self):
+
+        fastainfo = os.path.join(self.test_path, "test_files", "mergedinfo.tsv")
+        in_fasta_path = os.path.join(self.test_path, "test_files", "merged", "MFZR_14Ben01_Tpos1_1_fw_48.fasta")
+        tags_samples = FilesInputCutadapt(fastainfo, "MFZR_14Ben01_Tpos1_1_fw_48.fasta", True, False)\
+            .get_sample_names()
+        os.makedirs(self.outdir_path, exist_ok=True)
+        out_fasta_path_dic = {}
+        for i, tag_sample in enumerate(tags_samples):
+            out_fasta_path_dic[tag_sample[0]] = os.path.join(self.outdir_path, "sorted_{}.fasta".format(i))
+
+        for num_threads in [1, 2]:
+            RunnerDemultiplexTags(tags_samples=tags_samples, num_threads=num_threads).run(
+                in_fasta_path=in_fasta_path, out_fasta_path_dic=out_fasta_path_dic)
+            # All output files are created
+            self.assertTrue(all(os.path.isfile(path) for path in out_fasta_path_dic.values()))
+            with open(out_fasta_path_dic[tags_samples[0][0]]) as fin:
+                self.assertTrue(fin.read().startswith('>'))
+
+    def tearDown(self):
+        shutil.rmtree(self.outdir_path, ignore_errors=True)
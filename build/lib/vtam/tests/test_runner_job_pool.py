@@ -0,0 +1,29 @@
+import unittest
+
+from vtam.utils.RunnerJobPool import RunnerJobPool
+
+
+class TestRunnerJobPool(unittest.TestCase):
+
+    def test_split_threads(self):
+
+        job_pool = RunnerJobPool(job_count=300, num_threads=32)
+        self.assertEqual(job_pool.num_workers, 32)
+        self.assertEqual(job_pool.threads_per_job, 1)
+
+        job_pool = RunnerJobPool(job_count=2, num_threads=8)
+        self.assertEqual(job_pool.num_workers, 2)
+        self.assertEqual(job_pool.threads_per_job, 4)
+
+        job_pool = RunnerJobPool(job_count=3, num_threads='8')  # argparse passes strings
+        self.assertEqual(job_pool.num_workers, 3)
+        self.assertEqual(job_pool.threads_per_job, 2)
+
+        job_pool = RunnerJobPool(job_count=0, num_threads=4)
+        self.assertEqual(job_pool.num_workers, 1)
+
+    def test_run_keeps_order(self):
+
+        job_pool = RunnerJobPool(job_count=20, num_threads=4)
+        self.assertEqual(job_pool.run(func=lambda x: x * x, args_list=list(range(20))),
+                         [x * x for x in range(20)])
@@ -0,0 +1,49 @@
+import os
+import shutil
+import unittest
+
+from vtam.utils.PathManager import PathManager
+from vtam.utils.RunnerTrimPrimers import RunnerTrimPrimers
+
+
+class TestRunnerTrimPrimers(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        cls.test_path = PathManager.get_test_path()
+        cls.outdir_path = os.path.join(cls.test_path, 'outdir')
+
+    def setUp(self):
+
+        os.makedirs(self.outdir_path, exist_ok=True)
+        cmd_cutadapt_str = 'cutadapt --cores=1 --no-indels --error-rate 0 --minimum-length 1 ' \
+                           '--trimmed-only -g "^{}...{}$" -'
+        self.cmd_cutadapt_list = [(cmd_cutadapt_str.format('ACGT', 'TTTT'), False),
+                                  (cmd_cutadapt_str.format('AAAA', 'ACGT'), True)]
+        self.out_fasta_path_list = [os.path.join(self.outdir_path, 'sample1.fasta'),
+                                    os.path.join(self.outdir_path, 'sample2.fasta.gz')]
+        self.sample_job_dic = {'sample1': [(0, 0)], 'sample1_reversed': [(1, 0)], 'sample2': [(0, 1)]}
+
+    def test_run(self):
+
+        assigned_iter = [
+            [('sample1', 'read1 desc', 'ACGTGGGCTTTT'),
+             ('sample1_reversed', 'read2', 'AAAAGCCCACGT'),
+             ('sample2', 'read3', 'ACGTCCCTTTT'),
+             ('sample2', 'read4', 'CCCCCCCCCCCC'),  # no primers
+             ('sample3', 'read5', 'ACGTGGGCTTTT')],  # no primer job
+        ]
+        runner_trim_primers = RunnerTrimPrimers(
+            cmd_cutadapt_list=self.cmd_cutadapt_list, out_fasta_path_list=self.out_fasta_path_list,
+            sample_job_dic=self.sample_job_dic, dereplicate=True)
+        runner_trim_primers.run(assigned_iter=assigned_iter)
+
+        with open(self.out_fasta_path_list[0]) as fin:
+            self.assertEqual(sorted(fin.read().splitlines()), ['>read1 desc', '>read2', 'GGGC', 'GGGC'])
+        self.assertTrue(os.path.isfile(self.out_fasta_path_list[1]))
+        self.assertEqual(runner_trim_primers.read_count_dic_list[0], {b'GGGC': 2})
+        self.assertEqual(runner_trim_primers.read_count_dic_list[1], {b'CCC': 1})
+
+    def tearDown(self):
+        shutil.rmtree(self.outdir_path, ignore_errors=True)
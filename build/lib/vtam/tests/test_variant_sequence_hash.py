@@ -0,0 +1,51 @@
+import os
+import shutil
+import sqlalchemy
+import unittest
+
+from vtam.utils.PathManager import PathManager
+from vtam.utils.VariantSequenceHash import VariantSequenceHash
+
+
+class TestVariantSequenceHash(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        cls.test_path = PathManager.get_test_path()
+        cls.outdir_path = os.path.join(cls.test_path, 'outdir')
+
+    def setUp(self):
+
+        os.makedirs(self.outdir_path, exist_ok=True)
+        db_path = os.path.join(self.outdir_path, "db.sqlite")
+        self.engine = sqlalchemy.create_engine('sqlite:///{}'.format(db_path), echo=False)
+        # Variant table of previous VTAM versions, without sequence_hash
+        with self.engine.connect() as conn:
+            conn.execute(sqlalchemy.text(
+                "CREATE TABLE Variant (id INTEGER NOT NULL, sequence VARCHAR(250) NOT NULL, "
+                "PRIMARY KEY (id), UNIQUE (sequence))"))
+            conn.execute(sqlalchemy.text("INSERT INTO Variant (id, sequence) VALUES (1, 'ACGT'), (2, 'TTTT')"))
+
+    def test_get_hash(self):
+
+        self.assertEqual(VariantSequenceHash.get_hash('ACGT'), VariantSequenceHash.get_hash('ACGT'))
+        self.assertNotEqual(VariantSequenceHash.get_hash('ACGT'), VariantSequenceHash.get_hash('ACGA'))
+        self.assertTrue(-2**63 <= VariantSequenceHash.get_hash('ACGT') < 2**63)
+
+    def test_select_id_dic(self):
+
+        with self.engine.connect() as conn:
+            self.assertEqual(VariantSequenceHash.select_id_dic(conn, ['ACGT', 'TTTT', 'CCCC']),
+                             {'ACGT': 1, 'TTTT': 2})
+            # Table upgraded and hashes filled
+            self.assertEqual(conn.execute(sqlalchemy.text(
+                "SELECT COUNT(*) FROM Variant WHERE sequence_hash IS NOT NULL")).first()[0], 2)
+            # Sequences with the same hash are told apart
+            conn.execute(sqlalchemy.text("UPDATE Variant SET sequence_hash = :h WHERE id = 2"),
+                         {'h': VariantSequenceHash.get_hash('ACGT')})
+            self.assertEqual(VariantSequenceHash.select_id_dic(conn, ['ACGT']), {'ACGT': 1})
+
+    def tearDown(self):
+        self.engine.dispose()
+        shutil.rmtree(self.outdir_path, ignore_errors=True)
@@ -0,0 +1,80 @@
+import gzip
+import bz2
+from functools import partial
+
+class LineCounter():
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    @staticmethod
+    def _make_gen(reader):
+        b = reader( 1024 * 1024 )
+        while b:
+            yield b
+            b = reader( 1024 * 1024 )
+
+    def _open(self):
+        """Opens the file in binary mode. Compression is detected from the first bytes because vsearch
+        writes uncompressed files named '.gz' or '.bz2' before they are compressed"""
+
+        with open(self.filename, 'rb') as fin:
+            magic = fin.read(3)
+
+        if magic[:2] == b'\x1f\x8b':
+            _open = partial(gzip.open)
+        elif magic == b'BZh':
+            _open = partial(bz2.open)
+        else:
+            _open = open
+
+        return _open(self.filename, 'rb')
+
+    def sequence_counter(self):
+
+        def rawgencount(filename):
+
+            if filename.endswith(".gz"):
+                _open = partial(gzip.open)
+            elif filename.endswith(".bz2"):
+                _open = partial(bz2.open)
+            else:
+                _open = open
+
+            f = _open(filename, 'rb')
+            f_gen = self._make_gen(f.read)
+            return sum( buf.count(b">") for buf in f_gen )
+
+        return rawgencount(self.filename)
+
+    def line_counter(self):
+        """Counts lines in chunks with constant memory. A last line without newline is also counted"""
+
+        line_count = 0
+        last_byte = b'\n'
+        with self._open() as fin:
+            for buf in self._make_gen(fin.read):
+                line_count += buf.count(b"\n")
+                last_byte = buf[-1:]
+        if last_byte != b'\n':
+            line_count += 1
+        return line_count
+
+    def fastq_record_counter(self):
+        """Counts the FASTQ records, which have four lines each"""
+
+        return self.line_counter() // 4
+
+    def fasta_record_counter(self):
+        """Counts the FASTA records, ie lines starting with '>'. Sequences can span several lines"""
+
+        record_count = 0
+        previous_byte = b'\n'  # the first line of the file is also a line start
+        with self._open() as fin:
+            for buf in self._make_gen(fin.read):
+                record_count += buf.count(b"\n>")
+                # Header starting at the beginning of the chunk
+                if previous_byte == b'\n' and buf[:1] == b'>':
+                    record_count += 1
+                previous_byte = buf[-1:]
+        return record_count
@@ -0,0 +1,85 @@
+import pandas
+import sqlalchemy
+
+# Number of records per executemany of bulk_insert
+bulk_insert_batch_size = 100000
+
+# SQLite pragmas set during bulk_insert: fewer disk syncs and a larger page cache
+sqlite_bulk_load_pragma_dic = {'synchronous': 1, 'cache_size': -262144, 'temp_store': 2}
+
+
+class ModelVariantReadCountLike(object):
+    """Takes a any type of VariantReadCount models/table with at least run_id, marker_id, sample_id, replicate, variant_id
+    attributes/columns and performs various operations on it"""
+
+    def __init__(self, engine, variant_read_count_like_model):
+        # self.filter_name = filter_name
+        self.engine = engine
+        self.variant_read_count_like_model = variant_read_count_like_model
+
+    def delete_from_db(self, sample_record_list):
+        """Deletes the entries in the output filter models based on a list of instances (dicts) defined by, run_id,
+         marker_id, sample_id, replicate"""
+
+        sample_column_list = pandas.DataFrame(
+            sample_record_list).columns.tolist()
+
+        with self.engine.connect() as conn:
+            stmt = self.variant_read_count_like_model.__table__.delete()
+            stmt = stmt.where(
+                self.variant_read_count_like_model.__table__.c.run_id == sqlalchemy.bindparam('run_id'))
+            stmt = stmt.where(
+                self.variant_read_count_like_model.__table__.c.marker_id == sqlalchemy.bindparam('marker_id'))
+            if 'sample_id' in sample_column_list:
+                stmt = stmt.where(
+                    self.variant_read_count_like_model.__table__.c.sample_id == sqlalchemy.bindparam('sample_id'))
+            if 'replicate' in sample_column_list and 'replicate' in [
+                    col.key for col in self.variant_read_count_like_model.__table__.columns]:
+                stmt = stmt.where(
+                    self.variant_read_count_like_model.__table__.c.replicate == sqlalchemy.bindparam('replicate'))
+            conn.execute(stmt, sample_record_list)
+
+    ##########################################################
+    #
+    # Convert DF to list of dictionaries to use in an sqlalchemy core insert
+    #
+    ##########################################################
+
+    @staticmethod
+    def filter_delete_df_to_dict(filter_df):
+        """Convert DF to list of dictionaries to use in an sqlalchemy core insert
+
+        The columns are converted once to python objects instead of row by row"""
+
+        column_list = ['run_id', 'marker_id', 'variant_id', 'sample_id', 'read_count']
+        for column in ['filter_delete', 'filter_id', 'replicate', 'replicate_count', 'read_count_average']:
+            if column in filter_df.columns:
+                column_list.append(column)
+        value_list_list = [filter_df[column].tolist() for column in column_list]
+        return [dict(zip(column_list, values)) for values in zip(*value_list_list)]
+
+    def bulk_insert(self, record_list):
+        """Inserts records in large executemany batches inside one transaction. With SQLite, the
+        pragmas of the connection are set for a bulk load and restored afterwards.
+
+        :param record_list: list of dictionaries, eg. output of filter_delete_df_to_dict
+        :return: void
+        """
+        if len(record_list) == 0:
+            return
+        with self.engine.connect() as conn:
+            is_sqlite = (conn.dialect.name == 'sqlite')
+            if is_sqlite:
+                pragma_previous_dic = {pragma: conn.execute(sqlalchemy.text("PRAGMA {}".format(pragma))).first()[0]
+                                       for pragma in sqlite_bulk_load_pragma_dic}
+                for pragma in sqlite_bulk_load_pragma_dic:
+                    conn.execute(sqlalchemy.text("PRAGMA {} = {}".format(pragma, sqlite_bulk_load_pragma_dic[pragma])))
+            try:
+                with conn.begin():
+                    for i in range(0, len(record_list), bulk_insert_batch_size):
+                        conn.execute(self.variant_read_count_like_model.__table__.insert(),
+                                     record_list[i:i + bulk_insert_batch_size])
+            finally:
+                if is_sqlite:
+                    for pragma in pragma_previous_dic:
+                        conn.execute(sqlalchemy.text("PRAGMA {} = {}".format(pragma, pragma_previous_dic[pragma])))
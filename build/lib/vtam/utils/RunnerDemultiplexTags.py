@@ -0,0 +1,181 @@
+import bz2
+import gzip
+import multiprocessing
+from functools import partial
+
+from vtam.utils.Logger import Logger
+
+# Complement table for reverse complementing tags
+complement_table = str.maketrans('ACGTacgt', 'TGCAtgca')
+
+# Reads per chunk sent to each worker process
+chunk_size = 10000
+
+# Tag index of the worker processes, set by the pool initializer
+worker_tag_index = None
+
+
+def _init_worker(tag_index):
+    global worker_tag_index
+    worker_tag_index = tag_index
+
+
+def _assign_chunk(record_list):
+    return RunnerDemultiplexTags.assign_records(record_list, worker_tag_index)
+
+
+class RunnerDemultiplexTags(object):
+    """In-process demultiplexing of reads with exact and anchored tags, ie equivalent to
+    'cutadapt --no-indels --error-rate 0 --trimmed-only -g ^{tagfwd}...{tagrev_rc}$'
+    Each read is looked up in a hash table with its 5' and 3' ends, independently of the number of tags."""
+
+    def __init__(self, tags_samples, num_threads=1):
+        """
+        :param tags_samples: list of tuples returned by FilesInputCutadapt.get_sample_names()
+            (name, run, marker, sample, replicate, tagfwd, tagrev)
+        :param num_threads: Number of processes assigning reads
+        :return: void
+        """
+        self.tags_samples = tags_samples
+        self.num_threads = max(1, int(num_threads))
+        self.tag_index = self.get_tag_index(tags_samples)
+
+    @staticmethod
+    def get_anchored_tags(tag_sample):
+        """Returns the 5' and 3' tags of a sample, as written in the tag file for cutadapt"""
+
+        name, _, _, _, _, fwd, rev = tag_sample
+        if not "_reversed" in name:
+            return fwd.upper(), rev.translate(complement_table)[::-1].upper()
+        return rev.upper(), fwd.translate(complement_table)[::-1].upper()
+
+    @classmethod
+    def get_tag_index(cls, tags_samples):
+        """Returns a dictionary with keys (5' tag, 3' tag) and values the sample name, plus
+        the list of (5' tag length, 3' tag length)"""
+
+        tag_dic = {}
+        for tag_sample in tags_samples:
+            tag_dic[cls.get_anchored_tags(tag_sample)] = tag_sample[0]
+        length_list = sorted({(len(tag5), len(tag3)) for tag5, tag3 in tag_dic})
+        return tag_dic, length_list
+
+    @classmethod
+    def is_supported(cls, tags_samples):
+        """Returns True if the hash lookup gives the same assignment as cutadapt: the tags contain
+        only ACGT and no 5' (3') tag is a prefix (suffix) of another one, so that at most one
+        tag pair can match a read"""
+
+        tag5_set = set()
+        tag3_set = set()
+        for tag_sample in tags_samples:
+            tag5, tag3 = cls.get_anchored_tags(tag_sample)
+            if len(tag5) == 0 or len(tag3) == 0 or set(tag5 + tag3) - set('ACGT'):
+                return False
+            tag5_set.add(tag5)
+            tag3_set.add(tag3)
+        for tag5 in tag5_set:
+            for tag5_other in tag5_set:
+                if tag5 != tag5_other and tag5_other.startswith(tag5):
+                    return False
+        for tag3 in tag3_set:
+            for tag3_other in tag3_set:
+                if tag3 != tag3_other and tag3_other.endswith(tag3):
+                    return False
+        return True
+
+    @staticmethod
+    def assign_records(record_list, tag_index):
+        """Assigns reads to samples
+
+        :param record_list: list of (header, sequence)
+        :param tag_index: output of get_tag_index
+        :return: list of (sample name, header, trimmed sequence) of the assigned reads
+        """
+        tag_dic, length_list = tag_index
+        assigned_list = []
+        for header, sequence in record_list:
+            sequence_upper = sequence.upper()
+            for len5, len3 in length_list:
+                if len(sequence) < len5 + len3:
+                    continue
+                name = tag_dic.get((sequence_upper[:len5], sequence_upper[len(sequence) - len3:]), None)
+                if name is not None:
+                    assigned_list.append((name, header, sequence[len5:len(sequence) - len3]))
+                    break
+        return assigned_list
+
+    @staticmethod
+    def get_open(path):
+        if path.endswith(".gz"):
+            return partial(gzip.open)
+        elif path.endswith(".bz2"):
+            return partial(bz2.open)
+        return open
+
+    @classmethod
+    def read_fasta_chunks(cls, fasta_path):
+        """Yields lists of (header, sequence) of chunk_size reads. Sequences can span several lines."""
+
+        record_list = []
+        header = None
+        sequence_list = []
+        with cls.get_open(fasta_path)(fasta_path, 'rt') as fin:
+            for line in fin:
+                line = line.rstrip('\r\n')
+                if line.startswith('>'):
+                    if header is not None:
+                        record_list.append((header, ''.join(sequence_list)))
+                        if len(record_list) >= chunk_size:
+                            yield record_list
+                            record_list = []
+                    header = line[1:]
+                    sequence_list = []
+                else:
+                    sequence_list.append(line)
+        if header is not None:
+            record_list.append((header, ''.join(sequence_list)))
+        if len(record_list) > 0:
+            yield record_list
+
+    def iter_assigned(self, in_fasta_path):
+        """Yields lists of (sample name, header, trimmed sequence) of the assigned reads in the order of the input
+
+        :param in_fasta_path: Path to the merged FASTA file
+        """
+        Logger.instance().debug("Demultiplexing in-process: {}".format(in_fasta_path))
+
+        if self.num_threads > 1:
+            with multiprocessing.Pool(processes=self.num_threads, initializer=_init_worker,
+                                      initargs=(self.tag_index,)) as pool:
+                # imap keeps the read order of the input
+                for assigned_list in pool.imap(_assign_chunk, self.read_fasta_chunks(in_fasta_path)):
+                    yield assigned_list
+        else:
+            for record_list in self.read_fasta_chunks(in_fasta_path):
+                yield self.assign_records(record_list, self.tag_index)
+
+    def run(self, in_fasta_path, out_fasta_path_dic):
+        """Demultiplexes in_fasta_path in one pass over the reads
+
+        :param in_fasta_path: Path to the merged FASTA file
+        :param out_fasta_path_dic: dictionary with sample names as keys and output FASTA paths as values.
+            All the output files are created, also the empty ones.
+        :return: void
+        """
+        fout_dic = {}
+        try:
+            for name in out_fasta_path_dic:
+                out_fasta_path = out_fasta_path_dic[name]
+                fout_dic[name] = self.get_open(out_fasta_path)(out_fasta_path, 'wt')
+
+            for assigned_list in self.iter_assigned(in_fasta_path):
+                self.write_assigned(assigned_list, fout_dic)
+        finally:
+            for fout in fout_dic.values():
+                fout.close()
+
+    @staticmethod
+    def write_assigned(assigned_list, fout_dic):
+        for name, header, sequence in assigned_list:
+            fout_dic[name].write(">{}\n{}\n".format(header, sequence))
@@ -0,0 +1,144 @@
+import collections
+import concurrent.futures
+import shlex
+import subprocess
+import sys
+import tempfile
+import threading
+
+from vtam.utils.Logger import Logger
+from vtam.utils.PathManager import PathManager
+from vtam.utils.RunnerDemultiplexTags import RunnerDemultiplexTags
+from vtam.utils.VTAMexception import VTAMexception
+
+# Complement of the DNA IUPAC codes, used with bytes.translate
+complement_bytes_table = bytes.maketrans(b'ACGTUMRWSYKVHDBNacgtumrwsykvhdbn',
+                                         b'TGCAAKYWSRMBDHVNtgcaakywsrmbdhvn')
+
+# Reads buffered by the reader of each cutadapt process before writing to the sorted files
+chunk_size = 10000
+
+
+class RunnerTrimPrimers(object):
+    """Trims the primers of demultiplexed reads and writes them directly to the sorted FASTA files.
+
+    There is one cutadapt process per primer pair and read orientation. The reads are streamed to
+    the stdin of cutadapt with the index of their sorted file in the header, eg '>3:read_id', and
+    the stdout of cutadapt is read back in a thread that reverse complements the reversed reads
+    and writes them to the sorted file. No intermediate FASTA file is written."""
+
+    def __init__(self, cmd_cutadapt_list, out_fasta_path_list, sample_job_dic, dereplicate=False):
+        """
+        :param cmd_cutadapt_list: list of (cutadapt command reading stdin and writing stdout, True if reversed)
+        :param out_fasta_path_list: list of sorted FASTA paths
+        :param sample_job_dic: dictionary with tag sample names as keys and lists of (index in cmd_cutadapt_list,
+            index in out_fasta_path_list) as values
+        :param dereplicate: If True, the reads of each sorted file are also counted
+        :return: void
+        """
+        self.cmd_cutadapt_list = cmd_cutadapt_list
+        self.out_fasta_path_list = out_fasta_path_list
+        self.sample_job_dic = sample_job_dic
+        self.dereplicate = dereplicate
+
+        self.fout_list = []
+        self.lock_list = [threading.Lock() for _ in out_fasta_path_list]
+        # Counter of the reads of each sorted file if dereplicate
+        self.read_count_dic_list = [collections.Counter() for _ in out_fasta_path_list]
+
+    def run(self, assigned_iter):
+        """Trims the primers of the assigned reads
+
+        :param assigned_iter: iterable of lists of (tag sample name, header, sequence)
+        :return: void
+        """
+        tempdir = PathManager.instance().get_tempdir()
+        process_list = []
+        stderr_list = []
+        try:
+            for out_fasta_path in self.out_fasta_path_list:
+                self.fout_list.append(RunnerDemultiplexTags.get_open(out_fasta_path)(out_fasta_path, 'wb'))
+
+            for cmd_cutadapt_str, _ in self.cmd_cutadapt_list:
+                Logger.instance().debug("Running: {}".format(cmd_cutadapt_str))
+                if sys.platform.startswith("win"):
+                    args = cmd_cutadapt_str
+                else:
+                    args = shlex.split(cmd_cutadapt_str)
+                # The report of cutadapt goes to stderr because the reads go to stdout
+                stderr = tempfile.TemporaryFile(dir=tempdir)
+                stderr_list.append(stderr)
+                process_list.append(subprocess.Popen(
+                    args=args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=stderr))
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(process_list))) as executor:
+                future_list = [executor.submit(self.read_trimmed, process.stdout, is_reversed)
+                               for process, (_, is_reversed) in zip(process_list, self.cmd_cutadapt_list)]
+                try:
+                    for assigned_list in assigned_iter:
+                        self.write_assigned(assigned_list, process_list)
+                finally:
+                    for process in process_list:
+                        process.stdin.close()
+                for future in future_list:
+                    future.result()
+
+            for process, stderr, (cmd_cutadapt_str, _) in zip(process_list, stderr_list, self.cmd_cutadapt_list):
+                process.wait()
+                stderr.seek(0)
+                Logger.instance().info(stderr.read().decode())
+                if process.returncode != 0:
+                    Logger.instance().error(VTAMexception(
+                        "cutadapt failed with return code {}: {}".format(process.returncode, cmd_cutadapt_str)))
+                    sys.exit(1)
+        finally:
+            for process in process_list:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+            for stderr in stderr_list:
+                stderr.close()
+            for fout in self.fout_list:
+                fout.close()
+
+    def write_assigned(self, assigned_list, process_list):
+        """Sends the assigned reads to the cutadapt processes of their tag sample"""
+
+        job_line_dic = collections.defaultdict(list)
+        for name, header, sequence in assigned_list:
+            for job_i, out_i in self.sample_job_dic.get(name, []):
+                job_line_dic[job_i].append(">{}:{}\n{}\n".format(out_i, header, sequence))
+        for job_i in job_line_dic:
+            process_list[job_i].stdin.write(''.join(job_line_dic[job_i]).encode())
+
+    def read_trimmed(self, fin, is_reversed):
+        """Reads the output of one cutadapt process and writes the reads to the sorted files.
+        cutadapt writes each FASTA record on two lines.
+
+        :param fin: stdout of the cutadapt process
+        :param is_reversed: If True, the reads are reverse complemented back
+        :return: void
+        """
+        out_record_dic = collections.defaultdict(list)
+        record_count = 0
+        for header in fin:
+            sequence = fin.readline().rstrip(b'\r\n')
+            out_i, header = header[1:].split(b':', 1)
+            if is_reversed:
+                sequence = sequence.translate(complement_bytes_table)[::-1]
+            out_record_dic[int(out_i)].append((header, sequence))
+            record_count += 1
+            if record_count >= chunk_size:
+                self.write_trimmed(out_record_dic)
+                out_record_dic = collections.defaultdict(list)
+                record_count = 0
+        self.write_trimmed(out_record_dic)
+
+    def write_trimmed(self, out_record_dic):
+        for out_i in out_record_dic:
+            record_list = out_record_dic[out_i]
+            with self.lock_list[out_i]:
+                self.fout_list[out_i].write(b''.join([b'>' + header + sequence + b'\n'
+                                                      for header, sequence in record_list]))
+                if self.dereplicate:
+                    self.read_count_dic_list[out_i].update(sequence.upper() for _, sequence in record_list)
@@ -0,0 +1,77 @@
+import shlex
+import subprocess
+import sys
+import tempfile
+
+from vtam.utils.FileCompression import FileCompression
+from vtam.utils.Logger import Logger
+
+
+class RunnerVSearch(object):
+
+    def __init__(self, parameters):
+        """Creates a vsearch object based on the parameters
+
+        :param parameters: Dictionary with key:value for store parameters or key:None for other parameters
+        :return: void
+        """
+        self.parameters = parameters
+
+    def create_command(self):
+        """Create the vsearch command that will be run_name
+
+        :return: void
+        """
+
+        command = 'vsearch'
+        for param in self.parameters:
+            if not self.parameters[param] is None:
+                command += ' --{} {}'.format(param, self.parameters[param])
+            else:
+                command += ' --{}'.format(param)
+        Logger.instance().debug(command)
+
+        return command
+
+    def run(self):
+        """Run the vsearch
+
+        :return: void
+        """
+        cmd = self.create_command()
+
+        if sys.platform.startswith("win"):
+            args = cmd
+        else:
+            args = shlex.split(cmd)
+        run_result = subprocess.run(args=args, stdout=subprocess.PIPE,
+                                    stderr=subprocess.STDOUT)
+
+        Logger.instance().info(run_result.stdout.decode())
+
+    def run_compressed(self, out_param, compressed_path):
+        """Run the vsearch and pipe the output of the out_param argument (eg. fastaout) into a
+        compressor, so that only the compressed file is written to disk
+
+        :param out_param: vsearch argument of the output to compress
+        :param compressed_path: Path of the output file ending with .gz or .bz2
+        :return: void
+        """
+        self.parameters[out_param] = '/dev/stdout'
+        cmd = self.create_command()
+        num_threads = self.parameters.get('threads', 1)
+
+        # vsearch messages are written to a temporary file to leave stdout to the output
+        with tempfile.TemporaryFile() as ferr:
+            process = subprocess.Popen(args=shlex.split(cmd), stdout=subprocess.PIPE, stderr=ferr)
+            try:
+                FileCompression.stream_compression(fin=process.stdout,
+                                                   path_to_compressed_file=compressed_path,
+                                                   num_threads=num_threads)
+            finally:
+                process.stdout.close()
+                process.wait()
+            ferr.seek(0)
+            Logger.instance().info(ferr.read().decode())
+
+        self.parameters[out_param] = compressed_path
@@ -0,0 +1,105 @@
+import importlib
+import os
+import sqlite3
+import sys
+
+import sqlalchemy
+
+from vtam.utils.Logger import Logger
+from vtam.utils.VTAMexception import VTAMexception
+
+# Models with indexes that are missing in the tables created by previous VTAM versions
+indexed_model_name_list = [
+    'VariantReadCount', 'FilterLFN', 'FilterMinReplicateNumber', 'FilterMinReplicateNumber2',
+    'FilterMinReplicateNumber3', 'FilterPCRerror', 'FilterChimera', 'FilterChimeraBorderline',
+    'FilterRenkonen', 'FilterIndel', 'FilterCodonStop', 'ReadCountAverageOverReplicates']
+
+
+class SqliteTuning(object):
+    """Sets the SQLite pragmas of the 'sqlite_*' parameters and creates the missing indexes.
+
+    The pragmas are passed to the wopmars process through the VTAM_SQLITE_PRAGMA environment
+    variable and set on each new connection by on_connect, which is listened by all engines."""
+
+    env_name = 'VTAM_SQLITE_PRAGMA'
+    journal_mode_list = ['DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF']
+    synchronous_list = ['OFF', 'NORMAL', 'FULL', 'EXTRA']
+
+    @staticmethod
+    def get_pragma_dic(params_dic):
+        """Checks the 'sqlite_*' parameters and returns them as a dictionary of pragmas
+
+        :param params_dic: dictionary of parameters, eg FileParams.get_params_dic
+        :return: dictionary with keys journal_mode, synchronous and cache_size
+        """
+        journal_mode = str(params_dic['sqlite_journal_mode']).upper()
+        synchronous = str(params_dic['sqlite_synchronous']).upper()
+        if not (journal_mode in SqliteTuning.journal_mode_list):
+            Logger.instance().error(VTAMexception(
+                "The sqlite_journal_mode parameter must be one of: {}".format(
+                    ', '.join(SqliteTuning.journal_mode_list))))
+            sys.exit(1)
+        if not (synchronous in SqliteTuning.synchronous_list):
+            Logger.instance().error(VTAMexception(
+                "The sqlite_synchronous parameter must be one of: {}".format(
+                    ', '.join(SqliteTuning.synchronous_list))))
+            sys.exit(1)
+        try:
+            cache_size = int(params_dic['sqlite_cache_size'])
+        except ValueError:
+            Logger.instance().error(VTAMexception("The sqlite_cache_size parameter must be an integer"))
+            sys.exit(1)
+        return {'journal_mode': journal_mode, 'synchronous': synchronous, 'cache_size': cache_size}
+
+    @staticmethod
+    def set_environ(params_dic):
+        """Passes the pragmas of the parameters to this process and its subprocesses"""
+
+        pragma_dic = SqliteTuning.get_pragma_dic(params_dic)
+        os.environ[SqliteTuning.env_name] = ';'.join(
+            '{}={}'.format(pragma, pragma_dic[pragma]) for pragma in pragma_dic)
+
+    @staticmethod
+    def get_environ_pragma_dic():
+
+        pragma_str = os.getenv(SqliteTuning.env_name)
+        if not pragma_str:
+            return {}
+        return dict(pragma_value.split('=', 1) for pragma_value in pragma_str.split(';'))
+
+    @staticmethod
+    def on_connect(dbapi_connection, connection_record):
+        """Listener of the connect event of the SQLAlchemy pools. The journal mode is stored in the
+        database file and is set once by set_journal_mode"""
+
+        if not isinstance(dbapi_connection, sqlite3.Connection):
+            return
+        pragma_dic = SqliteTuning.get_environ_pragma_dic()
+        for pragma in ['synchronous', 'cache_size']:
+            if pragma in pragma_dic:
+                dbapi_connection.execute("PRAGMA {} = {}".format(pragma, pragma_dic[pragma]))
+
+    @staticmethod
+    def set_journal_mode(conn):
+        """Sets the journal mode of the environment pragmas
+
+        :param conn: SQLAlchemy connection
+        :return: void
+        """
+        pragma_dic = SqliteTuning.get_environ_pragma_dic()
+        if 'journal_mode' in pragma_dic:
+            conn.execute(sqlalchemy.text("PRAGMA journal_mode = {}".format(pragma_dic['journal_mode'])))
+
+    @staticmethod
+    def create_index(conn):
+        """Creates the indexes of the models in existing tables that do not have them
+
+        :param conn: SQLAlchemy connection
+        :return: void
+        """
+        inspector = sqlalchemy.inspect(conn)
+        for model_name in indexed_model_name_list:
+            model = getattr(importlib.import_module('vtam.models.{}'.format(model_name)), model_name)
+            if inspector.has_table(model.__tablename__):
+                for index in model.__table__.indexes:
+                    index.create(bind=conn, checkfirst=True)
@@ -0,0 +1,432 @@
+#standard imports
+import collections
+import inspect
+import multiprocessing
+import os
+import sys
+import gzip 
+import bz2
+from functools import partial
+
+#third party imports
+import pandas
+import sqlalchemy
+from sqlalchemy import select, bindparam, func
+
+
+#local imports
+from vtam.utils.Logger import Logger
+from vtam.utils.FileSampleInformation import FileSampleInformation
+from vtam.utils.VariantSequenceHash import VariantSequenceHash
+from vtam.utils.VTAMexception import VTAMexception
+from vtam.utils.DataframeVariantReadCountLike import DataframeVariantReadCountLike
+from wopmars.models.ToolWrapper import ToolWrapper
+
+
+
+
+class VariantReadCount(ToolWrapper):
+
+    __mapper_args__ = {
+        "polymorphic_identity": __module__
+    }
+    # Input
+    # Input file
+    __input_file_sortedinfo = "sortedinfo"
+    # Input table
+    __input_table_run = "Run"
+    __input_table_marker = "Marker"
+    __input_table_sample = "Sample"
+    # Output
+    # Output file
+    # Output table
+    __output_table_variant = 'Variant'
+    __output_table_variant_read_count = 'VariantReadCount'
+
+    def specify_input_table(self):
+        return [
+            VariantReadCount.__input_table_run,
+            VariantReadCount.__input_table_marker,
+            VariantReadCount.__input_table_sample,
+        ]
+
+    def specify_input_file(self):
+        return[
+            # VariantReadCount.__input_file_sort_reads,
+            VariantReadCount.__input_file_sortedinfo,
+        ]
+
+    def specify_output_table(self):
+        return [
+            VariantReadCount.__output_table_variant,
+            VariantReadCount.__output_table_variant_read_count,
+        ]
+
+    def specify_params(self):
+        """
+
+        :return:
+        """
+        return {
+            "read_dir": "str",
+            "global_read_count_cutoff": "int",
+        }
+
+    @staticmethod
+    def get_sorted_read_count_dic(file_path):
+        """Counts the reads of a sorted FASTA file, compressed or not. The file is parsed as bytes
+        by blocks of lines, so memory depends on the number of unique sequences, not reads.
+        Sequences can span several lines.
+
+        :param file_path: Path to the sorted FASTA file
+        :return: collections.Counter with uppercase sequences as keys and read counts as values
+        """
+        if file_path.endswith(".gz"):
+            _open = partial(gzip.open)
+        elif file_path.endswith(".bz2"):
+            _open = partial(bz2.open)
+        else:
+            _open = open
+
+        read_count_bytes_dic = collections.Counter()
+        sequence_list = None  # Lines of the current sequence
+        with _open(file_path, 'rb') as fin:
+            line_list = fin.readlines(1024 * 1024)
+            while line_list:
+                for line in line_list:
+                    if line.startswith(b'>'):
+                        if sequence_list is not None:
+                            read_count_bytes_dic[b''.join(sequence_list)] += 1
+                        sequence_list = []
+                    elif sequence_list is not None:  # Lines before the first header are ignored
+                        sequence_list.append(line.strip())
+                line_list = fin.readlines(1024 * 1024)
+        if sequence_list is not None:
+            read_count_bytes_dic[b''.join(sequence_list)] += 1
+
+        # Sequences are normalized once per unique sequence
+        read_count_dic = collections.Counter()
+        for sequence in read_count_bytes_dic:
+            read_count_dic[sequence.replace(b' ', b'').decode().upper()] += read_count_bytes_dic[sequence]
+        return read_count_dic
+
+    @staticmethod
+    def get_read_count_df(read_file):
+        """Dereplicates one sorted file
+
+        :param read_file: tuple (run_id, marker_id, sample_id, replicate, FASTA path, dereplicated path or None)
+        :return: DataFrame with columns run_id, marker_id, sample_id, replicate, read_sequence, read_count
+            or None if the file does not exist
+        """
+        run_id, marker_id, sample_id, replicate, read_fasta_path, read_derep_path = read_file
+
+        if read_derep_path is not None and os.path.exists(read_derep_path):
+
+            Logger.instance().debug(
+                "file: {}; line: {}; Read dereplicated file: {}".format(
+                    __file__, inspect.currentframe().f_lineno, read_derep_path))
+
+            read_count_df = VariantReadCount.get_derep_read_count_df(read_derep_path)
+
+        elif os.path.exists(read_fasta_path):
+
+            Logger.instance().debug(
+                "file: {}; line: {}; Read FASTA: {}".format(
+                    __file__, inspect.currentframe().f_lineno, read_fasta_path))
+
+            read_count_dic = VariantReadCount.get_sorted_read_count_dic(read_fasta_path)
+            read_count_df = pandas.DataFrame({'read_sequence': list(read_count_dic.keys()),
+                                              'read_count': list(read_count_dic.values())})
+
+        else:
+            Logger.instance().warning('This file {} doest not exists'.format(read_fasta_path))
+            return None
+
+        read_count_df.insert(0, 'replicate', replicate)
+        read_count_df.insert(0, 'sample_id', sample_id)
+        read_count_df.insert(0, 'marker_id', marker_id)
+        read_count_df.insert(0, 'run_id', run_id)
+        return read_count_df
+
+    @staticmethod
+    def get_derep_read_count_df(file_path):
+        """Reads the dereplicated file written by 'vtam sortreads --dereplicate'
+
+        :param file_path: TSV file (Possibly compressed) with columns sequence and count
+        :return: DataFrame with columns read_sequence, read_count
+        """
+        derep_df = pandas.read_csv(file_path, sep="\t", header=0, dtype={'sequence': str, 'count': int},
+                                   keep_default_na=False)
+        derep_df.columns = ['read_sequence', 'read_count']
+        return derep_df
+  
+
+
+    def run(self):
+        session = self.session
+        engine = session._session().get_bind()
+
+        #######################################################################
+        #
+        # Wrapper inputs, outputs and parameters
+        #
+        #######################################################################
+
+        # Input file
+        # sort_reads_tsv = self.input_file(VariantReadCount.__input_file_sort_reads)
+        input_file_sortedinfo = self.input_file(
+            VariantReadCount.__input_file_sortedinfo)
+        #
+        # Input table models
+        run_model = self.input_table(VariantReadCount.__input_table_run)
+        marker_model = self.input_table(VariantReadCount.__input_table_marker)
+        sample_model = self.input_table(
+            VariantReadCount.__input_table_sample)
+        #
+        # Output
+        # Output table
+        variant_model = self.output_table(
+            VariantReadCount.__output_table_variant)
+        variant_read_count_model = self.output_table(
+            VariantReadCount.__output_table_variant_read_count)
+        # Options
+        read_dir = self.option("read_dir")
+        global_read_count_cutoff = self.option(
+            "global_read_count_cutoff")
+
+        #######################################################################
+        #
+        # 1. Read sortedinfo to get run_id, marker_id, sample_id, replicate for current analysis
+        # 2. Delete marker_name/run_name/sample/replicate from variant_read_count_model
+        # 3. Read tsv file with sorted reads
+        # 4. Group by read sequence
+        # 5. Delete variants if below global_read_count_cutoff
+        # 6. Insert into Variant and DataframeVariantReadCountLike tables
+        #
+        #######################################################################
+
+        #######################################################################
+        #
+        # 1. Read sample information to get run_id, marker_id, sample_id, replicate for current analysis
+        #
+        #######################################################################
+
+        Logger.instance().debug(
+            "file: {}; line: {}; Read sample information".format(
+                __file__, inspect.currentframe().f_lineno))
+        sortedinfo_df = pandas.read_csv(input_file_sortedinfo, sep="\t", header=0)
+        sample_instance_list = []
+        sortedinfo_df.columns = sortedinfo_df.columns.str.lower()
+
+        for row in sortedinfo_df.itertuples():
+            Logger.instance().debug(row)
+            marker_name = row.marker
+            run_name = row.run
+            sample_name = row.sample
+            replicate = row.replicate
+            with engine.connect() as conn:
+                # get run_id ###########
+                stmt_select_run_id = select([run_model.__table__.c.id]).where(
+                    run_model.__table__.c.name == run_name)
+                run_id = conn.execute(stmt_select_run_id).first()[0]
+                # get marker_id ###########
+                stmt_select_marker_id = select([marker_model.__table__.c.id]).where(
+                    marker_model.__table__.c.name == marker_name)
+                marker_id = conn.execute(stmt_select_marker_id).first()[0]
+                # get sample_id ###########
+                stmt_select_sample_id = select([sample_model.__table__.c.id]).where(
+                    sample_model.__table__.c.name == sample_name)
+                sample_id = conn.execute(
+                    stmt_select_sample_id).first()[0]
+                # add this sample_instance ###########
+                sample_instance_list.append({'run_id': run_id,
+                                             'marker_id': marker_id,
+                                             'sample_id': sample_id,
+                                             'replicate': replicate})
+
+        #######################################################################
+        #
+        # 2. Delete marker_name/run_name/sample/replicate from variant_read_count_model
+        #
+        #######################################################################
+
+        Logger.instance().debug(
+            "file: {}; line: {}; Delete marker_name/run_name/sample/replicate".format(
+                __file__, inspect.currentframe().f_lineno))
+
+        with engine.connect() as conn:
+            stmt_del = variant_read_count_model.__table__.delete()
+            stmt_del = stmt_del.where(
+                variant_read_count_model.__table__.c.run_id == bindparam('run_id'))
+            stmt_del = stmt_del.where(
+                variant_read_count_model.__table__.c.marker_id == bindparam('marker_id'))
+            stmt_del = stmt_del.where(
+                variant_read_count_model.__table__.c.sample_id == bindparam('sample_id'))
+            stmt_del = stmt_del.where(
+                variant_read_count_model.__table__.c.replicate == bindparam('replicate'))
+            conn.execute(stmt_del, sample_instance_list)
+
+        #######################################################################
+        #
+        # 3. Read tsv file with sorted reads
+        #
+        #######################################################################
+
+        # fasta_info_obj = FastaInformationTSV(input_file_sortedinfo, engine=engine)
+        # sample_info_ids_df = fasta_info_obj.get_ids_df()
+        sample_info_tsv_obj = FileSampleInformation(
+            tsv_path=input_file_sortedinfo)
+        sample_info_ids_df = sample_info_tsv_obj.to_identifier_df(engine=engine)
+
+        Logger.instance().debug(
+            "file: {}; line: {}; Read demultiplexed FASTA files".format(
+                __file__, inspect.currentframe().f_lineno))
+
+        # One job per sorted file: (run_id, marker_id, sample_id, replicate, FASTA path, dereplicated path or None)
+        read_file_list = []
+        for row in sample_info_ids_df.itertuples():
+            # Prefer the dereplicated file of 'vtam sortreads --dereplicate' if available
+            read_derep_path = None
+            if 'sortedderep' in sample_info_ids_df.columns and isinstance(row.sortedderep, str):
+                read_derep_path = os.path.join(read_dir, row.sortedderep)
+            read_file_list.append((row.run_id, row.marker_id, row.sample_id, row.replicate,
+                                   os.path.join(read_dir, row.sortedfasta), read_derep_path))
+
+        # Files are dereplicated in parallel and the partial counts are concatenated once
+        if os.getenv('VTAM_THREADS') is None:
+            num_threads = multiprocessing.cpu_count()
+        else:
+            num_threads = int(os.getenv('VTAM_THREADS'))
+        num_processes = max(1, min(num_threads, len(read_file_list)))
+        if num_processes > 1:
+            with multiprocessing.Pool(processes=num_processes) as pool:
+                variant_read_count_df_list = pool.map(VariantReadCount.get_read_count_df, read_file_list, chunksize=1)
+        else:
+            variant_read_count_df_list = [VariantReadCount.get_read_count_df(read_file) for read_file in read_file_list]
+
+        variant_read_count_df_list = [df for df in variant_read_count_df_list if df is not None]
+        if len(variant_read_count_df_list) > 0:
+            variant_read_count_df = pandas.concat(variant_read_count_df_list, axis=0)
+        else:
+            variant_read_count_df = pandas.DataFrame(
+                columns=['run_id', 'marker_id', 'sample_id', 'replicate', 'read_sequence', 'read_count'])
+
+        #######################################################################
+        #
+        # 4. Group by read sequence to variant_read_count with run_id, marker_name, ...
+        #
+        #######################################################################
+
+        Logger.instance().debug(
+            "file: {}; line: {}; Group by read sequence".format(
+                __file__, inspect.currentframe().f_lineno))
+        variant_read_count_df = variant_read_count_df.groupby(
+            ['run_id', 'marker_id', 'sample_id', 'replicate', 'read_sequence']) .sum().reset_index()
+        variant_read_count_df.rename(
+            columns={
+                'read_sequence': 'variant_id'},
+            inplace=True)
+        variant_read_count_df.sort_values(
+            by=variant_read_count_df.columns.tolist())
+
+        #######################################################################
+        #
+        # 5. Remove variants with read count across all run_name, markers, samples and replicates lower than
+        # global_read_count_cutoff parameter
+        #
+        #######################################################################
+
+        variant_read_count_like_df_obj = DataframeVariantReadCountLike(variant_read_count_df)
+        Logger.instance().debug(
+            "file: {}; line: {}; Remove variants with global read count lower than parameter 'global_read_count_cutoff'".format(
+                __file__, inspect.currentframe().f_lineno))
+        variant_read_count_df = variant_read_count_like_df_obj.filter_out_below_global_read_count_cutoff(
+            global_read_count_cutoff=global_read_count_cutoff)
+        variant_read_count_df.rename(
+            columns={
+                'variant_id': 'variant_sequence'},
+            inplace=True)
+
+        #######################################################################
+        #
+        # 6. Insert into Variant and VariantReadCount tables
+        #
+        #######################################################################
+
+        Logger.instance().debug("file: {}; line: {}; Insert variants".format(
+                __file__, inspect.currentframe().f_lineno))
+        variant_read_count_df.sort_values(
+            by=['variant_sequence', 'run_id', 'marker_id', 'sample_id', 'replicate'], inplace=True)
+        # Unique sequences in sorted order, so that new variants get increasing ids in this order
+        variant_sequence_list = variant_read_count_df.variant_sequence.unique().tolist()
+        with engine.connect() as conn:
+            # Retrieve maximal variant id if possible
+            select_variant_id_max = conn.execute(sqlalchemy.select(
+                [func.max(variant_model.__table__.c.id)])).first()[0]
+            if select_variant_id_max is None:
+                select_variant_id_max = 0  # If no variants, then maximal variant id is 0
+            # Ids of the sequences already in the database, with one join against a temporary table of hashes
+            variant_id_dic = VariantSequenceHash.select_id_dic(conn=conn, variant_sequence_list=variant_sequence_list)
+
+        # Sequences not in the database will be inserted
+        variant_new_instance_list = []
+        for variant_sequence in variant_sequence_list:
+            if not (variant_sequence in variant_id_dic):
+                variant_id = select_variant_id_max + len(variant_new_instance_list) + 1
+                variant_id_dic[variant_sequence] = variant_id
+                variant_new_instance_list.append({'id': variant_id, 'sequence': variant_sequence,
+                                                  'sequence_hash': VariantSequenceHash.get_hash(variant_sequence)})
+
+        variant_read_count_df['variant_id'] = variant_read_count_df.variant_sequence.map(variant_id_dic)
+        variant_read_count_instance_list = variant_read_count_df[
+            ['run_id', 'marker_id', 'variant_id', 'sample_id', 'replicate', 'read_count']].to_dict('records')
+
+        #######################################################################
+        #
+        # Exit if variant_read_count_instance_list empty
+        #
+        #######################################################################
+
+        if not len(variant_read_count_instance_list):
+            Logger.instance().warning(
+                VTAMexception(
+                    "No new variants in these samples. Maybe singletons? The analysis will stop here.".format(
+                        self.__class__.__name__)))
+            sys.exit(0)
+
+        #######################################################################
+        #
+        # Write variant_read_count table
+        #
+        #######################################################################
+
+        Logger.instance().debug(
+            "file: {}; line: {};  Insert variant read count".format(
+                __file__, inspect.currentframe().f_lineno))
+
+        with engine.connect() as conn:
+
+            # Insert if there some new variants
+            if len(variant_new_instance_list) > 0:
+                conn.execute(
+                    variant_model.__table__.insert(),
+                    variant_new_instance_list)
+
+            # Insert new variant_read_count_instances
+            conn.execute(
+                variant_read_count_model.__table__.insert(),
+                variant_read_count_instance_list)
+
+        #######################################################################
+        #
+        # Touch output tables, to update modification date
+        #
+        #######################################################################
+
+        for output_table_i in self.specify_output_table():
+            declarative_meta_i = self.output_table(output_table_i)
+            obj = session.query(declarative_meta_i).order_by(
+                declarative_meta_i.id.desc()).first()
+            session.query(declarative_meta_i).filter_by(
+                id=obj.id).update({'id': obj.id})
+            session.commit()
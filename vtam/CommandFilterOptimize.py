@@ -7,7 +7,10 @@ import sys
 from vtam.utils.Logger import Logger
 from vtam.utils.RunnerWopmars import RunnerWopmars
 from vtam.utils.constants import FilterLFNreference_records
+from vtam.utils.FileParams import FileParams
 from vtam.utils.FileSampleInformation import FileSampleInformation
+from vtam.utils.SqliteTuning import SqliteTuning
+from vtam.utils.VariantSequenceHash import VariantSequenceHash
 
 class CommandFilterOptimize(object):
     """Class for the Merge command"""
@@ -21,7 +24,13 @@ class CommandFilterOptimize(object):
         #
         ###################################################################
 
+        # SQLite pragmas of the parameters, also passed to the wopmars process
+        SqliteTuning.set_environ(FileParams(arg_parser_dic['params']).get_params_dic())
+
         engine = sqlalchemy.create_engine('sqlite:///{}'.format(str(arg_parser_dic['db'])), echo=False)
+        SqliteTuning.listen(engine)
+        with engine.connect() as conn:
+            SqliteTuning.set_journal_mode(conn)
         meta = sqlalchemy.MetaData()
         filter_lfn_reference = sqlalchemy.Table(
             'FilterLFNreference', meta,
@@ -41,6 +50,13 @@ class CommandFilterOptimize(object):
                         filter_lfn_reference.insert().values(
                             **filter_rec))
 
+        # Variant tables of previous VTAM versions get the sequence_hash column before wopmars reads them
+        # and the filter tables get their new columns and indexes
+        with engine.connect() as conn:
+            VariantSequenceHash.upgrade(conn)
+            SqliteTuning.create_column(conn)
+            SqliteTuning.create_index(conn)
+
         wopmars_runner = RunnerWopmars(command=arg_parser_dic['command'], cli_args_dic=arg_parser_dic)
         wopmars_command = wopmars_runner.get_wopmars_command()
 
@@ -9,7 +9,6 @@ import subprocess
 import gzip 
 import bz2
 from functools import partial
-import shlex
 
 # Compatible with both pre- and post Biopython 1.78:
 try:
@@ -19,17 +18,22 @@ except ImportError:
 
 from Bio.Seq import Seq
 from vtam.utils.Logger import Logger
+from vtam.utils.FileManifest import FileManifest
 from vtam.utils.FileParams import FileParams
 from vtam.utils.PathManager import PathManager
 from vtam.utils.FileSampleInformation import FileSampleInformation
 from vtam.utils.FilesInputCutadapt import FilesInputCutadapt
+from vtam.utils.RunnerDemultiplexTags import RunnerDemultiplexTags
+from vtam.utils.RunnerJobPool import RunnerJobPool
+from vtam.utils.RunnerTrimPrimers import RunnerTrimPrimers
+
 
 class CommandSortReads(object):
     """Class for the Merge command"""
 
     @staticmethod
     def main(fastainfo, fastadir, sorteddir, params=None, num_threads=multiprocessing.cpu_count(), 
-        no_reverse=False, tag_to_end=False, primer_to_end=False):
+        no_reverse=False, tag_to_end=False, primer_to_end=False, dereplicate=False, forceall=False):
         
         Logger.instance().info(f"OPTIONS:\n no_reverse: {not no_reverse} \n tag_to_end {not tag_to_end} \n primer_to_end {not primer_to_end}")
 
@@ -48,6 +52,11 @@ class CommandSortReads(object):
         cutadapt_minimum_length = params_dic['cutadapt_minimum_length']
         cutadapt_maximum_length = params_dic['cutadapt_maximum_length']
 
+        # Parameters and options that change the sorted files
+        sortreads_params_dic = {k: params_dic[k] for k in params_dic if k.startswith('cutadapt_')}
+        sortreads_params_dic.update({'no_reverse': no_reverse, 'tag_to_end': tag_to_end,
+                                     'primer_to_end': primer_to_end, 'dereplicate': dereplicate})
+
         ############################################################################################
         #
         # Loop over tag and primer pairs to demultiplex and trim reads
@@ -63,6 +72,10 @@ class CommandSortReads(object):
         results_list = []
         sample_info = {}
 
+        # Merged FASTA files whose checksums, tags, primers and parameters are unchanged since the last run are skipped
+        sortreads_manifest = FileManifest(manifest_path=os.path.join(sorteddir, 'sortreads_manifest.tsv'),
+                                          key_columns=['mergedfasta'])
+
         # make sure every file is analysed once.
         for i in range(merged_fastainfo_df.shape[0]):
             if merged_fastainfo_df.iloc[i].mergedfasta not in merged_fasta_list:
@@ -71,8 +84,7 @@ class CommandSortReads(object):
         for mergedfasta in merged_fasta_list:
 
             inputFiles = FilesInputCutadapt(fastainfo, mergedfasta, no_reverse, tag_to_end)
-            
-            tagFile_path = inputFiles.tags_file()
+
             info = inputFiles.get_df_info()
 
             for key in info.keys():
@@ -85,48 +97,18 @@ class CommandSortReads(object):
 
             in_raw_fasta_path = os.path.join(fastadir, mergedfasta)
 
-            ########################################################################################
-            #
-            #   cutadapt --cores=0 -e 0 --no-indels --trimmed-only -g tagFile:$tagfile 
-            #   --overlap length -o "tagtrimmed.{name}.fasta" in_raw_fasta_path
-            #
-            ########################################################################################
-
             base = os.path.basename(in_raw_fasta_path)
             base, base_suffix = base.split('.', 1)
-            
-            out_fasta_path = os.path.join(tempdir, "sorted") 
-
-            cmd_cutadapt_tag_dic = {
-                'in_fasta_path': in_raw_fasta_path,
-                'out_fasta': out_fasta_path,
-                'num_threads': num_threads,
-                'tagFile': tagFile_path,
-                'base_suffix': base_suffix,
-            }
-
-            cmd_cutadapt_tag_str = 'cutadapt --cores={num_threads} --no-indels --error-rate 0 --trimmed-only ' \
-                '-g file:{tagFile} --output {out_fasta}_{{name}}.{base_suffix} {in_fasta_path}' \
-                .format(**cmd_cutadapt_tag_dic)
-
-            Logger.instance().debug("Running: {}".format(cmd_cutadapt_tag_str))
-
-            if sys.platform.startswith("win"):
-                args = cmd_cutadapt_tag_str
-            else:
-                args = shlex.split(cmd_cutadapt_tag_str)
-            run_result = subprocess.run(args=args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-
-            Logger.instance().info(run_result.stdout.decode())
-
-            inputFiles.remove_tags_file()
 
             ########################################################################################
             #
             # Trim primers from output
             # cutadapt --quiet --cores=0 -e trim_error --no-indels --trimmed-only 
             # --minimum-length minimum_length --maximum-length maximum_length 
-            # --output input_path + {name} + suffix outputfile
+            # -
+            #
+            # The demultiplexed reads are piped to one cutadapt process per primer pair and
+            # orientation, and the trimmed reads are written directly to the sorted files
             #
             ########################################################################################
             
@@ -136,11 +118,20 @@ class CommandSortReads(object):
             except Exception as e:
                 Logger.instance().error(e)
                 return 
-            
+
+            cmd_cutadapt_primer_dic_list = []
+            out_fasta_path_list = []
+            out_fasta_index_dic = {}
+            # Tag sample names with their (cutadapt job index, sorted file index)
+            sample_job_dic = {}
+
             for primer in primers:
                 
                 marker, primerfwd, primerrev, lenprimerfwd, lenprimerrev = primer
 
+                # Index of the cutadapt job of this primer pair for each orientation
+                job_index_dic = {}
+
                 for tag_sample in tags_samples:
 
                     name, run, marker2, sample, replicate, _, _ = tag_sample
@@ -148,122 +139,169 @@ class CommandSortReads(object):
                     if marker not in marker2:
                         continue
 
-                    in_fasta_path = out_fasta_path + "_" + name + "." + base_suffix
+                    is_reversed = name.endswith("_reversed")
 
                     baseMerge =  mergedfasta.split(".")[0]
                                         
                     outname = run + "_" + marker + "_" + sample + "_" + replicate + "_" + baseMerge + "_trimmed"
-                    if name.endswith("_reversed"):
-                        outname = outname + "_reversed"
-                    out_fasta_path_new = os.path.join(tempdir, outname + "." + base_suffix)
+                    out_final_fasta_path = os.path.join(sorteddir, outname + "." + base_suffix)
+
+                    if not is_reversed:
+                        results_list.append(out_final_fasta_path)
+                    if out_final_fasta_path not in out_fasta_index_dic:
+                        out_fasta_index_dic[out_final_fasta_path] = len(out_fasta_path_list)
+                        out_fasta_path_list.append(out_final_fasta_path)
+
+                    if is_reversed not in job_index_dic:
+
+                        if not is_reversed:
+                            if generic_dna:  # Biopython <1.78
+                                primerRev = str(Seq(primerrev, generic_dna).reverse_complement())
+                            else:  # Biopython =>1.78
+                                primerRev = str(Seq(primerrev).reverse_complement())
+                            primerFwd = primerfwd
+                            lenPrimerFwd = lenprimerfwd
+                            lenPrimerRev = lenprimerrev
+                        else:
+                            if generic_dna:  # Biopython <1.78
+                                primerRev = str(Seq(primerfwd, generic_dna).reverse_complement())
+                            else:  # Biopython =>1.78
+                                primerRev = str(Seq(primerfwd).reverse_complement())
+                            primerFwd = primerrev
+                            lenPrimerFwd = lenprimerrev
+                            lenPrimerRev = lenprimerfwd
+
+                        cmd_cutadapt_primer_dic = {
+                            'error_rate': cutadapt_error_rate,
+                            'primerFwd': primerFwd,
+                            'primerRev': primerRev,
+                            'lenPrimerFwd': lenPrimerFwd,
+                            'lenPrimerRev': lenPrimerRev,
+                            'read_min_length': cutadapt_minimum_length,
+                            'read_max_length': cutadapt_maximum_length,
+                            'is_reversed': is_reversed,
+                        }
+                        job_index_dic[is_reversed] = len(cmd_cutadapt_primer_dic_list)
+                        cmd_cutadapt_primer_dic_list.append(cmd_cutadapt_primer_dic)
+
+                    sample_job_dic.setdefault(name, []).append(
+                        (job_index_dic[is_reversed], out_fasta_index_dic[out_final_fasta_path]))
 
-                    results_list.append(out_fasta_path_new)
-                    
-                    if not "_reversed" in name:
-                        if generic_dna:  # Biopython <1.78
-                            primerRev = str(Seq(primerrev, generic_dna).reverse_complement())
-                        else:  # Biopython =>1.78
-                            primerRev = str(Seq(primerrev).reverse_complement())
-                        primerFwd = primerfwd
-                        lenPrimerFwd = lenprimerfwd
-                        lenPrimerRev = lenprimerrev
-                    else:
-                        if generic_dna:  # Biopython <1.78
-                            primerRev = str(Seq(primerfwd, generic_dna).reverse_complement())
-                        else:  # Biopython =>1.78
-                            primerRev = str(Seq(primerfwd).reverse_complement())
-                        primerFwd = primerrev
-                        lenPrimerFwd = lenprimerrev
-                        lenPrimerRev = lenprimerfwd
-
-
-                    cmd_cutadapt_primer_dic = {
-                        'in_fasta_path': in_fasta_path,
-                        'out_fasta': out_fasta_path_new,
-                        'error_rate': cutadapt_error_rate,
-                        'num_threads': num_threads,
-                        'primerFwd': primerFwd,
-                        'primerRev': primerRev,
-                        'lenPrimerFwd': lenPrimerFwd,
-                        'lenPrimerRev': lenPrimerRev,
-                        'read_min_length': cutadapt_minimum_length,
-                        'read_max_length': cutadapt_maximum_length,
-                    }
-
-                    if not primer_to_end: #works if the command is selected
-                        cmd_cutadapt_primer_str = 'cutadapt --cores={num_threads} --no-indels --error-rate {error_rate} ' \
-                            '--minimum-length {read_min_length} --maximum-length {read_max_length} ' \
-                            '--trimmed-only -g "^{primerFwd}...{primerRev}$" --output {out_fasta} {in_fasta_path}'\
-                            .format(**cmd_cutadapt_primer_dic)
-                    else:
-                        cmd_cutadapt_primer_str = 'cutadapt --cores={num_threads} --no-indels --error-rate {error_rate} ' \
-                            '--minimum-length {read_min_length} --maximum-length {read_max_length} ' \
-                            '--trimmed-only -g "{primerFwd};min_overlap={lenPrimerFwd}...{primerRev};min_overlap={lenPrimerRev}" '\
-                            '--output {out_fasta} {in_fasta_path}'\
-                            .format(**cmd_cutadapt_primer_dic)
-
-                    Logger.instance().debug("Running: {}".format(cmd_cutadapt_primer_str))
-
-                    if sys.platform.startswith("win"):
-                        args = cmd_cutadapt_primer_str
-                    else:
-                        args = shlex.split(cmd_cutadapt_primer_str)
-
-                    run_result = subprocess.run(args=args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-
-                    Logger.instance().info(run_result.stdout.decode())
-
-        ###################################################################
-        #
-        # Reverse complement back rc fasta and pool
-        #
-        ###################################################################   
-     
-        for file in results_list:
-            if "_trimmed" in file:
-
-                out_final_fasta_path = os.path.join(sorteddir, os.path.split(file)[-1])
-                in_fasta_path = os.path.join(tempdir, file)
-
-                if out_final_fasta_path.endswith(".gz"):      
-                    _open = partial(gzip.open) 
-                elif out_final_fasta_path.endswith(".bz2"):
-                    _open = partial(bz2.open)
-                else:
-                    _open = open
-
-                if in_fasta_path.endswith(".gz"):
-                    _open2 = partial(gzip.open) 
-                elif in_fasta_path.endswith(".bz2"):
-                    _open2 = partial(bz2.open) 
-                else: 
-                    _open2 = open
-
-                if "_reversed" in file:
-                    Logger.instance().debug("Pooling fwd and rc reads...")
-
-                    out_final_fasta_path = out_final_fasta_path.replace("_reversed", "")
-
-                    with _open(out_final_fasta_path, 'at') as fout:
-                        with _open2(in_fasta_path, 'rt') as fin:
-                            for line in fin.readlines():
-                                if not line.startswith('>'):
-                                    if generic_dna:  # Biopython <1.78
-                                        fout.write("%s\n" % str(
-                                            Seq(line.strip(), generic_dna).reverse_complement()))
-                                    else:  # Biopython =>1.78
-                                        fout.write("%s\n" % str(
-                                            Seq(line.strip()).reverse_complement()))
-
-                                else:
-                                    fout.write(line)
+            ########################################################################################
+            #
+            # Run the primer trimming jobs together and split the threads among them
+            #
+            ########################################################################################
+
+            job_pool = RunnerJobPool(job_count=len(cmd_cutadapt_primer_dic_list), num_threads=num_threads)
+
+            cmd_cutadapt_primer_list = []
+            for cmd_cutadapt_primer_dic in cmd_cutadapt_primer_dic_list:
+
+                cmd_cutadapt_primer_dic['num_threads'] = job_pool.threads_per_job
+
+                if not primer_to_end: #works if the command is selected
+                    cmd_cutadapt_primer_str = 'cutadapt --cores={num_threads} --no-indels --error-rate {error_rate} ' \
+                        '--minimum-length {read_min_length} --maximum-length {read_max_length} ' \
+                        '--trimmed-only -g "^{primerFwd}...{primerRev}$" -'\
+                        .format(**cmd_cutadapt_primer_dic)
                 else:
-                    with _open(out_final_fasta_path, 'at') as fout:
-                        with _open2(in_fasta_path, 'rt') as fin:
-                            for line in fin.readlines():
-                                fout.write(line)
-        
-        results_list = [os.path.split(result)[-1] for result in results_list if "_reversed" not in result]
+                    cmd_cutadapt_primer_str = 'cutadapt --cores={num_threads} --no-indels --error-rate {error_rate} ' \
+                        '--minimum-length {read_min_length} --maximum-length {read_max_length} ' \
+                        '--trimmed-only -g "{primerFwd};min_overlap={lenPrimerFwd}...{primerRev};min_overlap={lenPrimerRev}" '\
+                        '-'\
+                        .format(**cmd_cutadapt_primer_dic)
+                cmd_cutadapt_primer_list.append((cmd_cutadapt_primer_str, cmd_cutadapt_primer_dic['is_reversed']))
+
+            ########################################################################################
+            #
+            # Skip merged FASTA file if already sorted with the same inputs and parameters
+            #
+            ########################################################################################
+
+            out_file_path_list = list(out_fasta_path_list)
+            if dereplicate:
+                out_file_path_list += [CommandSortReads.get_derep_path(path) for path in out_fasta_path_list]
+
+            previous_record = sortreads_manifest.get_record({'mergedfasta': mergedfasta})
+            manifest_record = {'mergedfasta': mergedfasta, 'params_md5': FileManifest.params_md5(dict(
+                sortreads_params_dic, fastainfo=merged_fastainfo_df.loc[
+                    merged_fastainfo_df.mergedfasta == mergedfasta].to_dict('records')))}
+            manifest_record.update(FileManifest.file_md5(
+                in_raw_fasta_path, previous_record=previous_record, column='mergedfasta'))
+
+            if not forceall and all(os.path.isfile(path) for path in out_file_path_list) \
+                    and FileManifest.is_unchanged(previous_record=previous_record, record=manifest_record,
+                                                  columns=FileManifest.get_md5_columns(manifest_record)):
+                Logger.instance().info("FASTA file already sorted, skipping: {}".format(mergedfasta))
+                # Stores the new size and mtime, so that the file is not hashed again
+                sortreads_manifest.update(manifest_record)
+                sortreads_manifest.write()
+                continue
+
+            ########################################################################################
+            #
+            #   cutadapt --cores=0 -e 0 --no-indels --trimmed-only -g tagFile:$tagfile 
+            #   --overlap length -o "tagtrimmed.{name}.fasta" in_raw_fasta_path
+            #
+            #   Anchored exact tags are demultiplexed in-process with a hash table instead
+            #
+            ########################################################################################
+
+            out_fasta_path = os.path.join(tempdir, "sorted") 
+
+            tags_samples_demultiplex = inputFiles.get_sample_names()
+
+            if not tag_to_end and RunnerDemultiplexTags.is_supported(tags_samples_demultiplex):
+
+                assigned_iter = RunnerDemultiplexTags(tags_samples=tags_samples_demultiplex, num_threads=num_threads)\
+                    .iter_assigned(in_fasta_path=in_raw_fasta_path)
+
+            else:
+
+                tagFile_path = inputFiles.tags_file()
+
+                cmd_cutadapt_tag_dic = {
+                    'in_fasta_path': in_raw_fasta_path,
+                    'out_fasta': out_fasta_path,
+                    'num_threads': num_threads,
+                    'tagFile': tagFile_path,
+                    'base_suffix': base_suffix,
+                }
+
+                cmd_cutadapt_tag_str = 'cutadapt --cores={num_threads} --no-indels --error-rate 0 --trimmed-only ' \
+                    '-g file:{tagFile} --output {out_fasta}_{{name}}.{base_suffix} {in_fasta_path}' \
+                    .format(**cmd_cutadapt_tag_dic)
+
+                CommandSortReads.run_cutadapt(cmd_cutadapt_tag_str)
+
+                inputFiles.remove_tags_file()
+
+                in_fasta_path_dic = {}
+                for tag_sample in tags_samples_demultiplex:
+                    in_fasta_path_dic[tag_sample[0]] = out_fasta_path + "_" + tag_sample[0] + "." + base_suffix
+                assigned_iter = CommandSortReads.read_demultiplexed_fasta(in_fasta_path_dic)
+
+            # The sorted files are written to temporary files that replace the previous ones once complete
+            runner_trim_primers = RunnerTrimPrimers(
+                cmd_cutadapt_list=cmd_cutadapt_primer_list,
+                out_fasta_path_list=[CommandSortReads.get_tmp_path(path) for path in out_fasta_path_list],
+                sample_job_dic=sample_job_dic, dereplicate=dereplicate)
+            runner_trim_primers.run(assigned_iter=assigned_iter)
+
+            if dereplicate:
+                for out_final_fasta_path, read_count_dic in zip(
+                        out_fasta_path_list, runner_trim_primers.read_count_dic_list):
+                    CommandSortReads.write_derep(read_count_dic=read_count_dic, out_derep_path=CommandSortReads
+                                                 .get_tmp_path(CommandSortReads.get_derep_path(out_final_fasta_path)))
+
+            for path in out_file_path_list:
+                os.replace(CommandSortReads.get_tmp_path(path), path)
+
+            sortreads_manifest.update(manifest_record)
+            sortreads_manifest.write()
+
+        results_list = [os.path.split(result)[-1] for result in results_list]
 
         del sample_info['mergedfasta']
         del sample_info['primerrev']
@@ -272,8 +310,102 @@ class CommandSortReads(object):
         del sample_info['tagfwd']
 
         sample_info['sortedfasta'] = results_list
+        if dereplicate:
+            sample_info['sortedderep'] = [CommandSortReads.get_derep_path(result) for result in results_list]
 
         sample_info_df = pandas.DataFrame(sample_info)
 
+        ############################################################################################
+        #
+        # Keep the sorted files of previous runs that are not in fastainfo, eg. other sequencing lanes
+        #
+        ############################################################################################
+
         fasta_trimmed_info_tsv = os.path.join(sorteddir, 'sortedinfo.tsv')
-        sample_info_df.to_csv(fasta_trimmed_info_tsv, sep="\t", header=True, index=False)
+
+        if not forceall and os.path.isfile(fasta_trimmed_info_tsv):
+            previous_sample_info_df = pandas.read_csv(fasta_trimmed_info_tsv, sep="\t", header=0, dtype=str,
+                                                      keep_default_na=False)
+            previous_sample_info_df = previous_sample_info_df.loc[
+                ~previous_sample_info_df.sortedfasta.isin(sample_info_df.sortedfasta)
+                & previous_sample_info_df.sortedfasta.apply(
+                    lambda sortedfasta: os.path.isfile(os.path.join(sorteddir, sortedfasta)))]
+            if previous_sample_info_df.shape[0] > 0:
+                sample_info_df = pandas.concat([previous_sample_info_df, sample_info_df.astype(str)], axis=0)
+
+        sample_info_df.to_csv(CommandSortReads.get_tmp_path(fasta_trimmed_info_tsv), sep="\t", header=True,
+                              index=False)
+        os.replace(CommandSortReads.get_tmp_path(fasta_trimmed_info_tsv), fasta_trimmed_info_tsv)
+
+    @staticmethod
+    def get_tmp_path(path):
+        """Returns the temporary path of an output file, in the same directory and with the same suffix"""
+
+        return os.path.join(os.path.dirname(path), '.tmp.' + os.path.basename(path))
+
+    @staticmethod
+    def run_cutadapt(cmd_cutadapt_str):
+        """Runs one cutadapt command and logs its output
+
+        :param cmd_cutadapt_str: cutadapt command line
+        :return: void
+        """
+
+        Logger.instance().debug("Running: {}".format(cmd_cutadapt_str))
+
+        if sys.platform.startswith("win"):
+            args = cmd_cutadapt_str
+        else:
+            args = shlex.split(cmd_cutadapt_str)
+        run_result = subprocess.run(args=args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+        Logger.instance().info(run_result.stdout.decode())
+
+    @staticmethod
+    def read_demultiplexed_fasta(in_fasta_path_dic):
+        """Yields lists of (tag sample name, header, sequence) of the reads demultiplexed by cutadapt
+
+        :param in_fasta_path_dic: dictionary with tag sample names as keys and demultiplexed FASTA paths as values
+        """
+        for name in in_fasta_path_dic:
+            if not os.path.isfile(in_fasta_path_dic[name]):
+                continue
+            for record_list in RunnerDemultiplexTags.read_fasta_chunks(in_fasta_path_dic[name]):
+                yield [(name, header, sequence) for header, sequence in record_list]
+
+    @staticmethod
+    def get_derep_path(fasta_path):
+        """Returns the path of the dereplicated file of a sorted FASTA file, eg.
+        'sorted/a_trimmed.fasta.gz' gives 'sorted/a_trimmed.derep.tsv.gz'"""
+
+        compression_suffix = ''
+        for suffix in ['.gz', '.bz2']:
+            if fasta_path.endswith(suffix):
+                compression_suffix = suffix
+                fasta_path = fasta_path[:-len(suffix)]
+        for suffix in ['.fasta', '.fas', '.fa']:
+            if fasta_path.endswith(suffix):
+                fasta_path = fasta_path[:-len(suffix)]
+                break
+        return fasta_path + '.derep.tsv' + compression_suffix
+
+    @staticmethod
+    def write_derep(read_count_dic, out_derep_path):
+        """Writes the dereplicated reads in TSV format with columns 'sequence' and 'count' sorted by sequence
+
+        :param read_count_dic: dictionary with sequences (bytes) as keys and read counts as values
+        :param out_derep_path: Path to the dereplicated TSV file
+        :return: void
+        """
+
+        if out_derep_path.endswith(".gz"):
+            _open = partial(gzip.open)
+        elif out_derep_path.endswith(".bz2"):
+            _open = partial(bz2.open)
+        else:
+            _open = open
+
+        with _open(out_derep_path, 'wb') as fout:
+            fout.write(b'sequence\tcount\n')
+            for sequence in sorted(read_count_dic):
+                fout.write(b'%s\t%d\n' % (sequence, read_count_dic[sequence]))
@@ -12,6 +12,8 @@ from vtam.utils.PathManager import PathManager
 from vtam.utils.RunnerTaxAssign import RunnerTaxAssign
 from vtam.utils.TaxLineage import TaxLineage
 from vtam.utils.Taxonomy import Taxonomy
+from vtam.utils.VariantSequenceHash import VariantSequenceHash
+from vtam.utils.constants import sqlite_in_batch_size
 
 
 class CommandTaxAssign(object):
@@ -87,14 +89,21 @@ class CommandTaxAssign(object):
         variant_sequence_list = variant_input_df.sequence.tolist()
 
         # Add variant to DB if not already there
-        for variant_sequence in variant_sequence_list:
-            with engine.connect() as conn:
-                row_variant = conn.execute(sqlalchemy.select([variant_declarative_table.c.id]) .where(
-                    variant_declarative_table.c.sequence == variant_sequence)).first()
-                if row_variant is None:  # variant_sequence IS NOT in the database, so INSERT it
-                    conn.execute(
-                        variant_declarative_table.insert().values(
-                            sequence=variant_sequence))
+        with engine.connect() as conn:
+            variant_id_dic = VariantSequenceHash.select_id_dic(conn=conn, variant_sequence_list=variant_sequence_list)
+            variant_new_instance_list = []
+            variant_new_set = set()
+            for variant_sequence in variant_sequence_list:
+                # variant_sequence IS NOT in the database, so INSERT it
+                if not (variant_sequence in variant_id_dic) and not (variant_sequence in variant_new_set):
+                    variant_new_set.add(variant_sequence)
+                    variant_new_instance_list.append({
+                        'sequence': variant_sequence,
+                        'sequence_hash': VariantSequenceHash.get_hash(variant_sequence)})
+            if len(variant_new_instance_list) > 0:
+                conn.execute(variant_declarative_table.insert(), variant_new_instance_list)
+                variant_id_dic = VariantSequenceHash.select_id_dic(
+                    conn=conn, variant_sequence_list=variant_sequence_list)
 
         #######################################################################
         #
@@ -102,26 +111,29 @@ class CommandTaxAssign(object):
         #
         #######################################################################
 
-        stmt_variant_tax_assign = sqlalchemy.select([
-            tax_assign_declarative_table.c.variant_id,
-            tax_assign_declarative_table.c.identity,
-            tax_assign_declarative_table.c.ltg_rank,
-            tax_assign_declarative_table.c.ltg_tax_id,
-            tax_assign_declarative_table.c.ltg_tax_name,
-            tax_assign_declarative_table.c.blast_db,
-            variant_declarative_table.c.sequence,
-        ])\
-            .where(tax_assign_declarative_table.c.ltg_tax_id.isnot(None))\
-            .where(tax_assign_declarative_table.c.variant_id == variant_declarative_table.c.id)\
-            .where(variant_declarative_table.c.sequence.in_(variant_sequence_list))\
-            .distinct()
+        # The variants are selected by id, resolved above through the sequence hash
+        variant_id_list = sorted(set(variant_id_dic.values()))
 
         # These are the variants that are already in taxassign and do not need
         # recalculate
         ltg_from_db_list = []
         with engine.connect() as conn:
-            for row in conn.execute(stmt_variant_tax_assign).fetchall():
-                ltg_from_db_list.append(dict(zip(row.keys(), row.values())))
+            for i in range(0, len(variant_id_list), sqlite_in_batch_size):
+                stmt_variant_tax_assign = sqlalchemy.select([
+                    tax_assign_declarative_table.c.variant_id,
+                    tax_assign_declarative_table.c.identity,
+                    tax_assign_declarative_table.c.ltg_rank,
+                    tax_assign_declarative_table.c.ltg_tax_id,
+                    tax_assign_declarative_table.c.ltg_tax_name,
+                    tax_assign_declarative_table.c.blast_db,
+                    variant_declarative_table.c.sequence,
+                ])\
+                    .where(tax_assign_declarative_table.c.ltg_tax_id.isnot(None))\
+                    .where(tax_assign_declarative_table.c.variant_id == variant_declarative_table.c.id)\
+                    .where(variant_declarative_table.c.id.in_(variant_id_list[i:i + sqlite_in_batch_size]))\
+                    .distinct()
+                for row in conn.execute(stmt_variant_tax_assign).fetchall():
+                    ltg_from_db_list.append(dict(zip(row.keys(), row.values())))
         """(Pdb) pandas.DataFrame.from_records(ltg_from_db_list)
    identity ltg_rank  ltg_tax_id              ltg_tax_name                                           sequence  variant_id
 0       100  species     2028017  Orthocladiinae sp. BAP34  AGCATGATCTGGAATAGTAGGTACTTCCCTTAGTATCTTAATTCGA...         325
@@ -142,20 +154,23 @@ class CommandTaxAssign(object):
         #
         #######################################################################
 
-        stmt_variant = sqlalchemy.select([variant_declarative_table.c.id, variant_declarative_table.c.sequence]) \
-            .where(variant_declarative_table.c.sequence.in_(variant_sequence_list)) \
-
+        variant_tax_assigned_id_set = set()
         if ltg_db_df.shape[0] > 0:
-            stmt_variant = stmt_variant.where(
-                variant_declarative_table.c.id.notin_(
-                    ltg_db_df.variant_id.tolist()))
-        stmt_variant = stmt_variant.distinct().order_by("id")
+            variant_tax_assigned_id_set = set(ltg_db_df.variant_id.tolist())
+        variant_not_tax_assigned_id_list = [
+            variant_id for variant_id in variant_id_list if not (variant_id in variant_tax_assigned_id_set)]
 
         variant_not_tax_assigned = []
         with engine.connect() as conn:
-            for row in conn.execute(stmt_variant).fetchall():
-                variant_not_tax_assigned.append(
-                    dict(zip(row.keys(), row.values())))
+            for i in range(0, len(variant_not_tax_assigned_id_list), sqlite_in_batch_size):
+                stmt_variant = sqlalchemy.select(
+                    [variant_declarative_table.c.id, variant_declarative_table.c.sequence]) \
+                    .where(variant_declarative_table.c.id.in_(
+                        variant_not_tax_assigned_id_list[i:i + sqlite_in_batch_size])) \
+                    .order_by("id")
+                for row in conn.execute(stmt_variant).fetchall():
+                    variant_not_tax_assigned.append(
+                        dict(zip(row.keys(), row.values())))
 
         #######################################################################
         #
@@ -233,9 +248,8 @@ class CommandTaxAssign(object):
 
         for ltg_row in ltg_df.itertuples():
             variant_sequence = ltg_row.sequence
+            variant_id = variant_id_dic[variant_sequence]
             with engine.connect() as conn:
-                variant_id = conn.execute(sqlalchemy.select([variant_declarative_table.c.id]) .where(
-                    variant_declarative_table.c.sequence == variant_sequence)).first()[0]
                 select_row = conn.execute(
                     sqlalchemy.select(
                         [TaxAssign]) .where(
@@ -275,9 +289,8 @@ class CommandTaxAssign(object):
         for variant_row in variant_output_df.itertuples():
             # variant_id = variant_row.variant_id
             variant_sequence = variant_row.sequence
+            variant_id = variant_id_dic[variant_sequence]
             with engine.connect() as conn:
-                variant_id = conn.execute(sqlalchemy.select([variant_declarative_table.c.id]) .where(
-                    variant_declarative_table.c.sequence == variant_sequence)).first()[0]
                 select_row = conn.execute(
                     sqlalchemy.select(
                         [
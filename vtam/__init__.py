@@ -180,8 +180,10 @@ class VTAM(object):
             fastadir = arg_parser_dic['fastadir']
             num_threads = arg_parser_dic['threads']
             params = arg_parser_dic['params']
+            forceall = arg_parser_dic['forceall']
             CommandMerge.main(fastqinfo=fastqinfo, fastqdir=fastqdir, fastainfo=fastainfo,
-                              fastadir=fastadir, params=params, num_threads=num_threads)
+                              fastadir=fastadir, params=params, num_threads=num_threads,
+                              forceall=forceall)
 
         ############################################################################################
         #
@@ -212,9 +214,12 @@ class VTAM(object):
             no_reverse = arg_parser_dic['no_reverse']
             tag_to_end = arg_parser_dic['tag_to_end']
             primer_to_end = arg_parser_dic['primer_to_end']
+            dereplicate = arg_parser_dic['dereplicate']
+            forceall = arg_parser_dic['forceall']
             CommandSortReads.main(fastainfo=fastainfo, fastadir=fastadir, params=params,
                                   num_threads=num_threads, sorteddir=sorteddir, no_reverse=no_reverse, 
-                                  tag_to_end=tag_to_end, primer_to_end=primer_to_end)
+                                  tag_to_end=tag_to_end, primer_to_end=primer_to_end,
+                                  dereplicate=dereplicate, forceall=forceall)
 
         ############################################################################################
         #
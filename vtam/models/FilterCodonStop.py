@@ -1,5 +1,5 @@
 from wopmars.Base import Base
-from sqlalchemy import UniqueConstraint, Boolean, Column, Integer, ForeignKey
+from sqlalchemy import UniqueConstraint, Index, Boolean, Column, Integer, ForeignKey
 
 
 class FilterCodonStop(Base):
@@ -11,6 +11,9 @@ class FilterCodonStop(Base):
             'variant_id',
             'sample_id',
             'replicate'),
+        # Covering index of the selections and deletions by run, marker, sample and replicate
+        Index('ix_FilterCodonStop_sample',
+              'run_id', 'marker_id', 'sample_id', 'replicate', 'filter_delete', 'variant_id', 'read_count'),
     )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
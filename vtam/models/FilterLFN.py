@@ -1,5 +1,5 @@
 from wopmars.Base import Base
-from sqlalchemy import UniqueConstraint, Boolean, Column, Integer, ForeignKey
+from sqlalchemy import UniqueConstraint, Index, Boolean, Column, Integer, ForeignKey
 
 
 class FilterLFN(Base):
@@ -12,6 +12,9 @@ class FilterLFN(Base):
             'sample_id',
             'replicate',
             'filter_id'),
+        # Covering index of the selections and deletions by run, marker, sample and replicate
+        Index('ix_FilterLFN_sample',
+              'run_id', 'marker_id', 'sample_id', 'replicate', 'filter_id', 'filter_delete', 'variant_id', 'read_count'),
     )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -47,3 +50,5 @@ class FilterLFN(Base):
     read_count = Column(Integer, nullable=False)
     filter_id = Column(Integer, nullable=False)
     filter_delete = Column(Boolean, nullable=False)
+    # Bitmask of the deleting filters in the rows with filter_id=8 of the 'bitmask' storage
+    filter_bitmask = Column(Integer, nullable=True)
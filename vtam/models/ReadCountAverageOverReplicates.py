@@ -1,11 +1,14 @@
 from wopmars.Base import Base
-from sqlalchemy import UniqueConstraint, Float, Column, Integer, ForeignKey
+from sqlalchemy import UniqueConstraint, Index, Float, Column, Integer, ForeignKey
 
 
 class ReadCountAverageOverReplicates(Base):
     __tablename__ = __qualname__
     __table_args__ = (
         UniqueConstraint('marker_id', 'run_id', 'variant_id', 'sample_id'),
+        # Covering index of the selections and deletions by run, marker and sample
+        Index('ix_ReadCountAverageOverReplicates_sample',
+              'run_id', 'marker_id', 'sample_id', 'variant_id', 'read_count_average'),
     )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -1,5 +1,5 @@
 from Bio.Seq import Seq
-from sqlalchemy import Column, String, Integer
+from sqlalchemy import BigInteger, Column, String, Integer
 from sqlalchemy.orm import validates
 from wopmars.Base import Base
 
@@ -14,6 +14,8 @@ class Variant(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     sequence = Column(String(250), unique=True, nullable=False)
+    # 64-bit hash of the sequence used to look up variants, see VariantSequenceHash
+    sequence_hash = Column(BigInteger, index=True, nullable=True)
 
     @validates('sequence')
     def validate_dna(self, key, value):
@@ -1,5 +1,5 @@
 from wopmars.Base import Base
-from sqlalchemy import UniqueConstraint, Column, Integer, ForeignKey
+from sqlalchemy import UniqueConstraint, Index, Column, Integer, ForeignKey
 
 
 class VariantReadCount(Base):
@@ -11,6 +11,9 @@ class VariantReadCount(Base):
             'marker_id',
             'sample_id',
             'replicate'),
+        # Covering index of the selections and deletions by run, marker, sample and replicate
+        Index('ix_VariantReadCount_sample',
+              'run_id', 'marker_id', 'sample_id', 'replicate', 'variant_id', 'read_count'),
     )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
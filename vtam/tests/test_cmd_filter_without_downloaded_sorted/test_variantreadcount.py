@@ -1,5 +1,6 @@
 from vtam.utils import pip_install_vtam_for_tests
 from vtam.utils.PathManager import PathManager
+from vtam.wrapper.VariantReadCount import VariantReadCount
 import os
 import pathlib
 import shlex
@@ -67,6 +68,38 @@ class TestCmdVariantReadCount(unittest.TestCase):
         self.assertEqual(cur_result[0], 2)
         con.close()
 
+    def test_filter_derep(self):
+
+        args = {}
+        args['sortedinfo'] = os.path.join(os.path.dirname(__file__), "sortedinfo_1sample_derep.tsv")
+        args['sorteddir'] = os.path.dirname(__file__)
+
+        cmd = "vtam filter --db db.sqlite --sortedinfo {sortedinfo} --sorteddir {sorteddir} " \
+              "--asvtable asvtable_default.tsv --until VariantReadCount".format(**args)
+
+        if sys.platform.startswith("win"):
+            args = cmd
+        else:
+            args = shlex.split(cmd)
+        result = subprocess.run(args=args, cwd=self.outdir_path)
+
+        self.assertEqual(result.returncode, 0)
+
+        db_path = os.path.join(self.outdir_path, "db.sqlite")
+        con = sqlite3.connect(db_path)
+        cur = con.cursor()
+        cur_result = cur.execute('SELECT COUNT(*), SUM(read_count) from VariantReadCount').fetchone()
+        self.assertEqual(cur_result, (2, 4))
+        con.close()
+
+    def test_get_sorted_read_count_dic(self):
+
+        read_count_dic = VariantReadCount.get_sorted_read_count_dic(
+            os.path.join(os.path.dirname(__file__), "mfzr_1_fw_000.fasta"))
+        self.assertEqual(read_count_dic, {
+            'AACCAGGATCTTTAATTGGAGATGATCAAATTTATAATGTTATCATTACAGCT': 2,
+            'TTCTTTATATTTTCTATTTGGAGCGTGGGCTGGAATAGTAGGAACATCAATAAGTATACTTATTCGTGCAGAACTTGGTC': 2})
+
     def tearDown(self):
 
         shutil.rmtree(self.outdir_path, ignore_errors=True)
@@ -3,6 +3,7 @@ from vtam import CommandSortReads
 from vtam.utils.PathManager import PathManager
 import filecmp
 import os
+import pandas
 import shutil
 
 
@@ -28,5 +29,58 @@ class TestCommandSortReads(TestCase):
             'sortedinfo.tsv', 'MFZR_14Ben01_Tpos1_1_fw_48_000.fasta', 'MFZR_14Ben01_Tpos1_1_fw_48_001.fasta',
             'MFZR_14Ben01_Tpos1_1_fw_48_002.fasta', 'MFZR_14Ben01_Tpos1_1_fw_48_003.fasta'], shallow=True))
 
+    def test_02_incremental(self):
+
+        # Sort the first replicate only
+        fastainfo_df = pandas.read_csv(self.fastainfo, sep="\t", header=0)
+        fastainfo_1_path = os.path.join(self.outdir_path, "mergedinfo_1.tsv")
+        fastainfo_2_path = os.path.join(self.outdir_path, "mergedinfo_2.tsv")
+        os.makedirs(self.outdir_path, exist_ok=True)
+        fastainfo_df.loc[fastainfo_df.replicate == 1].to_csv(fastainfo_1_path, sep="\t", index=False)
+        fastainfo_df.loc[fastainfo_df.replicate == 2].to_csv(fastainfo_2_path, sep="\t", index=False)
+        fastadir = os.path.join(self.outdir_path, "merged")
+        shutil.copytree(self.fastadir, fastadir)
+
+        CommandSortReads.main(fastainfo=fastainfo_1_path, fastadir=fastadir, sorteddir=self.sorted_dir)
+        sorted_fasta_path = os.path.join(self.sorted_dir, pandas.read_csv(os.path.join(
+            self.sorted_dir, 'sortedinfo.tsv'), sep="\t", header=0).sortedfasta.tolist()[0])
+        mtime = os.stat(sorted_fasta_path).st_mtime_ns
+
+        # Merged FASTA files with the same content and a new mtime are skipped
+        for merged_fasta in fastainfo_df.mergedfasta.unique().tolist():
+            os.utime(os.path.join(fastadir, merged_fasta), ns=(0, 0))
+        CommandSortReads.main(fastainfo=fastainfo_1_path, fastadir=fastadir, sorteddir=self.sorted_dir)
+        self.assertEqual(os.stat(sorted_fasta_path).st_mtime_ns, mtime)
+
+        # Unchanged merged FASTA files are skipped and the sorted files of the other replicate are added
+        CommandSortReads.main(fastainfo=fastainfo_2_path, fastadir=fastadir, sorteddir=self.sorted_dir)
+        self.assertEqual(os.stat(sorted_fasta_path).st_mtime_ns, mtime)
+        sortedinfo_df = pandas.read_csv(os.path.join(self.sorted_dir, 'sortedinfo.tsv'), sep="\t", header=0)
+        self.assertEqual(sorted(sortedinfo_df.replicate.unique().tolist()), [1, 2])
+
+        # forceall sorts again and keeps only the files of fastainfo
+        CommandSortReads.main(fastainfo=fastainfo_1_path, fastadir=fastadir, sorteddir=self.sorted_dir,
+                              forceall=True)
+        sortedinfo_df = pandas.read_csv(os.path.join(self.sorted_dir, 'sortedinfo.tsv'), sep="\t", header=0)
+        self.assertEqual(sortedinfo_df.replicate.unique().tolist(), [1])
+
+    def test_03_dereplicate(self):
+
+        CommandSortReads.main(fastainfo=self.fastainfo, fastadir=self.fastadir, sorteddir=self.sorted_dir,
+                              dereplicate=True)
+
+        sortedinfo_df = pandas.read_csv(os.path.join(self.sorted_dir, 'sortedinfo.tsv'), sep="\t", header=0)
+        self.assertEqual(sortedinfo_df.shape[0], 4)
+        self.assertEqual(sortedinfo_df.sortedderep.tolist(),
+                         [CommandSortReads.get_derep_path(path) for path in sortedinfo_df.sortedfasta.tolist()])
+        for sortedfasta, sortedderep in zip(sortedinfo_df.sortedfasta, sortedinfo_df.sortedderep):
+            # The dereplicated file has the unique sequences and read counts of the sorted FASTA file
+            with open(os.path.join(self.sorted_dir, sortedfasta)) as fin:
+                sequence_list = [line.strip() for line in fin if not line.startswith('>')]
+            derep_df = pandas.read_csv(os.path.join(self.sorted_dir, sortedderep), sep="\t", header=0)
+            self.assertEqual(derep_df.sequence.tolist(), sorted(set(sequence_list)))
+            self.assertEqual(derep_df['count'].tolist(),
+                             [sequence_list.count(sequence) for sequence in derep_df.sequence.tolist()])
+
     def tearDown(self):
         shutil.rmtree(self.outdir_path, ignore_errors=True)
@@ -0,0 +1,45 @@
+import pandas
+import unittest
+
+from vtam.utils.DataframeVariantReadCountLike import DataframeVariantReadCountLike
+
+
+class TestDataframeVariantReadCountLike(unittest.TestCase):
+
+    def setUp(self):
+
+        self.variant_read_count_df = pandas.DataFrame({
+            'run_id': [1, 1, 1, 1, 1, 1],
+            'marker_id': [1, 1, 1, 1, 1, 1],
+            'sample_id': [2, 1, 1, 2, 1, 1],
+            'replicate': [1, 1, 2, 2, 1, 2],
+            'variant_id': [7, 7, 7, 5, 5, 5],
+            'read_count': [1, 20, 4, 3, 10, 0],
+        })
+        self.variant_read_count_df_obj = DataframeVariantReadCountLike(self.variant_read_count_df)
+
+    def test_get_N_i_df(self):
+
+        N_i_df = self.variant_read_count_df_obj.get_N_i_df()
+        self.assertEqual(N_i_df.columns.tolist(), ['run_id', 'marker_id', 'variant_id', 'N_i'])
+        self.assertEqual(N_i_df.values.tolist(), [[1, 1, 5, 13], [1, 1, 7, 25]])
+        # Modifying the output does not modify the cached aggregate
+        N_i_df.loc[0, 'N_i'] = 0
+        self.assertEqual(self.variant_read_count_df_obj.get_N_i_df().N_i.tolist(), [13, 25])
+
+    def test_get_N_jk_df(self):
+
+        N_jk_df = self.variant_read_count_df_obj.get_N_jk_df()
+        self.assertEqual(N_jk_df[['sample_id', 'replicate', 'N_jk']].values.tolist(),
+                         [[1, 1, 30], [1, 2, 4], [2, 1, 1], [2, 2, 3]])
+
+    def test_get_N_array(self):
+
+        self.assertEqual(self.variant_read_count_df_obj.get_N_array('N_i').tolist(), [25, 25, 25, 13, 13, 13])
+        self.assertEqual(self.variant_read_count_df_obj.get_N_array('N_ij').tolist(), [1, 24, 24, 3, 10, 10])
+
+    def test_filter_out_below_global_read_count_cutoff(self):
+
+        variant_read_count_df = self.variant_read_count_df_obj.filter_out_below_global_read_count_cutoff(
+            global_read_count_cutoff=20)
+        self.assertEqual(variant_read_count_df.read_count.tolist(), [1, 20, 4])
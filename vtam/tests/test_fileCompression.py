@@ -1,3 +1,5 @@
+import bz2
+import gzip
 import unittest 
 import filecmp
 import os
@@ -100,6 +102,16 @@ class TestFileCompression(unittest.TestCase):
 
         self.assertFalse(compressed_wrong)
 
+    def test_stream_compression(self):
+
+        for suffix, _open in [('.gz', gzip.open), ('.bz2', bz2.open)]:
+            self.compressed = self.fastq_file_copy + suffix
+            with open(self.fastq_file, 'rb') as fin:
+                FileCompression.stream_compression(fin, self.compressed, num_threads=2)
+            with _open(self.compressed, 'rb') as fin_compressed, open(self.fastq_file, 'rb') as fin:
+                self.assertEqual(fin_compressed.read(), fin.read())
+            os.remove(self.compressed)
+
     def tearDown(self):
         if os.path.exists(self.fastq_file_copy):
             os.remove(self.fastq_file_copy)
@@ -0,0 +1,82 @@
+import os
+import pandas
+import shutil
+import sqlalchemy
+import unittest
+
+from vtam.models.FilterLFN import FilterLFN
+from vtam.models.Marker import Marker
+from vtam.models.Run import Run
+from vtam.models.Sample import Sample
+from vtam.models.Variant import Variant
+from vtam.utils.FileSampleInformation import FileSampleInformation
+from vtam.utils.PathManager import PathManager
+from wopmars.Base import Base
+
+
+class TestFileSampleInformation(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        cls.test_path = PathManager.get_test_path()
+        cls.outdir_path = os.path.join(cls.test_path, 'outdir')
+
+    def setUp(self):
+
+        os.makedirs(self.outdir_path, exist_ok=True)
+        db_path = os.path.join(self.outdir_path, "db.sqlite")
+        self.engine = sqlalchemy.create_engine('sqlite:///{}'.format(db_path), echo=False)
+        Base.metadata.create_all(self.engine)
+
+        pandas.DataFrame({'id': [1], 'name': ['prerun']}).to_sql(
+            name=Run.__tablename__, con=self.engine, if_exists='append', index=False)
+        pandas.DataFrame({'id': [1], 'name': ['MFZR']}).to_sql(
+            name=Marker.__tablename__, con=self.engine, if_exists='append', index=False)
+        pandas.DataFrame({'id': [1, 2, 3], 'name': ['tpos1', 'tpos2', 'tneg1']}).to_sql(
+            name=Sample.__tablename__, con=self.engine, if_exists='append', index=False)
+        pandas.DataFrame({'id': [5, 7], 'sequence': ['ACGT', 'TTTT']}).to_sql(
+            name=Variant.__tablename__, con=self.engine, if_exists='append', index=False)
+        pandas.DataFrame({
+            'run_id': [1] * 6, 'marker_id': [1] * 6,
+            'sample_id': [1, 1, 2, 1, 3, 2], 'replicate': [1, 1, 1, 2, 1, 1],
+            'variant_id': [5, 7, 7, 5, 5, 5], 'read_count': [10, 3, 4, 6, 1, 2],
+            'filter_id': [8, 8, 8, 8, 8, 8], 'filter_delete': [0, 0, 0, 1, 0, 0],
+        }).to_sql(name=FilterLFN.__tablename__, con=self.engine, if_exists='append', index=False)
+
+        # Sample tneg1 is not in the sample information file
+        self.sortedinfo_path = os.path.join(self.outdir_path, "sortedinfo.tsv")
+        pandas.DataFrame({
+            'run': ['prerun'] * 3, 'marker': ['MFZR'] * 3, 'sample': ['tpos2', 'tpos1', 'tpos1'],
+            'replicate': [1, 1, 2], 'sortedfasta': ['a.fasta', 'b.fasta', 'c.fasta'],
+        }).to_csv(self.sortedinfo_path, sep='\t', index=False)
+
+    def test_to_identifier_df(self):
+
+        sample_info_tsv_obj = FileSampleInformation(tsv_path=self.sortedinfo_path)
+        identifier_df = sample_info_tsv_obj.to_identifier_df(engine=self.engine)
+        self.assertEqual(identifier_df.columns.tolist(),
+                         ['run_id', 'marker_id', 'sample_id', 'replicate', 'sortedfasta'])
+        self.assertEqual(identifier_df.values.tolist(), [
+            [1, 1, 2, 1, 'a.fasta'], [1, 1, 1, 1, 'b.fasta'], [1, 1, 1, 2, 'c.fasta']])
+
+    def test_get_nijk_df(self):
+
+        sample_info_tsv_obj = FileSampleInformation(tsv_path=self.sortedinfo_path)
+        variant_read_count_df = sample_info_tsv_obj.get_nijk_df(
+            variant_read_count_like_model=FilterLFN, engine=self.engine, filter_id=8)
+        # Rows in the order of the sample information file, deleted rows and other samples excluded
+        self.assertEqual(variant_read_count_df.columns.tolist(),
+                         ['run_id', 'marker_id', 'sample_id', 'replicate', 'variant_id', 'read_count'])
+        self.assertEqual(variant_read_count_df[['sample_id', 'replicate', 'variant_id', 'read_count']]
+                         .values.tolist(), [[2, 1, 7, 4], [2, 1, 5, 2], [1, 1, 5, 10], [1, 1, 7, 3]])
+
+        variant_df = sample_info_tsv_obj.get_variant_df(
+            variant_read_count_like_model=FilterLFN, engine=self.engine,
+            variant_read_count_like_df=variant_read_count_df)
+        self.assertEqual(variant_df.index.tolist(), [7, 5])
+        self.assertEqual(variant_df.sequence.tolist(), ['TTTT', 'ACGT'])
+
+    def tearDown(self):
+        self.engine.dispose()
+        shutil.rmtree(self.outdir_path, ignore_errors=True)
@@ -211,3 +211,39 @@ class TestFilterLFN(unittest.TestCase):
             & (self.filter_lfn_runner.variant_read_count_filter_delete_df.replicate == 3)
             & (self.filter_lfn_runner.variant_read_count_filter_delete_df.filter_id == 8),
             'filter_delete'].values[0])
+
+    def test_mark_delete_lfn_per_Ni_specific_cutoff(self):
+
+        cutoff_specific_df = pandas.DataFrame({
+            'run_id': [1], 'marker_id': [1], 'variant_id': [22], 'cutoff': [0.3], 'variant_sequence': ['tgtg']})
+        self.filter_lfn_runner.mark_delete_lfn_per_Ni_or_Nik_or_Njk(
+            lfn_denominator='N_i', cutoff=0.001, cutoff_specific_df=cutoff_specific_df)
+        self.filter_lfn_runner.mark_delete_lfn_do_not_pass_all_filters()
+        filter_delete_df = self.filter_lfn_runner.variant_read_count_filter_delete_df
+        #
+        # Variant-specific cutoff only for variant 22
+        self.assertEqual(filter_delete_df.loc[filter_delete_df.filter_id == 4, 'variant_id'].unique().tolist(), [22])
+        # N_i of variant 22 is 33899: only the replicates with 10980 and 13814 reads pass the 0.3 cutoff
+        self.assertEqual(filter_delete_df.loc[
+            (filter_delete_df.filter_id == 4), 'filter_delete'].tolist(), [True, True, True, False, True, False])
+        self.assertEqual(filter_delete_df.loc[
+            (filter_delete_df.filter_id == 8) & (filter_delete_df.variant_id == 22), 'filter_delete'].tolist(),
+                         [True, True, True, False, True, False])
+        self.assertEqual((filter_delete_df.filter_id == 8).sum(), self.variant_read_count_df.shape[0])
+
+    def test_filter_lfn_runner_run_bitmask(self):
+
+        cutoff_dic = {
+            'lfn_variant_cutoff': 0.001, 'lfn_variant_specific_cutoff': None, 'lfn_variant_replicate_cutoff': None,
+            'lfn_variant_replicate_specific_cutoff': None, 'lfn_sample_replicate_cutoff': 0.001,
+            'lfn_read_count_cutoff': 10}
+        filter_delete_df = RunnerFilterLFN(self.variant_read_count_df).get_variant_read_count_delete_df(**cutoff_dic)
+        filter_bitmask_df = RunnerFilterLFN(self.variant_read_count_df).get_variant_read_count_delete_df(
+            filter_lfn_storage='bitmask', **cutoff_dic)
+        #
+        # One row per occurrence with the filter_delete values of filter 8
+        filter8_df = filter_delete_df.loc[filter_delete_df.filter_id == 8].reset_index(drop=True)
+        self.assertEqual(filter_bitmask_df.shape[0], self.variant_read_count_df.shape[0])
+        self.assertTrue(filter_bitmask_df.drop('filter_bitmask', axis=1).equals(filter8_df))
+        # Variant 1, sample 1: replicate 3 is deleted by filters 2, 6 and 7, replicate 2 by filter 7
+        self.assertEqual(filter_bitmask_df.filter_bitmask.tolist()[:3], [0, 2 ** 7, 2 ** 2 + 2 ** 6 + 2 ** 7])
@@ -81,3 +81,29 @@ class TestFilterPCRError(TestCase):
  'variant_id': {0: 1, 1: 1, 2: 2, 3: 2, 4: 3, 5: 3, 6: 4, 7: 4}}
         self.assertTrue(filter_output_bak_dic ==
                         filter_output_df.to_dict())
+
+    def test_get_filter_output_df_several_samples(self):
+
+        # Second sample, where variant 3 is not a PCR error of variant 1
+        variant_read_count_sample2_df = self.variant_read_count_df.copy()
+        variant_read_count_sample2_df['sample_id'] = 2
+        variant_read_count_sample2_df['read_count'] = [10, 10, 300, 220, 60, 0, 2, 0]
+        variant_read_count_df = pandas.concat(
+            [self.variant_read_count_df, variant_read_count_sample2_df]).reset_index(drop=True)
+
+        pcr_error_var_prop = 0.05
+        filter_output_df = RunnerFilterPCRerror(
+            variant_expected_df=self.variant_df,
+            variant_unexpected_df=self.variant_df,
+            variant_read_count_df=variant_read_count_df).get_variant_read_count_delete_df(pcr_error_var_prop)
+
+        # Same output as one run per sample
+        for sample_id in [1, 2]:
+            variant_read_count_sample_df = variant_read_count_df.loc[variant_read_count_df.sample_id == sample_id]
+            filter_output_sample_df = RunnerFilterPCRerror(
+                variant_expected_df=self.variant_df,
+                variant_unexpected_df=self.variant_df,
+                variant_read_count_df=variant_read_count_sample_df).get_variant_read_count_delete_df(
+                pcr_error_var_prop)
+            self.assertTrue(filter_output_sample_df.equals(
+                filter_output_df.loc[filter_output_df.sample_id == sample_id]))
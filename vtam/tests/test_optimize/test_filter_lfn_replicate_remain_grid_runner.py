@@ -0,0 +1,61 @@
+import itertools
+import os
+import pandas
+import unittest
+
+from vtam.utils.RunnerFilterLFNreplicateRemain import RunnerFilterLFNreplicateRemain
+from vtam.utils.RunnerFilterLFNreplicateRemainGrid import RunnerFilterLFNreplicateRemainGrid
+
+
+class TestFilterLFNreplicateRemainGridRunner(unittest.TestCase):
+
+    def setUp(self):
+
+        nijk_path = os.path.join(os.path.dirname(__file__), 'nijk.tsv')
+        known_occurrences_path = os.path.join(os.path.dirname(__file__), 'known_occurrences.tsv')
+
+        nijk_df = pandas.read_csv(nijk_path, header=0, sep="\t")
+        known_occurrences_df = pandas.read_csv(known_occurrences_path, header=0, sep="\t")
+
+        self.nijk_df = nijk_df.loc[(nijk_df.run_id == 1) & (nijk_df.marker_id == 1)]  # one marker
+        self.known_occurrs_run_marker_df = known_occurrences_df.loc[
+            (known_occurrences_df.run_id == 1) & (known_occurrences_df.marker_id == 1), ]  # one marker
+
+        self.grid_runner = RunnerFilterLFNreplicateRemainGrid(
+            nijk_df=self.nijk_df, known_occurrences_df=self.known_occurrs_run_marker_df)
+
+    def test_lfn_variant(self):
+
+        count_keep_lst = [6, 5, 2, 0]
+        for i, lfn_ni_cutoff in enumerate([0.2, 0.3, 0.35, 0.4]):
+            count_keep, count_delete = self.grid_runner.count_keep_delete(
+                lfn_ni_cutoff=lfn_ni_cutoff, lfn_nik_cutoff=None, lfn_njk_cutoff=0.001, lfn_nijk_cutoff=100,
+                min_replicate_number=2)
+            self.assertEqual(count_keep, count_keep_lst[i])
+
+    def test_same_as_filter_lfn_replicate_remain(self):
+
+        for lfn_ni_nik_cutoff, lfn_nijk_cutoff, min_replicate_number, is_lfn_variant_replicate in itertools.product(
+                [0.001, 0.2, 0.6], [10, 170], [1, 2, 3], [False, True]):
+            optimize_params_dic = {
+                'lfn_ni_cutoff': lfn_ni_nik_cutoff, 'lfn_nik_cutoff': None, 'lfn_njk_cutoff': 0.001,
+                'lfn_nijk_cutoff': lfn_nijk_cutoff, 'min_replicate_number': min_replicate_number}
+            if is_lfn_variant_replicate:
+                optimize_params_dic['lfn_nik_cutoff'] = lfn_ni_nik_cutoff
+            self.assertEqual(
+                self.grid_runner.count_keep_delete(**optimize_params_dic),
+                RunnerFilterLFNreplicateRemain(nijk_df=self.nijk_df, **optimize_params_dic)
+                .count_keep_delete(known_occurrences_df=self.known_occurrs_run_marker_df))
+
+    def test_count_keep_delete_array(self):
+
+        optimize_params_dic = {'lfn_ni_cutoff': 0.001, 'lfn_nik_cutoff': None, 'lfn_njk_cutoff': 0.001,
+                               'lfn_nijk_cutoff': 10, 'min_replicate_number': 2}
+        for cutoff_name, cutoff_lst in [('lfn_ni_cutoff', [0.001, 0.2, 0.3, 0.35, 0.4]),
+                                        ('lfn_nijk_cutoff', [0, 10, 100, 170, 200, 1000])]:
+            count_keep_array, count_delete_array = self.grid_runner.count_keep_delete_array(
+                cutoff_name=cutoff_name, cutoff_lst=cutoff_lst, **optimize_params_dic)
+            for i, cutoff in enumerate(cutoff_lst):
+                count_keep, count_delete = self.grid_runner.count_keep_delete(
+                    **{**optimize_params_dic, cutoff_name: cutoff})
+                self.assertEqual((count_keep_array[i], count_delete_array[i]), (count_keep, count_delete))
@@ -0,0 +1,54 @@
+import os
+import pandas
+import unittest
+
+from vtam.utils.RunnerOptimizeLFNreadCountAndVariant import RunnerOptimizeLFNreadCountAndVariant
+from vtam.utils.constants import get_params_default_dic
+
+
+class TestOptimizeLFNreadCountAndLFNvariant(unittest.TestCase):
+
+    def setUp(self):
+
+        nijk_path = os.path.join(os.path.dirname(__file__), 'nijk.tsv')
+        known_occurrences_path = os.path.join(os.path.dirname(__file__), 'known_occurrences.tsv')
+
+        # Two run-markers
+        self.nijk_df = pandas.read_csv(nijk_path, header=0, sep="\t")
+        self.known_occurrences_df = pandas.read_csv(known_occurrences_path, header=0, sep="\t")
+
+        params_default_dic = get_params_default_dic()
+        self.optimize_params_dic = {'lfn_ni_cutoff': params_default_dic['lfn_variant_cutoff'],
+                                    'lfn_nik_cutoff': None,
+                                    'lfn_njk_cutoff': params_default_dic['lfn_sample_replicate_cutoff'],
+                                    'lfn_nijk_cutoff': params_default_dic['lfn_read_count_cutoff'],
+                                    'min_replicate_number': params_default_dic['min_replicate_number']}
+
+    def test_get_optimize_df(self):
+
+        optimize_df, variant_specific_cutoff_df = RunnerOptimizeLFNreadCountAndVariant(
+            nijk_df=self.nijk_df, known_occurrences_df=self.known_occurrences_df)\
+            .get_optimize_df(**self.optimize_params_dic)
+        # Run-markers in the order of the known occurrences
+        self.assertEqual(optimize_df.run_id.unique().tolist(), [1])
+        self.assertEqual(optimize_df.marker_id.unique().tolist(), [1, 2])
+        self.assertEqual(optimize_df.columns.tolist(), [
+            'occurrence_nb_keep', 'occurrence_nb_delete', 'lfn_nijk_cutoff', 'lfn_variant_cutoff', 'run_id',
+            'marker_id'])
+        self.assertTrue(variant_specific_cutoff_df.shape[0] > 0)
+
+    def test_get_optimize_df_lst_size(self):
+
+        optimize_df, variant_specific_cutoff_df = RunnerOptimizeLFNreadCountAndVariant(
+            nijk_df=self.nijk_df, known_occurrences_df=self.known_occurrences_df)\
+            .get_optimize_df(**self.optimize_params_dic)
+        optimize_params_dic = self.optimize_params_dic.copy()
+        optimize_params_dic['lfn_nijk_cutoff_lst_size'] = get_params_default_dic()['lfn_read_count_cutoff_lst_size'] * 2
+        optimize_params_dic['lfn_ni_njk_cutoff_lst_size'] = get_params_default_dic()['lfn_variant_cutoff_lst_size'] * 2
+        optimize_finer_df, variant_specific_cutoff_finer_df = RunnerOptimizeLFNreadCountAndVariant(
+            nijk_df=self.nijk_df, known_occurrences_df=self.known_occurrences_df)\
+            .get_optimize_df(**optimize_params_dic)
+        # A finer grid tests more cutoff combinations
+        self.assertTrue(optimize_finer_df.shape[0] > optimize_df.shape[0])
+        self.assertTrue(optimize_finer_df.lfn_nijk_cutoff.nunique() > optimize_df.lfn_nijk_cutoff.nunique())
+        self.assertTrue(optimize_finer_df.lfn_variant_cutoff.nunique() > optimize_df.lfn_variant_cutoff.nunique())
@@ -0,0 +1,68 @@
+import os
+import unittest
+
+from vtam.utils.FilesInputCutadapt import FilesInputCutadapt
+from vtam.utils.PathManager import PathManager
+from vtam.utils.RunnerDemultiplexTags import RunnerDemultiplexTags
+
+
+class TestRunnerDemultiplexTags(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        cls.test_path = PathManager.get_test_path()
+
+    def setUp(self):
+
+        self.tags_samples = [
+            ('sample1', 'run1', 'mfzr', 's1', '1', 'acgtacgt', 'ttttgggg'),
+            ('sample2', 'run1', 'mfzr', 's2', '1', 'acgtacgt', 'ccccaaaa'),
+            ('sample1_reversed', 'run1', 'mfzr', 's1', '1', 'acgtacgt', 'ttttgggg'),
+        ]
+
+    def test_is_supported(self):
+
+        self.assertTrue(RunnerDemultiplexTags.is_supported(self.tags_samples))
+        # 5' tag prefix of another 5' tag
+        tags_samples = self.tags_samples + [('sample3', 'run1', 'mfzr', 's3', '1', 'acgtacgtt', 'ccccaaaa')]
+        self.assertFalse(RunnerDemultiplexTags.is_supported(tags_samples))
+        # IUPAC code
+        tags_samples = self.tags_samples + [('sample3', 'run1', 'mfzr', 's3', '1', 'acgtnnnn', 'ccccaaaa')]
+        self.assertFalse(RunnerDemultiplexTags.is_supported(tags_samples))
+        # Forward tag pair equal to the reversed tag pair of sample1
+        tags_samples = self.tags_samples + [('sample3', 'run1', 'mfzr', 's3', '1', 'ttttgggg', 'acgtacgt')]
+        self.assertFalse(RunnerDemultiplexTags.is_supported(tags_samples))
+
+    def test_assign_records(self):
+
+        tag_index = RunnerDemultiplexTags.get_tag_index(self.tags_samples)
+        record_list = [
+            ('read1', 'ACGTACGTAAACCCCAAAA'),  # sample1: 3' tag is revcomp of ttttgggg
+            ('read2', 'ACGTACGTGGGTTTTGGGG'),  # sample2
+            ('read3', 'TTTTGGGGTTTACGTACGT'),  # sample1_reversed
+            ('read4', 'CGTACGTAAACCCCCAAAA'),  # no 5' tag
+            ('read5', 'ACGTACGTCCCCAAAA'),  # 5' and 3' tags without insert
+        ]
+        self.assertEqual(RunnerDemultiplexTags.assign_records(record_list, tag_index), [
+            ('sample1', 'read1', 'AAA'),
+            ('sample2', 'read2', 'GGG'),
+            ('sample1_reversed', 'read3', 'TTT'),
+            ('sample1', 'read5', '')])
+
+    def test_iter_assigned(self):
+
+        fastainfo = os.path.join(self.test_path, "test_files", "mergedinfo.tsv")
+        in_fasta_path = os.path.join(self.test_path, "test_files", "merged", "MFZR_14Ben01_Tpos1_1_fw_48.fasta")
+        tags_samples = FilesInputCutadapt(fastainfo, "MFZR_14Ben01_Tpos1_1_fw_48.fasta", True, False)\
+            .get_sample_names()
+
+        assigned_dic = {}
+        for num_threads in [1, 2]:
+            assigned_dic[num_threads] = [assigned for assigned_list in RunnerDemultiplexTags(
+                tags_samples=tags_samples, num_threads=num_threads).iter_assigned(in_fasta_path=in_fasta_path)
+                                         for assigned in assigned_list]
+        self.assertTrue(len(assigned_dic[1]) > 0)
+        self.assertTrue(set(name for name, _, _ in assigned_dic[1]) <= set(tag_sample[0] for tag_sample in tags_samples))
+        # Same reads in the same order with several processes
+        self.assertEqual(assigned_dic[1], assigned_dic[2])
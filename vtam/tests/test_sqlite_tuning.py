@@ -0,0 +1,84 @@
+import os
+import shutil
+import sqlalchemy
+import unittest
+
+import vtam.models
+from vtam.utils.PathManager import PathManager
+from vtam.utils.SqliteTuning import SqliteTuning
+from vtam.utils import constants
+
+
+class TestSqliteTuning(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        cls.test_path = PathManager.get_test_path()
+        cls.outdir_path = os.path.join(cls.test_path, 'outdir')
+
+    def setUp(self):
+
+        os.makedirs(self.outdir_path, exist_ok=True)
+        self.environ_pragma = os.environ.pop(SqliteTuning.env_name, None)
+        db_path = os.path.join(self.outdir_path, "db.sqlite")
+        self.engine = sqlalchemy.create_engine('sqlite:///{}'.format(db_path), echo=False)
+
+    def test_get_pragma_dic(self):
+
+        params_dic = constants.get_params_default_dic()
+        self.assertEqual(SqliteTuning.get_pragma_dic(params_dic),
+                         {'journal_mode': 'DELETE', 'synchronous': 'NORMAL', 'cache_size': -262144})
+        params_dic['sqlite_synchronous'] = 'SOMETIMES'
+        with self.assertRaises(SystemExit):
+            SqliteTuning.get_pragma_dic(params_dic)
+
+    def test_on_connect(self):
+
+        params_dic = constants.get_params_default_dic()
+        params_dic['sqlite_journal_mode'] = 'WAL'
+        params_dic['sqlite_cache_size'] = -1000
+        SqliteTuning.set_environ(params_dic)
+        # Engines without the listener keep the default pragmas
+        with sqlalchemy.create_engine(str(self.engine.url)).connect() as conn:
+            self.assertEqual(conn.execute(sqlalchemy.text("PRAGMA cache_size")).first()[0], -2000)
+        SqliteTuning.listen(self.engine)
+        with self.engine.connect() as conn:
+            SqliteTuning.set_journal_mode(conn)
+            self.assertEqual(conn.execute(sqlalchemy.text("PRAGMA journal_mode")).first()[0], 'wal')
+            self.assertEqual(conn.execute(sqlalchemy.text("PRAGMA synchronous")).first()[0], 1)
+            self.assertEqual(conn.execute(sqlalchemy.text("PRAGMA cache_size")).first()[0], -1000)
+
+    def test_create_index(self):
+
+        # VariantReadCount table of previous VTAM versions, without indexes
+        with self.engine.connect() as conn:
+            conn.execute(sqlalchemy.text(
+                "CREATE TABLE VariantReadCount (id INTEGER NOT NULL, run_id INTEGER NOT NULL, "
+                "marker_id INTEGER NOT NULL, sample_id INTEGER NOT NULL, replicate INTEGER NOT NULL, "
+                "variant_id INTEGER NOT NULL, read_count INTEGER NOT NULL, PRIMARY KEY (id))"))
+            SqliteTuning.create_index(conn)
+            SqliteTuning.create_index(conn)
+            index_name_list = [index['name'] for index in sqlalchemy.inspect(conn).get_indexes('VariantReadCount')]
+        self.assertEqual(index_name_list, ['ix_VariantReadCount_sample'])
+
+    def test_create_column(self):
+
+        # FilterLFN table of previous VTAM versions, without the filter_bitmask column
+        with self.engine.connect() as conn:
+            conn.execute(sqlalchemy.text(
+                "CREATE TABLE FilterLFN (id INTEGER NOT NULL, run_id INTEGER NOT NULL, "
+                "marker_id INTEGER NOT NULL, sample_id INTEGER NOT NULL, replicate INTEGER NOT NULL, "
+                "variant_id INTEGER NOT NULL, read_count INTEGER NOT NULL, filter_id INTEGER NOT NULL, "
+                "filter_delete BOOLEAN NOT NULL, PRIMARY KEY (id))"))
+            SqliteTuning.create_column(conn)
+            SqliteTuning.create_column(conn)
+            column_name_list = [column['name'] for column in sqlalchemy.inspect(conn).get_columns('FilterLFN')]
+        self.assertEqual(column_name_list[-2:], ['filter_delete', 'filter_bitmask'])
+
+    def tearDown(self):
+        os.environ.pop(SqliteTuning.env_name, None)
+        if self.environ_pragma is not None:
+            os.environ[SqliteTuning.env_name] = self.environ_pragma
+        self.engine.dispose()
+        shutil.rmtree(self.outdir_path, ignore_errors=True)
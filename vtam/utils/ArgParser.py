@@ -272,6 +272,14 @@ class ArgParser:
             action='store',
             help="output directory with merged FASTA files",
             required=True)
+
+        parser_vtam_merge.add_argument(
+            '-F',
+            '--forceall',
+            dest='forceall',
+            action='store_true',
+            help="merge again all FASTQ pairs, including the pairs with unchanged files and parameters since the last run",
+            required=False)
         # This attribute will trigger the good command
 
         parser_vtam_merge.set_defaults(command='merge')
@@ -371,6 +379,22 @@ class ArgParser:
             help="look for primers only at the edges of the sequence",
             required=False)
 
+        parser_vtam_sortreads.add_argument(
+            "--dereplicate",
+            action="store_true",
+            help="also write for each sorted FASTA file a TSV file with the unique sequences and their read counts "
+                 "('sortedderep' column of 'SORTEDDIR/sortedinfo.tsv'), which is read by 'vtam filter' instead of the FASTA file",
+            required=False)
+
+        parser_vtam_sortreads.add_argument(
+            '-F',
+            '--forceall',
+            dest='forceall',
+            action='store_true',
+            help="sort again all merged FASTA files, including the files with unchanged tags, primers and parameters "
+                 "since the last run, and do not keep the other sorted files of 'SORTEDDIR/sortedinfo.tsv'",
+            required=False)
+
         parser_vtam_sortreads.set_defaults(command='sortreads')
 
     @classmethod
@@ -1,8 +1,18 @@
+import numpy
 import sys
 
 from vtam.utils.Logger import Logger
+from vtam.utils.ModelVariantReadCountLike import ModelVariantReadCountLike
 from vtam.utils.VTAMexception import VTAMexception
 
+# Key columns of the aggregates of N_ijk
+aggregate_key_dic = {
+    'N_i': ['run_id', 'marker_id', 'variant_id'],
+    'N_ij': ['run_id', 'marker_id', 'variant_id', 'sample_id'],
+    'N_ik': ['run_id', 'marker_id', 'variant_id', 'replicate'],
+    'N_jk': ['run_id', 'marker_id', 'sample_id', 'replicate'],
+}
+
 
 class DataframeVariantReadCountLike(object):
     """
@@ -10,6 +20,9 @@ class DataframeVariantReadCountLike(object):
     the different LFN calculation, that is N_i, N_ik, ...
 
     N_ijk stands for the read count for each variant_id i, sample_id j and replicate k
+
+    The aggregates are computed lazily from uint32 group codes and the read counts and are cached, so
+    the DataFrame must not be modified after the creation of the object.
     """
 
     def __init__(self, variant_read_count_df):
@@ -38,6 +51,12 @@ class DataframeVariantReadCountLike(object):
             sys.exit(1)
 
         self.variant_read_count_df = variant_read_count_df
+        self.read_count = variant_read_count_df.read_count.to_numpy(dtype='uint32')
+
+        # Caches of the aggregates
+        self.group_code_dic = {}
+        self.N_group_array_dic = {}
+        self.N_df_dic = {}
 
     def filter_out_below_global_read_count_cutoff(
             self, global_read_count_cutoff):
@@ -46,27 +65,70 @@ class DataframeVariantReadCountLike(object):
         :param global_read_count_cutoff: Threshold to get variants. Default throws singletons global_read_count_cutoff=2
         :return variant_read_count_input_df: DataFrame without singletons
         """
-        N_i_df = self.get_N_i_df()
-        #  get equal or above global_read_count_cutoff
-        N_i_df = N_i_df.loc[N_i_df.N_i >= global_read_count_cutoff]
-        variant_read_count_df = self.variant_read_count_df.merge(
-            N_i_df, on=['run_id', 'marker_id', 'variant_id'])
-        variant_read_count_df.drop('N_i', axis=1, inplace=True)
-        # nijk_df.drop_duplicates(inplace=True)
+        group_code = self.get_group_code('N_i')
+        # Rows grouped by variant in the order of the first row of each variant, like a merge with N_i_df
+        _, first_row_array = numpy.unique(group_code, return_index=True)
+        group_rank = numpy.argsort(numpy.argsort(first_row_array))
+        row_position = numpy.argsort(group_rank[group_code], kind='stable')
+        # get equal or above global_read_count_cutoff
+        row_position = row_position[self.get_N_array('N_i')[row_position] >= global_read_count_cutoff]
+        variant_read_count_df = self.variant_read_count_df.iloc[row_position].reset_index(drop=True)
         return variant_read_count_df
 
+    def get_group_code(self, aggregate):
+        """Returns the uint32 codes of the groups of the aggregate, aligned with the rows of the DataFrame.
+        The codes follow the sorted order of the group keys
+
+        :param aggregate: one of 'N_i', 'N_ij', 'N_ik', 'N_jk'
+        :return: numpy array of uint32
+        """
+        if not (aggregate in self.group_code_dic):
+            self.group_code_dic[aggregate] = self.variant_read_count_df.groupby(
+                by=aggregate_key_dic[aggregate]).ngroup().to_numpy(dtype='uint32')
+        return self.group_code_dic[aggregate]
+
+    def get_N_group_array(self, aggregate):
+        """Returns the sums of read_count of the groups of the aggregate, indexed by the group codes"""
+
+        if not (aggregate in self.N_group_array_dic):
+            group_code = self.get_group_code(aggregate)
+            group_count = int(group_code.max()) + 1 if group_code.shape[0] > 0 else 0
+            self.N_group_array_dic[aggregate] = numpy.bincount(
+                group_code, weights=self.read_count, minlength=group_count).astype('int64')
+        return self.N_group_array_dic[aggregate]
+
+    def get_N_array(self, aggregate):
+        """Returns the aggregate of each row, eg N_i of the variant of the row, without merging DataFrames
+
+        :param aggregate: one of 'N_i', 'N_ij', 'N_ik', 'N_jk'
+        :return: numpy array of int64 aligned with the rows of the DataFrame
+        """
+        return self.get_N_group_array(aggregate)[self.get_group_code(aggregate)]
+
+    def get_N_df(self, aggregate):
+        """Returns a DataFrame with the key columns of the aggregate and the aggregate column, one row per
+        group in the sorted order of the keys
+
+        :param aggregate: one of 'N_i', 'N_ij', 'N_ik', 'N_jk'
+        :return: DataFrame
+        """
+        if not (aggregate in self.N_df_dic):
+            group_code = self.get_group_code(aggregate)
+            # Row of the first occurrence of each group
+            _, first_row_array = numpy.unique(group_code, return_index=True)
+            N_df = self.variant_read_count_df[aggregate_key_dic[aggregate]].iloc[first_row_array]
+            N_df = N_df.reset_index(drop=True)
+            N_df[aggregate] = self.get_N_group_array(aggregate)
+            self.N_df_dic[aggregate] = N_df
+        return self.N_df_dic[aggregate].copy()
+
     def get_N_i_df(self):
         """Returns N_i_df, that is a DataFrame with columns run_id, marker_id, sample_id, N_ijk
         N_i = sum aggregation of N_ijk over variants i
 
         """
 
-        N_i_df = self.variant_read_count_df.groupby(
-            by=['run_id', 'marker_id', 'variant_id']).agg({'read_count': sum}) .reset_index()
-        N_i_df = N_i_df.rename(columns={'read_count': 'N_i'})
-        N_i_df.drop_duplicates(inplace=True)
-
-        return N_i_df
+        return self.get_N_df('N_i')
 
     def get_N_ij_df(self):
         """Returns N_ij_df, that is a DataFrame with columns run_id, marker_id, variant_id, sample_id, N_ij
@@ -74,12 +136,7 @@ class DataframeVariantReadCountLike(object):
 
         """
 
-        N_ij_df = self.variant_read_count_df.groupby(
-            by=['run_id', 'marker_id', 'variant_id', 'sample_id']).agg({'read_count': sum}) .reset_index()
-        N_ij_df = N_ij_df.rename(columns={'read_count': 'N_ij'})
-        N_ij_df.drop_duplicates(inplace=True)
-
-        return N_ij_df
+        return self.get_N_df('N_ij')
 
     def get_N_ik_df(self):
         """Returns N_ik_df, that is a DataFrame with columns run_id, marker_id, sample_id, N_ijk
@@ -87,12 +144,7 @@ class DataframeVariantReadCountLike(object):
 
         """
 
-        N_ik_df = self.variant_read_count_df.groupby(
-            by=['run_id', 'marker_id', 'variant_id', 'replicate']).agg({'read_count': sum}) .reset_index()
-        N_ik_df = N_ik_df.rename(columns={'read_count': 'N_ik'})
-        N_ik_df.drop_duplicates(inplace=True)
-
-        return N_ik_df
+        return self.get_N_df('N_ik')
 
     def get_N_jk_df(self):
         """Returns N_i_df, that is a DataFrame with columns run_id, marker_id, sample_id, N_ijk
@@ -100,43 +152,11 @@ class DataframeVariantReadCountLike(object):
 
         """
 
-        N_jk_df = self.variant_read_count_df.groupby(
-            by=['run_id', 'marker_id', 'sample_id', 'replicate']).agg({'read_count': sum}) .reset_index()
-        N_jk_df = N_jk_df.rename(columns={'read_count': 'N_jk'})
-        N_jk_df.drop_duplicates(inplace=True)
-
-        return N_jk_df
+        return self.get_N_df('N_jk')
 
     def to_sql(self, engine, variant_read_count_like_model):
-        """Convert DF to list of dictionaries to use in an sqlalchemy core insert"""
-
-        record_list = []
-
-        for row in self.variant_read_count_df.itertuples():
-
-            run_id = row.run_id
-            marker_id = row.marker_id
-            sample_id = row.sample_id
-            variant_id = row.variant_id
-            read_count = row.read_count
-            instance = {'run_id': run_id, 'marker_id': marker_id,
-                        'variant_id': variant_id, 'sample_id': sample_id,
-                        'read_count': read_count}
-            if 'filter_delete' in dir(row):
-                instance['filter_delete'] = row.filter_delete
-            if 'filter_id' in dir(row):
-                instance['filter_id'] = row.filter_id
-            if 'replicate' in dir(row):
-                instance['replicate'] = row.replicate
-            if 'replicate_count' in dir(row):
-                instance['replicate_count'] = row.replicate_count
-            if 'read_count_average' in dir(row):
-                instance['read_count_average'] = row.read_count_average
-            record_list.append(instance)
-
-        with engine.connect() as conn:
-
-            # Insert new instances
-            conn.execute(
-                variant_read_count_like_model.__table__.insert(),
-                record_list)
+        """Writes the DF to the table of variant_read_count_like_model with the bulk loader of ModelVariantReadCountLike"""
+
+        record_list = ModelVariantReadCountLike.filter_delete_df_to_dict(self.variant_read_count_df)
+        ModelVariantReadCountLike(engine=engine, variant_read_count_like_model=variant_read_count_like_model)\
+            .bulk_insert(record_list)
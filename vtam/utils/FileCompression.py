@@ -81,6 +81,28 @@ class FileCompression(object):
             return path_to_compressed_file
         return self.file_path
     
+    @staticmethod
+    def stream_compression(fin, path_to_compressed_file, num_threads=1):
+        ''' compress the binary stream fin (eg. the stdout pipe of a subprocess) into a .gz or .bz2 file.
+        Only the compressed file is written to disk. For .gz, pigz is used if available'''
+
+        if path_to_compressed_file.endswith('.gz') and shutil.which('pigz') is not None:
+            with open(path_to_compressed_file, 'wb') as f_out:
+                subprocess.run(args=['pigz', '-c', '-p', str(num_threads)], stdin=fin, stdout=f_out,
+                               check=True)
+            return path_to_compressed_file
+
+        if path_to_compressed_file.endswith('.gz'):
+            _open = gzip.open
+        elif path_to_compressed_file.endswith('.bz2'):
+            _open = bz2.open
+        else:
+            _open = open
+
+        with _open(path_to_compressed_file, 'wb') as f_out:
+            shutil.copyfileobj(fin, f_out, 1024 * 1024)
+        return path_to_compressed_file
+
     def delete_file(self):
         if os.path.exists(self.file_path) and self.file_path and self.compressed != self.file_path:
             os.remove(self.file_path)
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+
+import pandas
+
+
+class FileManifest(object):
+    """TSV file with the fingerprints (Checksums and parameters) of the inputs of already processed files.
+    It is used to skip files whose inputs and parameters have not changed since the last run."""
+
+    def __init__(self, manifest_path, key_columns):
+        """
+        :param manifest_path: Path to the manifest TSV file
+        :param key_columns: List of columns identifying one record, eg ['fastqfwd', 'fastqrev']
+        :return: void
+        """
+        self.manifest_path = manifest_path
+        self.key_columns = key_columns
+        self.record_dic = {}
+
+        if os.path.isfile(manifest_path):
+            manifest_df = pandas.read_csv(manifest_path, sep="\t", header=0, dtype=str,
+                                          keep_default_na=False)
+            for record in manifest_df.to_dict('records'):
+                self.record_dic[self.get_key(record)] = record
+
+    def get_key(self, record):
+        return tuple(str(record[k]) for k in self.key_columns)
+
+    def get_record(self, key_record):
+        """Returns the stored record with the same key columns as key_record or None"""
+
+        return self.record_dic.get(self.get_key(key_record), None)
+
+    def update(self, record):
+        self.record_dic[self.get_key(record)] = {k: str(record[k]) for k in record}
+
+    def remove(self, key_record):
+        self.record_dic.pop(self.get_key(key_record), None)
+
+    def write(self):
+        """Writes the manifest to a temporary file that is then renamed to avoid partial manifests"""
+
+        manifest_df = pandas.DataFrame(list(self.record_dic.values()))
+        manifest_tmp_path = self.manifest_path + '.tmp'
+        manifest_df.to_csv(manifest_tmp_path, sep="\t", header=True, index=False)
+        os.replace(manifest_tmp_path, self.manifest_path)
+
+    @staticmethod
+    def file_md5(file_path, previous_record=None, column=None):
+        """Returns the fingerprint of a file: a dictionary with size, mtime and md5 checksum.
+        The md5 of previous_record is reused if the size and mtime of the file did not change.
+
+        :param file_path: Path to the file
+        :param previous_record: Manifest record with columns {column}_size, {column}_mtime and {column}_md5
+        :param column: Prefix of the columns in the manifest record
+        :return: dictionary with keys {column}_size, {column}_mtime and {column}_md5
+        """
+        file_stat = os.stat(file_path)
+        fingerprint = {
+            '{}_size'.format(column): str(file_stat.st_size),
+            '{}_mtime'.format(column): str(file_stat.st_mtime_ns)}
+
+        if previous_record is not None \
+                and previous_record.get('{}_size'.format(column)) == fingerprint['{}_size'.format(column)] \
+                and previous_record.get('{}_mtime'.format(column)) == fingerprint['{}_mtime'.format(column)]:
+            fingerprint['{}_md5'.format(column)] = previous_record['{}_md5'.format(column)]
+            return fingerprint
+
+        md5 = hashlib.md5()
+        with open(file_path, 'rb') as fin:
+            for buf in iter(lambda: fin.read(1024 * 1024), b''):
+                md5.update(buf)
+        fingerprint['{}_md5'.format(column)] = md5.hexdigest()
+        return fingerprint
+
+    @staticmethod
+    def params_md5(params_dic):
+        """Returns the md5 checksum of a parameter dictionary"""
+
+        return hashlib.md5(json.dumps(params_dic, sort_keys=True, default=str).encode()).hexdigest()
+
+    @staticmethod
+    def get_md5_columns(record):
+        """Returns the checksum columns of a record: the {column}_md5 of the files and params_md5.
+        The size and mtime columns only decide if file_md5 hashes the file again"""
+
+        return [k for k in record if k.endswith('_md5')]
+
+    @staticmethod
+    def is_unchanged(previous_record, record, columns):
+        """True if previous_record has the same values as record for the given columns"""
+
+        if previous_record is None:
+            return False
+        return all(previous_record.get(k) == str(record[k]) for k in columns)
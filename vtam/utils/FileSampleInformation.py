@@ -7,6 +7,7 @@ import sqlalchemy
 
 from vtam.utils.Logger import Logger
 from vtam.utils.VTAMexception import VTAMexception
+from vtam.utils.constants import sqlite_in_batch_size
 
 from vtam.models.Run import Run
 from vtam.models.Marker import Marker
@@ -58,49 +59,61 @@ class FileSampleInformation:
 
         variant_read_count_like_table = variant_read_count_like_model.__table__
 
-        variant_read_count_list = []
-        # for sample_instance in self.get_fasta_information_record_list():
-        for sample_instance_row in self.to_identifier_df(
-                engine=engine).itertuples():
-            run_id = sample_instance_row.run_id
-            marker_id = sample_instance_row.marker_id
-            sample_id = sample_instance_row.sample_id
-            replicate = sample_instance_row.replicate
-            stmt_select = sqlalchemy.select(
-                [
-                    variant_read_count_like_table.c.run_id,
-                    variant_read_count_like_table.c.marker_id,
-                    variant_read_count_like_table.c.sample_id,
-                    variant_read_count_like_table.c.replicate,
-                    variant_read_count_like_table.c.variant_id,
-                    variant_read_count_like_table.c.read_count]).distinct() .where(
-                variant_read_count_like_table.c.run_id == run_id).where(
-                variant_read_count_like_table.c.marker_id == marker_id) .where(
-                    variant_read_count_like_table.c.sample_id == sample_id).where(
-                        variant_read_count_like_table.c.replicate == replicate)
-            # Used for filters tables where filter_delete attribute exists
-            if 'filter_delete' in [
-                    column.key for column in variant_read_count_like_table.columns]:
-                stmt_select = stmt_select.where(
-                    variant_read_count_like_table.c.filter_delete == 0)
-            # used for filter lfn where filter_id = 8 is necessary (do not pass
-            # all filters)
-            if filter_id is not None:
-                stmt_select = stmt_select.where(
-                    variant_read_count_like_table.c.filter_id == filter_id)
-            with engine.connect() as conn2:
-                for row in conn2.execute(stmt_select).fetchall():
-                    variant_read_count_list.append(row)
-        #
-        variant_read_count_df = pandas.DataFrame.from_records(
-            variant_read_count_list,
-            columns=[
-                'run_id',
-                'marker_id',
-                'sample_id',
-                'replicate',
-                'variant_id',
-                'read_count'])
+        identifier_df = self.to_identifier_df(engine=engine)[
+            ['run_id', 'marker_id', 'sample_id', 'replicate']].astype('int64').drop_duplicates()
+        identifier_df['sample_order'] = range(identifier_df.shape[0])
+
+        # The identifiers of the samples are loaded into a temporary table that is joined once to the table
+        sample_staging_table = sqlalchemy.Table(
+            'SampleInformationStaging', sqlalchemy.MetaData(),
+            sqlalchemy.Column('sample_order', sqlalchemy.Integer, primary_key=True),
+            sqlalchemy.Column('run_id', sqlalchemy.Integer),
+            sqlalchemy.Column('marker_id', sqlalchemy.Integer),
+            sqlalchemy.Column('sample_id', sqlalchemy.Integer),
+            sqlalchemy.Column('replicate', sqlalchemy.Integer),
+            prefixes=['TEMPORARY'])
+        stmt_select = sqlalchemy.select(
+            [
+                sample_staging_table.c.sample_order,
+                variant_read_count_like_table.c.run_id,
+                variant_read_count_like_table.c.marker_id,
+                variant_read_count_like_table.c.sample_id,
+                variant_read_count_like_table.c.replicate,
+                variant_read_count_like_table.c.variant_id,
+                variant_read_count_like_table.c.read_count]).select_from(
+            variant_read_count_like_table.join(
+                sample_staging_table, sqlalchemy.and_(
+                    variant_read_count_like_table.c.run_id == sample_staging_table.c.run_id,
+                    variant_read_count_like_table.c.marker_id == sample_staging_table.c.marker_id,
+                    variant_read_count_like_table.c.sample_id == sample_staging_table.c.sample_id,
+                    variant_read_count_like_table.c.replicate == sample_staging_table.c.replicate)))
+        # Used for filters tables where filter_delete attribute exists
+        if 'filter_delete' in [
+                column.key for column in variant_read_count_like_table.columns]:
+            stmt_select = stmt_select.where(
+                variant_read_count_like_table.c.filter_delete == 0)
+        # used for filter lfn where filter_id = 8 is necessary (do not pass
+        # all filters)
+        if filter_id is not None:
+            stmt_select = stmt_select.where(
+                variant_read_count_like_table.c.filter_id == filter_id)
+        # Rows in the order of the sample information file and then of the table
+        stmt_select = stmt_select.order_by(
+            sample_staging_table.c.sample_order, variant_read_count_like_table.c.id)
+
+        with engine.connect() as conn:
+            sample_staging_table.create(conn, checkfirst=True)
+            try:
+                conn.execute(sample_staging_table.delete())
+                if identifier_df.shape[0] > 0:
+                    conn.execute(sample_staging_table.insert(), identifier_df.to_dict('records'))
+                variant_read_count_df = pandas.read_sql(stmt_select, conn)
+            finally:
+                sample_staging_table.drop(conn)
+        variant_read_count_df.columns = ['sample_order', 'run_id', 'marker_id', 'sample_id', 'replicate',
+                                         'variant_id', 'read_count']
+        variant_read_count_df = variant_read_count_df.drop('sample_order', axis=1).drop_duplicates()\
+            .reset_index(drop=True).astype('int64')
 
         # Exit if no variants for analysis
         try:
@@ -124,41 +137,22 @@ class FileSampleInformation:
 
         """
 
-        sample_info_df = pandas.DataFrame()
-        sample_info_df['run_id'] = None
-        sample_info_df['marker_id'] = None
-        sample_info_df['sample_id'] = None
+        sample_info_df = self.read_tsv_into_df()
+        identifier_df = pandas.DataFrame(index=sample_info_df.index)
         with engine.connect() as conn:
-            for k, row in self.read_tsv_into_df().iterrows():
-                marker_name = row.marker
-                run_name = row.run
-                sample_name = row['sample']  # fixed confusion of sample method and variable
-                replicate = int(row.replicate)
-                # get run_id ###########
-                stmt_select_run_id = sqlalchemy.select(
-                    [Run.__table__.c.id]).where(Run.__table__.c.name == run_name)
-                run_id = conn.execute(stmt_select_run_id).first()[0]
-                # get marker_id ###########
-                stmt_select_marker_id = sqlalchemy.select([Marker.__table__.c.id]).where(
-                    Marker.__table__.c.name == marker_name)
-                marker_id = conn.execute(stmt_select_marker_id).first()[0]
-                # get sample_id ###########
-                stmt_select_sample_id = sqlalchemy.select([Sample.__table__.c.id]).where(
-                    Sample.__table__.c.name == sample_name)
-                sample_id = conn.execute(
-                    stmt_select_sample_id).first()[0]
-                new_row_dic = dict(row)
-                new_row_dic['run_id'] = run_id
-                new_row_dic['marker_id'] = marker_id
-                new_row_dic['sample_id'] = sample_id
-                new_row_dic['replicate'] = replicate
-                del new_row_dic["run"]
-                del new_row_dic["marker"]
-                del new_row_dic["sample"]
-
-                #sample_info_df = sample_info_df.append(
-                #    pandas.DataFrame(new_row_dic, index=[0]), sort=False)
-                sample_info_df = pandas.concat([sample_info_df, pandas.DataFrame(new_row_dic, index=[0])], axis=0)
+            # One query per table for the names of the file
+            for column, model in [('run', Run), ('marker', Marker), ('sample', Sample)]:
+                name_series = sample_info_df[column].astype(str)
+                name_list = name_series.drop_duplicates().tolist()
+                name_to_id_dic = {}
+                for i in range(0, len(name_list), sqlite_in_batch_size):
+                    stmt_select = sqlalchemy.select([model.__table__.c.name, model.__table__.c.id]).where(
+                        model.__table__.c.name.in_(name_list[i:i + sqlite_in_batch_size]))
+                    name_to_id_dic.update(dict(conn.execute(stmt_select).fetchall()))
+                identifier_df[column + '_id'] = [name_to_id_dic[name] for name in name_series]
+        sample_info_df = pandas.concat(
+            [identifier_df, sample_info_df.drop(['run', 'marker', 'sample'], axis=1)], axis=1)
+        sample_info_df['replicate'] = sample_info_df.replicate.astype(int)
 
         sample_info_df.columns = sample_info_df.columns.str.lower()
         return sample_info_df
@@ -284,24 +278,28 @@ class FileSampleInformation:
             self,
             variant_read_count_like_model,
             engine,
-            filter_id=None):
+            filter_id=None,
+            variant_read_count_like_df=None):
         """Based on the SortedReadFile information TSV and variant_model, returns the variant_df
 
+        :param variant_read_count_like_df: Output of get_nijk_df with the same arguments, if already available
         :return: DataFrame with columns: index, sequence
         """
 
-        variant_read_count_like_df = self.get_nijk_df(
-            variant_read_count_like_model, engine, filter_id)
+        if variant_read_count_like_df is None:
+            variant_read_count_like_df = self.get_nijk_df(
+                variant_read_count_like_model, engine, filter_id)
 
-        record_list = []
+        variant_id_list = variant_read_count_like_df.variant_id.unique().tolist()
         variant_model_table = Variant.__table__
-        for variant_id in variant_read_count_like_df.variant_id.unique().tolist():
-            with engine.connect() as conn:
-                stmt_select = sqlalchemy.select([variant_model_table.c.sequence]).where(
-                    variant_model_table.c.id == variant_id)
-                for sequence in conn.execute(stmt_select).first():
-                    record_list.append(
-                        {'id': variant_id, 'sequence': sequence})
+        record_list = []
+        with engine.connect() as conn:
+            for i in range(0, len(variant_id_list), sqlite_in_batch_size):
+                stmt_select = sqlalchemy.select([variant_model_table.c.id, variant_model_table.c.sequence]).where(
+                    variant_model_table.c.id.in_(variant_id_list[i:i + sqlite_in_batch_size]))
+                sequence_dic = dict(conn.execute(stmt_select).fetchall())
+                for variant_id in variant_id_list[i:i + sqlite_in_batch_size]:
+                    record_list.append({'id': variant_id, 'sequence': sequence_dic[variant_id]})
 
         variant_df = pandas.DataFrame.from_records(record_list, index='id')
 
@@ -1,6 +1,12 @@
 import pandas
 import sqlalchemy
 
+# Number of records per executemany of bulk_insert
+bulk_insert_batch_size = 100000
+
+# SQLite pragmas set during bulk_insert: fewer disk syncs and a larger page cache
+sqlite_bulk_load_pragma_dic = {'synchronous': 1, 'cache_size': -262144, 'temp_store': 2}
+
 
 class ModelVariantReadCountLike(object):
     """Takes a any type of VariantReadCount models/table with at least run_id, marker_id, sample_id, replicate, variant_id
@@ -41,26 +47,39 @@ class ModelVariantReadCountLike(object):
 
     @staticmethod
     def filter_delete_df_to_dict(filter_df):
-        """Convert DF to list of dictionaries to use in an sqlalchemy core insert"""
-        records = []
-        for row in filter_df.itertuples():
-            run_id = row.run_id
-            marker_id = row.marker_id
-            sample_id = row.sample_id
-            variant_id = row.variant_id
-            read_count = row.read_count
-            instance = {'run_id': run_id, 'marker_id': marker_id,
-                                                         'variant_id': variant_id, 'sample_id': sample_id,
-                                                         'read_count': read_count}
-            if 'filter_delete' in dir(row):
-                instance['filter_delete'] = row.filter_delete
-            if 'filter_id' in dir(row):
-                instance['filter_id'] = row.filter_id
-            if 'replicate' in dir(row):
-                instance['replicate'] = row.replicate
-            if 'replicate_count' in dir(row):
-                instance['replicate_count'] = row.replicate_count
-            if 'read_count_average' in dir(row):
-                instance['read_count_average'] = row.read_count_average
-            records.append(instance)
-        return records
+        """Convert DF to list of dictionaries to use in an sqlalchemy core insert
+
+        The columns are converted once to python objects instead of row by row"""
+
+        column_list = ['run_id', 'marker_id', 'variant_id', 'sample_id', 'read_count']
+        for column in ['filter_delete', 'filter_id', 'filter_bitmask', 'replicate', 'replicate_count', 'read_count_average']:
+            if column in filter_df.columns:
+                column_list.append(column)
+        value_list_list = [filter_df[column].tolist() for column in column_list]
+        return [dict(zip(column_list, values)) for values in zip(*value_list_list)]
+
+    def bulk_insert(self, record_list):
+        """Inserts records in large executemany batches inside one transaction. With SQLite, the
+        pragmas of the connection are set for a bulk load and restored afterwards.
+
+        :param record_list: list of dictionaries, eg. output of filter_delete_df_to_dict
+        :return: void
+        """
+        if len(record_list) == 0:
+            return
+        with self.engine.connect() as conn:
+            is_sqlite = (conn.dialect.name == 'sqlite')
+            if is_sqlite:
+                pragma_previous_dic = {pragma: conn.execute(sqlalchemy.text("PRAGMA {}".format(pragma))).first()[0]
+                                       for pragma in sqlite_bulk_load_pragma_dic}
+                for pragma in sqlite_bulk_load_pragma_dic:
+                    conn.execute(sqlalchemy.text("PRAGMA {} = {}".format(pragma, sqlite_bulk_load_pragma_dic[pragma])))
+            try:
+                with conn.begin():
+                    for i in range(0, len(record_list), bulk_insert_batch_size):
+                        conn.execute(self.variant_read_count_like_model.__table__.insert(),
+                                     record_list[i:i + bulk_insert_batch_size])
+            finally:
+                if is_sqlite:
+                    for pragma in pragma_previous_dic:
+                        conn.execute(sqlalchemy.text("PRAGMA {} = {}".format(pragma, pragma_previous_dic[pragma])))
@@ -5,6 +5,7 @@ import sqlalchemy
 from vtam.models.FilterChimeraBorderline import FilterChimeraBorderline
 from vtam.models.Variant import Variant
 from vtam.utils.Logger import Logger
+from vtam.utils.VariantSequenceHash import VariantSequenceHash
 
 
 class NameIdConverter:
@@ -61,14 +62,13 @@ class NameIdConverter:
 
         variant_id_lst = []
         with self.engine.connect() as conn:
-            for sequence in self.id_name_or_sequence_list:
-                result = conn.execute(
-                    sqlalchemy.select([Variant.__table__.c.id]).where(
-                        Variant.__table__.c.sequence == sequence)).first()
-                if result is None:
-                    Logger.instance().error("Sequence {} not found in table {}".format(sequence, str(Variant.__table__)))
-                    sys.exit(1)
-                variant_id_lst.append(result[0])
+            variant_id_dic = VariantSequenceHash.select_id_dic(
+                conn=conn, variant_sequence_list=self.id_name_or_sequence_list)
+        for sequence in self.id_name_or_sequence_list:
+            if not (sequence in variant_id_dic):
+                Logger.instance().error("Sequence {} not found in table {}".format(sequence, str(Variant.__table__)))
+                sys.exit(1)
+            variant_id_lst.append(variant_id_dic[sequence])
         return variant_id_lst
 
     def variant_id_is_chimera_borderline(self):
@@ -14,49 +14,99 @@ This module will store and run_name these LFNFilters:
 Expected results and descriptions are given in the docstrings and in this file:
 vtam/discussion_reda_aitor/example_filter.ods
 
+The filters are evaluated as boolean NumPy arrays aligned with the rows of the input. Each filter
+only keeps the positions of its rows in the input and their filter_delete values, and the output
+DataFrame is built once from these arrays.
+
+With the 'bitmask' storage, the output has a single row per occurrence with filter_id 8 and the
+filter_bitmask column, where bit 2**filter_id is set for each filter 2 to 7 that deleted the
+occurrence.
+
 """
 import sys
 
+import numpy
 import pandas
 
+from vtam.utils.DataframeVariantReadCountLike import DataframeVariantReadCountLike
+from vtam.utils.DataframeVariantReadCountLike import aggregate_key_dic
 from vtam.utils.Logger import Logger
 from vtam.utils.VTAMexception import VTAMexception
-from vtam.utils.DataframeVariantReadCountLike import DataframeVariantReadCountLike
+
+# Columns of the occurrences
+occurrence_key_list = ['run_id', 'marker_id', 'variant_id', 'sample_id', 'replicate']
+
+# Storages of the output: one row per occurrence and filter or one row per occurrence with a bitmask
+filter_lfn_storage_list = ['full', 'bitmask']
 
 
 class RunnerFilterLFN:
 
     def __init__(self, variant_read_count_df):
         self.variant_read_count_df = variant_read_count_df[[
-            'marker_id', 'run_id', 'variant_id', 'sample_id', 'replicate', 'read_count']]
-        #  Instance for all the calculations N_i, N_ij, etc
-        self.variant_read_count_lfn_df = DataframeVariantReadCountLike(
-            variant_read_count_df)
+            'marker_id', 'run_id', 'variant_id', 'sample_id', 'replicate', 'read_count']].reset_index(drop=True)
         #
         if self.variant_read_count_df.shape[1] != 6:
             raise Exception(
                 'VariantReadCountLikeModel missing in the variant2sample2replicate2count data frame!')
+        self.read_count = self.variant_read_count_df.read_count.to_numpy()
+        # Cached LFN denominators N_i, N_ik and N_jk aligned with the rows
+        self.variant_read_count_df_obj = DataframeVariantReadCountLike(self.variant_read_count_df)
+
+        # Integer codes of the groups of rows by columns, in the order of the first row of each group
+        self.group_code_dic = {}
 
         #######################################################################
         #
-        #  Output variant_read_count_input_df with deleted variants
+        #  Output with deleted variants: list of (filter_id, positions of the rows in the input,
+        #  filter_delete) for each filter
         #
         ################################
 
-        self.variant_read_count_filter_delete_df = pandas.DataFrame(
-            data={
-                'run_id': [],
-                'marker_id': [],
-                'sample_id': [],
-                'variant_id': [],
-                'replicate': [],
-                'read_count': [],
-                'filter_id': [],
-                'filter_delete': []},
-            dtype='uint32')
+        self.filter_delete_list = []
+        self._variant_read_count_filter_delete_df = None
+
+    @property
+    def variant_read_count_filter_delete_df(self):
+        """DataFrame with columns run_id, marker_id, sample_id, variant_id, replicate, read_count, filter_id,
+        filter_delete and the rows of all filters that have been run"""
+
+        if self._variant_read_count_filter_delete_df is None:
+            if len(self.filter_delete_list) > 0:
+                row_position = numpy.concatenate([position for _, position, _ in self.filter_delete_list])
+                filter_id = numpy.concatenate([numpy.full(position.shape[0], filter_id, dtype='int64')
+                                               for filter_id, position, _ in self.filter_delete_list])
+                filter_delete = numpy.concatenate([delete for _, _, delete in self.filter_delete_list])
+            else:
+                row_position = numpy.zeros(0, dtype='int64')
+                filter_id = numpy.zeros(0, dtype='int64')
+                filter_delete = numpy.zeros(0, dtype='bool')
+            column_dic = {column: self.variant_read_count_df[column].to_numpy()[row_position] for column in [
+                'run_id', 'marker_id', 'sample_id', 'variant_id', 'replicate', 'read_count']}
+            column_dic['filter_id'] = filter_id
+            column_dic['filter_delete'] = filter_delete
+            self._variant_read_count_filter_delete_df = pandas.DataFrame(column_dic, copy=False)
+        return self._variant_read_count_filter_delete_df
+
+    @property
+    def variant_read_count_filter_bitmask_df(self):
+        """DataFrame with columns run_id, marker_id, sample_id, variant_id, replicate, read_count, filter_id,
+        filter_delete, filter_bitmask and one row per occurrence with filter_id=8. The filter_delete value is
+        the value of filter 8 and bit 2**filter_id of filter_bitmask is set for each deleting filter"""
+
+        group_code = self.get_group_code(occurrence_key_list)
+        group_bitmask = self.get_occurrence_bitmask()
+        row_position = numpy.argsort(group_code, kind='stable')
+        filter_bitmask = group_bitmask[group_code[row_position]]
+        column_dic = {column: self.variant_read_count_df[column].to_numpy()[row_position] for column in [
+            'run_id', 'marker_id', 'sample_id', 'variant_id', 'replicate', 'read_count']}
+        column_dic['filter_id'] = numpy.full(row_position.shape[0], 8, dtype='int64')
+        column_dic['filter_delete'] = filter_bitmask != 0
+        column_dic['filter_bitmask'] = filter_bitmask
+        return pandas.DataFrame(column_dic, copy=False)
 
     def get_variant_read_count_delete_df(self, lfn_variant_cutoff, lfn_variant_specific_cutoff, lfn_variant_replicate_cutoff, lfn_variant_replicate_specific_cutoff,
-                                         lfn_sample_replicate_cutoff, lfn_read_count_cutoff):
+                                         lfn_sample_replicate_cutoff, lfn_read_count_cutoff, filter_lfn_storage='full'):
 
         ############################################################################################
         #
@@ -89,6 +139,9 @@ class RunnerFilterLFN:
 
         self.mark_delete_lfn_absolute_read_count(lfn_read_count_cutoff)
 
+        if filter_lfn_storage == 'bitmask':
+            return self.variant_read_count_filter_bitmask_df
+
         #######################################################################
         #
         # Filter 8:mark_delete_lfn_do_not_pass_all_filters
@@ -99,6 +152,20 @@ class RunnerFilterLFN:
 
         return self.variant_read_count_filter_delete_df
 
+    def get_group_code(self, key_list):
+        """Returns the integer codes of the groups of rows by the key_list columns"""
+
+        key_tuple = tuple(key_list)
+        if not (key_tuple in self.group_code_dic):
+            self.group_code_dic[key_tuple] = self.variant_read_count_df.groupby(
+                by=key_list, sort=False).ngroup().to_numpy()
+        return self.group_code_dic[key_tuple]
+
+    def add_filter_delete(self, filter_id, row_position, filter_delete):
+
+        self.filter_delete_list.append((filter_id, row_position, filter_delete))
+        self._variant_read_count_filter_delete_df = None
+
     def mark_delete_lfn_per_Ni_or_Nik_or_Njk(self, lfn_denominator, cutoff, cutoff_specific_df=None,):
 
         """
@@ -112,81 +179,50 @@ class RunnerFilterLFN:
             and with filter_id=4 and 'filter_delete'=1 or 0 (Variant-specific cutoff)
         """
 
-        if not (cutoff_specific_df is None):
-            cutoff_specific_df.drop(['variant_sequence'], axis=1, inplace=True)
-
         if lfn_denominator == 'N_i':  # variant
             this_filter_id = 2
-            N_df = self.variant_read_count_lfn_df.get_N_i_df()  #  Compute N_i_df
-            filter_df = self.variant_read_count_df.merge(N_df, on=['run_id', 'marker_id', 'variant_id'])
-            filter_df['filter_id'] = this_filter_id
-            filter_df['cutoff'] = cutoff
-
-            filter_cutoff_specific_df = None
-            if not (cutoff_specific_df is None):
-                this_filter_id = 4
-                filter_cutoff_specific_df = filter_df.copy()
-                filter_cutoff_specific_df.drop('cutoff', axis=1, inplace=True)
-                filter_cutoff_specific_df = filter_cutoff_specific_df.merge(cutoff_specific_df,
-                                                on=['run_id', 'marker_id', 'variant_id'])
-                filter_cutoff_specific_df['filter_id'] = this_filter_id
-
-            filter_df = pandas.concat([filter_df, filter_cutoff_specific_df], axis=0)
-            filter_df['lfn_ratio'] = filter_df.read_count / filter_df.N_i
-
+            specific_filter_id = 4
         elif lfn_denominator == 'N_ik':  # variant_replicate
             this_filter_id = 3
-            N_df = self.variant_read_count_lfn_df.get_N_ik_df()  #  Compute N_ik_df
-            filter_df = self.variant_read_count_df.merge(
-                N_df, on=['run_id', 'marker_id', 'variant_id', 'replicate'])
-            filter_df['lfn_ratio'] = filter_df.read_count / filter_df.N_ik
-            filter_df['filter_id'] = this_filter_id
-            filter_df['cutoff'] = cutoff
-
-            filter_cutoff_specific_df = None
-            if not (cutoff_specific_df is None):
-                this_filter_id = 5
-                filter_cutoff_specific_df = filter_df.copy()
-                filter_cutoff_specific_df.drop('cutoff', axis=1, inplace=True)
-                filter_cutoff_specific_df = filter_cutoff_specific_df.merge(cutoff_specific_df,
-                                                on=['run_id', 'marker_id', 'variant_id', 'replicate'])
-                filter_cutoff_specific_df['filter_id'] = this_filter_id
-
-            filter_df = pandas.concat([filter_df, filter_cutoff_specific_df], axis=0)
-            filter_df['lfn_ratio'] = filter_df.read_count / filter_df.N_ik
-
+            specific_filter_id = 5
         elif lfn_denominator == 'N_jk':  # sample_replicate
             this_filter_id = 6
-            N_df = self.variant_read_count_lfn_df.get_N_jk_df()  #  Compute N_jk_df
-            filter_df = self.variant_read_count_df.merge(
-                N_df, left_on=[
-                    'run_id', 'marker_id', 'sample_id', 'replicate'], right_on=[
-                    'run_id', 'marker_id', 'sample_id', 'replicate'])
-            filter_df['lfn_ratio'] = filter_df.read_count / filter_df.N_jk
-            filter_df['filter_id'] = this_filter_id
-            filter_df['cutoff'] = cutoff
-
+            specific_filter_id = None
+            cutoff_specific_df = None
         else:
             Logger.instance().critical(VTAMexception("Internal error. VTAM will exit."))
             sys.exit(1)
 
-        # Initialize filter: Keep everything
-        filter_df['filter_delete'] = False
-
-        # Mark for deletion all variants with read_count=0
-        filter_df.loc[filter_df.read_count == 0, 'filter_delete'] = True
-
-        # Mark for deletion all filters with 'lfn_ratio'<=lfn_variant_cutoff
-        filter_df.loc[filter_df['lfn_ratio'] <= filter_df['cutoff'], 'filter_delete'] = True
+        key_list = aggregate_key_dic[lfn_denominator]
+        group_code = self.get_group_code(key_list)
+        N_array = self.variant_read_count_df_obj.get_N_array(lfn_denominator)
 
-        #  Keep important columns
-        filter_df = filter_df[['run_id', 'marker_id', 'sample_id', 'replicate', 'variant_id',
-                               'read_count', 'filter_id', 'filter_delete']]
+        # Rows grouped by key_list, in the order of the first row of each group
+        row_position = numpy.argsort(group_code, kind='stable')
+        self.add_filter_delete(this_filter_id, row_position,
+                               self.get_lfn_delete(row_position, N_array, cutoff))
 
-        # Prepare output variant_read_count_input_df and concatenate vertically output variant_read_count_input_df
-        # to self.variant_read_count_filter_delete_df
-        self.variant_read_count_filter_delete_df = pandas.concat(
-            [self.variant_read_count_filter_delete_df, filter_df], sort=False, axis=0)
+        if not (cutoff_specific_df is None):
+            # Rows of the variants or variant replicates with a specific cutoff
+            row_position_df = self.variant_read_count_df.loc[row_position, key_list]
+            row_position_df['row_position'] = row_position
+            row_position_df = row_position_df.merge(cutoff_specific_df[key_list + ['cutoff']], on=key_list)
+            specific_row_position = row_position_df.row_position.to_numpy()
+            self.add_filter_delete(specific_filter_id, specific_row_position, self.get_lfn_delete(
+                specific_row_position, N_array, row_position_df.cutoff.to_numpy(dtype='float64')))
+
+    def get_lfn_delete(self, row_position, N_array, cutoff):
+        """Returns the filter_delete array of the rows: deleted if read_count=0 or read_count/N <= cutoff
+
+        :param row_position: positions of the rows in the input
+        :param N_array: denominators of the input rows
+        :param cutoff: float or array of floats aligned with row_position
+        :return: numpy array of bool
+        """
+        read_count = self.read_count[row_position]
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            lfn_ratio = read_count / N_array[row_position]
+        return (read_count == 0) | (lfn_ratio <= cutoff)
 
     def mark_delete_lfn_absolute_read_count(self, lfn_read_count_cutoff):
         """
@@ -223,78 +259,25 @@ class RunnerFilterLFN:
 
         """
         this_filter_id = 7
-        # Selecting all the indexes where the ratio is below the minimal
-        # readcount
-        filter_df = self.variant_read_count_df.copy()
-
-        # do_not_pass_variant_id_list = self.variant_read_count_input_df.loc[
-        #     self.variant_read_count_input_df['read_count'] < lfn_nijk_cutoff].variant_id.tolist()
-        # do_not_pass_replicate_list = self.variant_read_count_input_df.loc[
-        # self.variant_read_count_input_df['read_count'] <
-        # lfn_nijk_cutoff].replicate.tolist()
-
-        filter_df['filter_id'] = this_filter_id  #  set this filter
-        filter_df['filter_delete'] = False
-
-        filter_df.loc[filter_df.read_count <
-                      lfn_read_count_cutoff, 'filter_delete'] = True
-        filter_df = filter_df[['run_id',
-                               'marker_id',
-                               'variant_id',
-                               'sample_id',
-                               'replicate',
-                               'read_count',
-                               'filter_id',
-                               'filter_delete']]
-        #
-        # Concatenate vertically output variant_read_count_input_df
-        #  Prepare output variant_read_count_input_df and concatenate to
-        # self.variant_read_count_filter_delete_df
+        row_position = numpy.arange(self.read_count.shape[0])
+        self.add_filter_delete(this_filter_id, row_position, self.read_count < lfn_read_count_cutoff)
 
-        self.variant_read_count_filter_delete_df = pandas.concat(
-            [self.variant_read_count_filter_delete_df, filter_df], sort=False)
+    def get_occurrence_bitmask(self):
+        """Returns the bitmask of the filters 2 to 7 that deleted each occurrence, indexed by the occurrence
+        group codes"""
+
+        group_code = self.get_group_code(occurrence_key_list)
+        group_bitmask = numpy.zeros(group_code.max() + 1 if group_code.shape[0] > 0 else 0, dtype='int64')
+        for filter_id, row_position, filter_delete in self.filter_delete_list:
+            if filter_id != 8:
+                group_bitmask[group_code[row_position[filter_delete]]] |= 1 << filter_id
+        return group_bitmask
 
     def mark_delete_lfn_do_not_pass_all_filters(self):
+        """Deletes the occurrences deleted by at least one of the previous filters"""
+
         this_filter_id = 8
-        # Calculating the total of reads by variant
-        filter_df = self.variant_read_count_filter_delete_df[['run_id',
-                                                              'marker_id',
-                                                              'variant_id',
-                                                              'sample_id',
-                                                              'replicate',
-                                                              'filter_delete']].groupby(['run_id',
-                                                                                         'marker_id',
-                                                                                         'variant_id',
-                                                                                         'sample_id',
-                                                                                         'replicate']).agg({'filter_delete': sum})
-        filter_df = filter_df.rename(
-            columns={'filter_delete': 'filter_delete_aggregate'})
-
-        # Merge the column with the total reads by sample replicates for
-        # calculate the ratio
-        filter_df = self.variant_read_count_df.merge(
-            filter_df, left_on=[
-                'run_id', 'marker_id', 'variant_id', 'sample_id', 'replicate'], right_on=[
-                'run_id', 'marker_id', 'variant_id', 'sample_id', 'replicate'])
-        #
-        # Initialize
-        filter_df['filter_id'] = this_filter_id
-        filter_df['filter_delete'] = False
-        #
-        #
-        # Selecting all the indexes where the ratio is below the ratio
-        filter_df.loc[
-            filter_df.filter_delete_aggregate > 0, 'filter_delete'] = True
-        #
-        # Let only interest columns
-        filter_df = filter_df[['run_id',
-                               'marker_id',
-                               'variant_id',
-                               'sample_id',
-                               'replicate',
-                               'read_count',
-                               'filter_id',
-                               'filter_delete']]
-        #
-        self.variant_read_count_filter_delete_df = pandas.concat(
-            [self.variant_read_count_filter_delete_df, filter_df], sort=False)
+        group_code = self.get_group_code(occurrence_key_list)
+        group_delete = self.get_occurrence_bitmask() != 0
+        row_position = numpy.argsort(group_code, kind='stable')
+        self.add_filter_delete(this_filter_id, row_position, group_delete[group_code[row_position]])
@@ -74,17 +74,14 @@ class RunnerFilterLFNreplicateRemain:
 
         ############################################################################################
         #
-        # mark_delete_lfn_do_not_pass_all_filters
+        # Occurrences that pass all filters, from the bitmask rows with filter_id=8
         #
         ############################################################################################
 
-        lfn_filter_runner.mark_delete_lfn_do_not_pass_all_filters()
-
-        nijk_remain_df = lfn_filter_runner.variant_read_count_filter_delete_df
+        nijk_remain_df = lfn_filter_runner.variant_read_count_filter_bitmask_df
 
         nijk_remain_df = nijk_remain_df.loc[
-            (nijk_remain_df.filter_id == 8) &
-            (nijk_remain_df.filter_delete == 0)]
+            (nijk_remain_df.filter_delete == 0)].drop('filter_bitmask', axis=1)
 
         del (lfn_filter_runner)
 
@@ -0,0 +1,129 @@
+import numpy
+
+from vtam.utils.DataframeVariantReadCountLike import DataframeVariantReadCountLike
+
+
+class RunnerFilterLFNreplicateRemainGrid:
+    """Counts the known occurrences that remain after the filters of RunnerFilterLFNreplicateRemain for many
+    cutoffs. The ratios N_ijk/N_i, N_ijk/N_ik and N_ijk/N_jk, the groups of the occurrences and the known
+    occurrences are computed once, so that each set of cutoffs only needs vectorized comparisons"""
+
+    def __init__(self, nijk_df, known_occurrences_df):
+
+        self.nijk_df = nijk_df[['run_id', 'marker_id', 'sample_id', 'replicate', 'variant_id', 'read_count']]\
+            .reset_index(drop=True)
+        self.nijk_df_obj = DataframeVariantReadCountLike(self.nijk_df)
+        self.read_count = self.nijk_df.read_count.to_numpy()
+
+        # Occurrences with replicates and run-marker-sample-variant groups
+        self.occurrence_code = self.nijk_df.groupby(
+            by=['run_id', 'marker_id', 'variant_id', 'sample_id', 'replicate']).ngroup().to_numpy()
+        self.occurrence_count = int(self.occurrence_code.max()) + 1 if self.occurrence_code.shape[0] > 0 else 0
+        key_list = ['run_id', 'marker_id', 'sample_id', 'variant_id']
+        self.sample_variant_code = self.nijk_df.groupby(by=key_list).ngroup().to_numpy()
+        sample_variant_df = self.nijk_df[key_list].drop_duplicates().copy()
+        sample_variant_df['code'] = self.sample_variant_code[sample_variant_df.index.to_numpy()]
+
+        # Known occurrences to keep and to delete by run-marker-sample-variant group
+        self.sample_variant_count = sample_variant_df.shape[0]
+        self.is_keep = self.get_is_known(sample_variant_df, known_occurrences_df, action='keep')
+        self.is_delete = self.get_is_known(sample_variant_df, known_occurrences_df, action='delete')
+
+        # Ratios of the LFN filters
+        self.lfn_ratio_dic = {}
+
+    def get_is_known(self, sample_variant_df, known_occurrences_df, action):
+
+        key_list = ['run_id', 'marker_id', 'sample_id', 'variant_id']
+        known_df = known_occurrences_df.loc[known_occurrences_df.action == action, key_list]
+        code_array = sample_variant_df.merge(known_df, on=key_list).code.to_numpy()
+        is_known = numpy.zeros(self.sample_variant_count, dtype='bool')
+        is_known[code_array] = True
+        return is_known
+
+    def get_lfn_ratio(self, lfn_denominator):
+        """Returns N_ijk/N for the lfn_denominator 'N_i', 'N_ik' or 'N_jk'"""
+
+        if not (lfn_denominator in self.lfn_ratio_dic):
+            with numpy.errstate(divide='ignore', invalid='ignore'):
+                self.lfn_ratio_dic[lfn_denominator] = self.read_count / self.nijk_df_obj.get_N_array(lfn_denominator)
+        return self.lfn_ratio_dic[lfn_denominator]
+
+    def count_keep_delete(self, lfn_ni_cutoff, lfn_nik_cutoff, lfn_njk_cutoff, lfn_nijk_cutoff, min_replicate_number):
+        """Returns the same count_keep and count_delete as RunnerFilterLFNreplicateRemain.count_keep_delete"""
+
+        if lfn_nik_cutoff is None:  # optimize lfn variant
+            row_delete = self.get_lfn_ratio('N_i') <= lfn_ni_cutoff
+        else:  # optimize lfn variant replicate
+            row_delete = self.get_lfn_ratio('N_ik') <= lfn_nik_cutoff
+        row_delete |= self.read_count == 0
+        row_delete |= self.get_lfn_ratio('N_jk') <= lfn_njk_cutoff
+        row_delete |= self.read_count < lfn_nijk_cutoff
+
+        # Occurrences that do not pass all filters
+        occurrence_delete = numpy.bincount(
+            self.occurrence_code, weights=row_delete, minlength=self.occurrence_count) > 0
+        row_remain = ~occurrence_delete[self.occurrence_code]
+
+        # Remaining replicates of each sample and variant
+        replicate_count = numpy.bincount(
+            self.sample_variant_code, weights=row_remain, minlength=self.sample_variant_count)
+        sample_variant_remain = (replicate_count > 0) & (replicate_count >= min_replicate_number)
+
+        count_keep = int((sample_variant_remain & self.is_keep).sum())
+        count_delete = int((sample_variant_remain & self.is_delete).sum())
+        return count_keep, count_delete
+
+    def count_keep_delete_array(self, cutoff_name, cutoff_lst, lfn_ni_cutoff, lfn_nik_cutoff, lfn_njk_cutoff,
+                                lfn_nijk_cutoff, min_replicate_number):
+        """Returns count_keep and count_delete of count_keep_delete for each value of the cutoff_name cutoff in
+        cutoff_lst, with the other cutoffs fixed. The cost does not depend on the length of cutoff_lst:
+        each run-marker-sample-variant group remains for the cutoffs below a threshold, that is computed
+        once from the sorted values of its occurrences
+
+        :param cutoff_name: 'lfn_ni_cutoff', 'lfn_nik_cutoff' or 'lfn_nijk_cutoff'
+        :param cutoff_lst: values of the cutoff_name cutoff
+        :return: tuple of two numpy arrays of int aligned with cutoff_lst
+        """
+        cutoff_dic = {'lfn_ni_cutoff': lfn_ni_cutoff, 'lfn_nik_cutoff': lfn_nik_cutoff,
+                      'lfn_nijk_cutoff': lfn_nijk_cutoff}
+        if lfn_nik_cutoff is None:  # optimize lfn variant
+            lfn_denominator, lfn_cutoff_name = 'N_i', 'lfn_ni_cutoff'
+        else:  # optimize lfn variant replicate
+            lfn_denominator, lfn_cutoff_name = 'N_ik', 'lfn_nik_cutoff'
+
+        # Rows deleted by the fixed cutoffs
+        row_delete = (self.read_count == 0) | (self.get_lfn_ratio('N_jk') <= lfn_njk_cutoff)
+        if cutoff_name == 'lfn_nijk_cutoff':
+            # Rows pass if cutoff <= read_count
+            row_value = self.read_count.astype('float64')
+            row_delete |= self.get_lfn_ratio(lfn_denominator) <= cutoff_dic[lfn_cutoff_name]
+            side = 'left'
+        else:
+            # Rows pass if cutoff < N_ijk/N_i or N_ijk/N_ik
+            row_value = self.get_lfn_ratio(lfn_denominator).copy()
+            row_delete |= self.read_count < lfn_nijk_cutoff
+            side = 'right'
+        row_value[row_delete] = -numpy.inf
+
+        # An occurrence passes the cutoff if all its rows pass
+        occurrence_value = numpy.full(self.occurrence_count, numpy.inf)
+        numpy.minimum.at(occurrence_value, self.occurrence_code, row_value)
+        row_value = occurrence_value[self.occurrence_code]
+
+        # A group remains if its min_replicate_number-th highest row passes the cutoff
+        replicate_rank = max(int(numpy.ceil(min_replicate_number)), 1)
+        order = numpy.lexsort((-row_value, self.sample_variant_code))
+        sorted_code = self.sample_variant_code[order]
+        group_start = numpy.searchsorted(sorted_code, sorted_code, side='left')
+        is_rank = (numpy.arange(order.shape[0]) - group_start) == (replicate_rank - 1)
+        sample_variant_value = numpy.full(self.sample_variant_count, -numpy.inf)
+        sample_variant_value[sorted_code[is_rank]] = row_value[order][is_rank]
+
+        cutoff_array = numpy.asarray(cutoff_lst, dtype='float64')
+        count_keep_delete_lst = []
+        for is_known in [self.is_keep, self.is_delete]:
+            known_value = numpy.sort(sample_variant_value[is_known])
+            count_keep_delete_lst.append(
+                known_value.shape[0] - numpy.searchsorted(known_value, cutoff_array, side=side))
+        return count_keep_delete_lst[0], count_keep_delete_lst[1]
@@ -3,6 +3,7 @@ import multiprocessing
 import os
 import pandas
 import pathlib
+import tempfile
 
 from vtam.utils.PathManager import PathManager
 from vtam.utils.RunnerVSearch import RunnerVSearch
@@ -23,29 +24,29 @@ class RunnerFilterPCRerror(object):
 
         :param variant_expected_df: DataFrame (id, sequence) with expected variants
         :param variant_unexpected_df: DataFrame (id, sequence) with unexpected variants
-        :param variant_read_count_df: DataFrame (run_id, marker_id, sample_id, replicate, variant_id, read_count)
+        :param variant_read_count_df: DataFrame (run_id, marker_id, sample_id, replicate, variant_id, read_count).
+            It can have several samples: the variant pairs are aligned once and joined to the N_ij of each sample
         """
         self.__variant_expected_df = variant_expected_df
         self.__variant_unexpected_df = variant_unexpected_df
         self.__variant_read_count_df = variant_read_count_df
-        self.__tmp_dir = os.path.join(PathManager.instance().get_tempdir(), self.__class__.__name__)
-        pathlib.Path(self.__tmp_dir).mkdir(parents=True, exist_ok=True)
+        self.__vsearch_alignement_df = None
 
     def get_variant_read_count_delete_df(self, pcr_error_var_prop):
 
         variant_unexpected_to_expected_ratio_df = self.get_variant_unexpected_to_expected_ratio_df()
 
+        # Run-marker-sample-variants of the unexpected variants below the ratio
+        key_list = ['run_id', 'marker_id', 'sample_id', 'variant_id']
+        variant_delete_df = variant_unexpected_to_expected_ratio_df.loc[
+            variant_unexpected_to_expected_ratio_df.N_ij_unexpected_to_expected_ratio < pcr_error_var_prop,
+            ['run_id', 'marker_id', 'sample_id', 'variant_id_unexpected']]
+        variant_delete_df.columns = key_list
+
         # Initiates filter_output_df
         filter_output_df = self.__variant_read_count_df.copy()
-        filter_output_df['filter_delete'] = False
-
-        for row in variant_unexpected_to_expected_ratio_df.itertuples():
-            if float(getattr(row, 'N_ij_unexpected_to_expected_ratio')
-                     ) < pcr_error_var_prop:
-                filter_output_df.loc[(filter_output_df['run_id'] == row.run_id)
-                                     & (filter_output_df['marker_id'] == row.marker_id)
-                                     & (filter_output_df['sample_id'] == row.sample_id)
-                                     & (filter_output_df['variant_id'] == row.variant_id_unexpected), 'filter_delete'] = True
+        filter_output_df['filter_delete'] = pandas.MultiIndex.from_frame(filter_output_df[key_list]).isin(
+            pandas.MultiIndex.from_frame(variant_delete_df))
         return filter_output_df
 
     def get_vsearch_alignement_df(self):
@@ -55,6 +56,9 @@ class RunnerFilterPCRerror(object):
         Returns: Pandas DataFrame with output of vsearch and these columnts: query, target, alnlen, ids, mism, gaps
         """
 
+        if self.__vsearch_alignement_df is not None:  # vsearch already run for these variants
+            return self.__vsearch_alignement_df.copy()
+
         # length of smallest sequence
         length_min = min(
             self.__variant_expected_df.sequence.apply(len).tolist() +
@@ -62,56 +66,62 @@ class RunnerFilterPCRerror(object):
         # calcul identity
         identity = math.floor((length_min - 1) / length_min * 100) / 100
 
-        #
-        ###################################################################
-        # 5-1. Make a fasta_path file with all variants of the sample or replicate
-        ###################################################################
-
-        variant_expected_fasta_path = os.path.join(
-            self.__tmp_dir, '{}.fasta'.format("variant_expected"))
-        variant_expected_df_utils_obj = DataframeVariant(
-            variant_df=self.__variant_expected_df)
-        variant_expected_df_utils_obj.to_fasta(
-            fasta_path=variant_expected_fasta_path)
-
-        variant_unexpected_fasta_path = os.path.join(
-            self.__tmp_dir, '{}.fasta'.format("variant_unexpected"))
-        variant_unexpected_df_utils_obj = DataframeVariant(
-            variant_df=self.__variant_unexpected_df)
-        variant_unexpected_df_utils_obj.to_fasta(
-            fasta_path=variant_unexpected_fasta_path)
-
-        #
-        # Create object and run_name vsearch
-        if os.getenv('VTAM_THREADS') is None:
-            num_threads = multiprocessing.cpu_count()
-        else:
-            num_threads = int(os.getenv('VTAM_THREADS'))
-        vsearch_pcr_error_tsv = os.path.join(
-            self.__tmp_dir, '{}.tsv'.format("vsearch_pcr_error"))
-        vsearch_parameters = {
-            'db': variant_expected_fasta_path,
-            'usearch_global': variant_unexpected_fasta_path,
-            'id': str(identity),
-            'maxrejects': 0,
-            'maxaccepts': 0,
-            'userout': vsearch_pcr_error_tsv,
-            'userfields': "query+target+alnlen+ids+mism+gaps",
-            'threads': num_threads,
-        }
-        vsearch_cluster = RunnerVSearch(parameters=vsearch_parameters)
-        vsearch_cluster.run()
-
-        column_names = [
-            'variant_id_unexpected',
-            'variant_id_expected',
-            'alnlen',
-            'ids',
-            'mism',
-            'gaps']
-        vsearch_alignement_df = pandas.read_csv(
-            vsearch_pcr_error_tsv, sep='\t', names=column_names)
-        return vsearch_alignement_df
+        # Directory of this call, so that several objects can run vsearch in parallel. It is removed with the files
+        pathlib.Path(PathManager.instance().get_tempdir()).mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix='{}_'.format(self.__class__.__name__),
+                                         dir=PathManager.instance().get_tempdir()) as tmp_dir:
+
+            #
+            ###################################################################
+            # 5-1. Make a fasta_path file with all variants of the sample or replicate
+            ###################################################################
+
+            variant_expected_fasta_path = os.path.join(
+                tmp_dir, '{}.fasta'.format("variant_expected"))
+            variant_expected_df_utils_obj = DataframeVariant(
+                variant_df=self.__variant_expected_df)
+            variant_expected_df_utils_obj.to_fasta(
+                fasta_path=variant_expected_fasta_path)
+
+            variant_unexpected_fasta_path = os.path.join(
+                tmp_dir, '{}.fasta'.format("variant_unexpected"))
+            variant_unexpected_df_utils_obj = DataframeVariant(
+                variant_df=self.__variant_unexpected_df)
+            variant_unexpected_df_utils_obj.to_fasta(
+                fasta_path=variant_unexpected_fasta_path)
+
+            #
+            # Create object and run_name vsearch
+            if os.getenv('VTAM_THREADS') is None:
+                num_threads = multiprocessing.cpu_count()
+            else:
+                num_threads = int(os.getenv('VTAM_THREADS'))
+            vsearch_pcr_error_tsv = os.path.join(
+                tmp_dir, '{}.tsv'.format("vsearch_pcr_error"))
+            vsearch_parameters = {
+                'db': variant_expected_fasta_path,
+                'usearch_global': variant_unexpected_fasta_path,
+                'id': str(identity),
+                'maxrejects': 0,
+                'maxaccepts': 0,
+                'userout': vsearch_pcr_error_tsv,
+                'userfields': "query+target+alnlen+ids+mism+gaps",
+                'threads': num_threads,
+            }
+            vsearch_cluster = RunnerVSearch(parameters=vsearch_parameters)
+            vsearch_cluster.run()
+
+            column_names = [
+                'variant_id_unexpected',
+                'variant_id_expected',
+                'alnlen',
+                'ids',
+                'mism',
+                'gaps']
+            vsearch_alignement_df = pandas.read_csv(
+                vsearch_pcr_error_tsv, sep='\t', names=column_names)
+        self.__vsearch_alignement_df = vsearch_alignement_df
+        return vsearch_alignement_df.copy()
 
     def get_variant_unexpected_to_expected_ratio_df(self):
         """Creates a DF with these columns
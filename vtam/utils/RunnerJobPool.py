@@ -0,0 +1,39 @@
+import concurrent.futures
+import math
+
+
+class RunnerJobPool(object):
+    """Runs independent jobs concurrently and splits a thread budget among them"""
+
+    def __init__(self, job_count, num_threads):
+        """
+        Computes how many jobs run at once and how many threads each job receives
+
+        :param job_count: Number of jobs to run
+        :param num_threads: Total number of threads shared by all jobs
+        :return: void
+        """
+        self.job_count = int(job_count)
+        self.num_threads = max(1, int(num_threads))
+
+        # Number of jobs running at the same time
+        self.num_workers = max(1, min(self.job_count, self.num_threads))
+        # Threads given to each of these jobs
+        self.threads_per_job = max(1, math.floor(self.num_threads / self.num_workers))
+
+    def run(self, func, args_list):
+        """Runs func on each element of args_list
+
+        Jobs are expected to spend their time in external programs (vsearch, cutadapt, ...),
+        so a pool of threads launching the subprocesses is enough to use the processors
+
+        :param func: Function called with one element of args_list
+        :param args_list: List of arguments, one per job
+        :return: list with the results of func in the order of args_list
+        """
+        if self.num_workers == 1:
+            return [func(args) for args in args_list]
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            # map keeps the order of args_list and raises the first job exception
+            return list(executor.map(func, args_list))
@@ -18,7 +18,8 @@ class RunnerOptimizeLFNreadCountAndVariant:
         self.known_occurrences_df = known_occurrences_df
 
     def get_optimize_df(self, lfn_ni_cutoff, lfn_nik_cutoff, lfn_njk_cutoff, lfn_nijk_cutoff,
-                        min_replicate_number):
+                        min_replicate_number, lfn_nijk_cutoff_lst_size=lfn_nijk_cutoff_lst_size,
+                        lfn_ni_njk_cutoff_lst_size=lfn_ni_njk_cutoff_lst_size):
 
         ############################################################################################
         #
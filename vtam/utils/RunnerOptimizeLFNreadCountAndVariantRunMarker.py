@@ -2,8 +2,7 @@ import pandas
 import numpy
 from vtam.utils.VTAMexception import VTAMexception
 
-from vtam.utils.RunnerFilterLFNreplicateRemain import RunnerFilterLFNreplicateRemain
-from vtam.utils.DataframeVariantReadCountLike import DataframeVariantReadCountLike
+from vtam.utils.RunnerFilterLFNreplicateRemainGrid import RunnerFilterLFNreplicateRemainGrid
 
 
 class RunnerOptimizeLFNreadCountAndVariantRunMarker:
@@ -28,10 +27,24 @@ class RunnerOptimizeLFNreadCountAndVariantRunMarker:
         self.lfn_nijk_cutoff_lst = lfn_nijk_cutoff_lst
         self.lfn_ni_nik_cutoff_lst = lfn_ni_nik_cutoff_lst
 
+        # LFN ratios and known occurrences computed once for all the cutoffs of the grid
+        self._filter_lfn_replicate_remain_grid = None
+
+    @property
+    def filter_lfn_replicate_remain_grid(self):
+
+        if self._filter_lfn_replicate_remain_grid is None:
+            self._filter_lfn_replicate_remain_grid = RunnerFilterLFNreplicateRemainGrid(
+                nijk_df=self.nijk_df, known_occurrences_df=self.known_occurrences_df)
+        return self._filter_lfn_replicate_remain_grid
+
     @classmethod
     def get_lfn_nijk_cutoff_lst(cls, start: object, stop: object, nb_points: object) -> object:
 
-        return [*range(start, stop, round(int((stop - start + 1) / nb_points), -1))]
+        # Step rounded to ten, except for grids too fine for it
+        step = int((stop - start + 1) / nb_points)
+        step = round(step, -1) or max(step, 1)
+        return [*range(start, stop, step)]
 
     @classmethod
     def get_lfn_ni_nik_cutoff_lst(cls, start, stop, nb_points):
@@ -48,104 +61,82 @@ class RunnerOptimizeLFNreadCountAndVariantRunMarker:
         count_delete_max = len(self.known_occurrences_df.loc[self.known_occurrences_df.action == 'delete'].variant_id.unique())
         return count_delete_max
 
-    def get_lst_one_par_lfn_nijk_cutoff(self, lfn_ni_cutoff, lfn_nik_cutoff, lfn_njk_cutoff, lfn_nijk_cutoff, min_replicate_number):
+    @staticmethod
+    def get_lfn_ni_nik_cutoff_name(lfn_nik_cutoff):
+        """Returns the name of the cutoff optimized together with lfn_nijk_cutoff"""
 
-        """Loops through self.lfn_nijk_cutoff_lst and keeps only values while count_keep < count_keep_max"""
-
-        out_lfn_nijk_cutoff_lst = []
+        if lfn_nik_cutoff is None:  # optimize lfn variant
+            return 'lfn_ni_cutoff'
+        return 'lfn_nik_cutoff'  # optimize lfn variant replicate
 
-        count_keep_max = self.get_count_keep_max()
+    @staticmethod
+    def get_boundary(count_keep_array, count_keep_max):
+        """Returns the number of leading cutoffs with count_keep >= count_keep_max, that is the position where
+        a linear scan stops"""
 
-        for lfn_nijk_cutoff_item in self.lfn_nijk_cutoff_lst:
+        below_max_array = numpy.flatnonzero(numpy.asarray(count_keep_array) < count_keep_max)
+        if below_max_array.shape[0] == 0:
+            return len(count_keep_array)
+        return int(below_max_array[0])
 
-            count_keep, count_delete = RunnerFilterLFNreplicateRemain(
-                nijk_df=self.nijk_df, lfn_ni_cutoff=lfn_ni_cutoff, lfn_nik_cutoff=lfn_nik_cutoff, lfn_njk_cutoff=lfn_njk_cutoff, lfn_nijk_cutoff=lfn_nijk_cutoff_item,
-                           min_replicate_number=min_replicate_number)\
-                .count_keep_delete(known_occurrences_df=self.known_occurrences_df)
+    def get_lst_one_par_lfn_nijk_cutoff(self, lfn_ni_cutoff, lfn_nik_cutoff, lfn_njk_cutoff, lfn_nijk_cutoff, min_replicate_number):
 
-            if count_keep < count_keep_max:
-                break  # stops when count_keep decreases below count_keep_max
+        """Keeps the values of self.lfn_nijk_cutoff_lst before the first one with count_keep < count_keep_max.
+        The counts of all values are computed at once from the sorted values of the known occurrences"""
 
-            out_lfn_nijk_cutoff_lst.append(lfn_nijk_cutoff_item)
+        count_keep_array, count_delete_array = self.filter_lfn_replicate_remain_grid.count_keep_delete_array(
+            cutoff_name='lfn_nijk_cutoff', cutoff_lst=self.lfn_nijk_cutoff_lst,
+            lfn_ni_cutoff=lfn_ni_cutoff, lfn_nik_cutoff=lfn_nik_cutoff, lfn_njk_cutoff=lfn_njk_cutoff,
+            lfn_nijk_cutoff=lfn_nijk_cutoff, min_replicate_number=min_replicate_number)
+        boundary = self.get_boundary(count_keep_array, self.get_count_keep_max())
 
-        return out_lfn_nijk_cutoff_lst
+        return list(self.lfn_nijk_cutoff_lst[:boundary])
 
     def get_lst_one_par_lfn_ni_nik_cutoff(self, lfn_ni_cutoff, lfn_nik_cutoff, lfn_njk_cutoff, lfn_nijk_cutoff, min_replicate_number):
 
-        """Loops between default lfn_nijk_cutoff and vtam.utils.constants.lfn_nijk_cutoff_global_max to obtain count_keep_max"""
-
-        out_lfn_ni_nik_cutoff_lst = []
-
-        # lfn_ni_nik_cutoff_lst = self.get_lfn_ni_nik_cutoff_lst(start=lfn_ni_nik_cutoff, stop=lfn_ni_njk_cutoff_global_max, nb_points=lfn_ni_njk_cutoff_lst_size)
-        count_keep_max = self.get_count_keep_max()
-        for lfn_ni_nik_cutoff_item in self.lfn_ni_nik_cutoff_lst:
-
-            if lfn_nik_cutoff is None:
-                count_keep, count_delete = RunnerFilterLFNreplicateRemain(
-                    nijk_df=self.nijk_df, lfn_ni_cutoff=lfn_ni_nik_cutoff_item, lfn_nik_cutoff=lfn_nik_cutoff, lfn_njk_cutoff=lfn_njk_cutoff, lfn_nijk_cutoff=lfn_nijk_cutoff,
-                               min_replicate_number=min_replicate_number)\
-                    .count_keep_delete(known_occurrences_df=self.known_occurrences_df)
-            else:
-                count_keep, count_delete = RunnerFilterLFNreplicateRemain(
-                    nijk_df=self.nijk_df, lfn_ni_cutoff=lfn_ni_cutoff, lfn_nik_cutoff=lfn_ni_nik_cutoff_item, lfn_njk_cutoff=lfn_njk_cutoff, lfn_nijk_cutoff=lfn_nijk_cutoff,
-                               min_replicate_number=min_replicate_number)\
-                    .count_keep_delete(known_occurrences_df=self.known_occurrences_df)
-
-
-            if count_keep < count_keep_max:
-                break  # stops when count_keep decreases below count_keep_max
+        """Keeps the values of self.lfn_ni_nik_cutoff_lst before the first one with count_keep < count_keep_max.
+        The counts of all values are computed at once from the sorted ratios of the known occurrences"""
 
-            out_lfn_ni_nik_cutoff_lst.append(lfn_ni_nik_cutoff_item)
+        count_keep_array, count_delete_array = self.filter_lfn_replicate_remain_grid.count_keep_delete_array(
+            cutoff_name=self.get_lfn_ni_nik_cutoff_name(lfn_nik_cutoff), cutoff_lst=self.lfn_ni_nik_cutoff_lst,
+            lfn_ni_cutoff=lfn_ni_cutoff, lfn_nik_cutoff=lfn_nik_cutoff, lfn_njk_cutoff=lfn_njk_cutoff,
+            lfn_nijk_cutoff=lfn_nijk_cutoff, min_replicate_number=min_replicate_number)
+        boundary = self.get_boundary(count_keep_array, self.get_count_keep_max())
 
-        return out_lfn_ni_nik_cutoff_lst
+        return list(self.lfn_ni_nik_cutoff_lst[:boundary])
 
     def get_df_optim_lfn_readcount_variant_replicate_cutoff(self, lfn_ni_cutoff, lfn_nik_cutoff, lfn_njk_cutoff, lfn_nijk_cutoff, min_replicate_number):
 
         """Two parameter loop for lfn_nijk_cutoff and lfn_ni_cutoff/lfn_nik_cutoff to get keep_nb, delete_nb with the two parameters"""
 
         out_two_pars_lst = []
-        # lfn_ni_nik_cutoff = lfn_ni_cutoff  # current max
-        # if not (lfn_nik_cutoff is None):
-        #     lfn_ni_nik_cutoff = lfn_nik_cutoff  # current max
 
         lfn_nijk_cutoff_lst = self.get_lst_one_par_lfn_nijk_cutoff(lfn_ni_cutoff, lfn_nik_cutoff, lfn_njk_cutoff, lfn_nijk_cutoff, min_replicate_number)
         lfn_ni_nik_cutoff_lst = self.get_lst_one_par_lfn_ni_nik_cutoff(lfn_ni_cutoff, lfn_nik_cutoff, lfn_njk_cutoff, lfn_nijk_cutoff, min_replicate_number)
+        lfn_ni_nik_cutoff_name = self.get_lfn_ni_nik_cutoff_name(lfn_nik_cutoff)
 
         count_keep_max = self.get_count_keep_max()
         # loop over lfn_nijk_cutoff
         for lfn_nijk_cutoff_item in lfn_nijk_cutoff_lst:
-            # loop over lfn_ni_nik_cutoff: 0.001, 0.002, ...
-            for lfn_ni_nik_cutoff_item in lfn_ni_nik_cutoff_lst:
-
-                if lfn_nik_cutoff is None:
-                    count_keep, count_delete = RunnerFilterLFNreplicateRemain(
-                        nijk_df=self.nijk_df, lfn_ni_cutoff=lfn_ni_nik_cutoff_item,
-                        lfn_nik_cutoff=lfn_nik_cutoff, lfn_njk_cutoff=lfn_njk_cutoff,
-                        lfn_nijk_cutoff=lfn_nijk_cutoff_item,
-                        min_replicate_number=min_replicate_number) \
-                        .count_keep_delete(known_occurrences_df=self.known_occurrences_df)
-                else:
-                    count_keep, count_delete = RunnerFilterLFNreplicateRemain(
-                        nijk_df=self.nijk_df, lfn_ni_cutoff=lfn_ni_cutoff,
-                        lfn_nik_cutoff=lfn_ni_nik_cutoff_item, lfn_njk_cutoff=lfn_njk_cutoff,
-                        lfn_nijk_cutoff=lfn_nijk_cutoff_item,
-                        min_replicate_number=min_replicate_number) \
-                        .count_keep_delete(known_occurrences_df=self.known_occurrences_df)
-
-                ################################################################################
-                #
-                # Store results
-                #
-                ################################################################################
-
-                if count_keep >= count_keep_max:  # Store results if count_keep maximal
-                    out_lfn_variant_row_dic = {
-                        "lfn_ni_nik_cutoff": lfn_ni_nik_cutoff_item,
-                        "lfn_nijk_cutoff": lfn_nijk_cutoff_item,
-                        "occurrence_nb_keep": count_keep, "occurrence_nb_delete": count_delete}
-                    out_two_pars_lst.append(out_lfn_variant_row_dic)
-                else:
-                    break  # stops when count_keep decreases below count_keep_max
+            # all lfn_ni_nik_cutoff values: 0.001, 0.002, ... at once
+            count_keep_array, count_delete_array = self.filter_lfn_replicate_remain_grid.count_keep_delete_array(
+                cutoff_name=lfn_ni_nik_cutoff_name, cutoff_lst=lfn_ni_nik_cutoff_lst,
+                lfn_ni_cutoff=lfn_ni_cutoff, lfn_nik_cutoff=lfn_nik_cutoff, lfn_njk_cutoff=lfn_njk_cutoff,
+                lfn_nijk_cutoff=lfn_nijk_cutoff_item, min_replicate_number=min_replicate_number)
+
+            ################################################################################
+            #
+            # Store results while count_keep is maximal
+            #
+            ################################################################################
+
+            for i in range(self.get_boundary(count_keep_array, count_keep_max)):
+                out_lfn_variant_row_dic = {
+                    "lfn_ni_nik_cutoff": lfn_ni_nik_cutoff_lst[i],
+                    "lfn_nijk_cutoff": lfn_nijk_cutoff_item,
+                    "occurrence_nb_keep": int(count_keep_array[i]),
+                    "occurrence_nb_delete": int(count_delete_array[i])}
+                out_two_pars_lst.append(out_lfn_variant_row_dic)
 
         out_two_pars_df = pandas.DataFrame(out_two_pars_lst)
         column_names = ['occurrence_nb_keep', 'occurrence_nb_delete', 'lfn_nijk_cutoff',
@@ -167,7 +158,7 @@ class RunnerOptimizeLFNreadCountAndVariantRunMarker:
         nijk_run_marker_delete_df = self.nijk_df.merge(
             delete_run_marker_sample_variant_df, on=['run_id', 'marker_id', 'sample_id',
                                                         'variant_id'])
-        nijk_df_i_obj = DataframeVariantReadCountLike(self.nijk_df)
+        nijk_df_i_obj = self.filter_lfn_replicate_remain_grid.nijk_df_obj
 
         if lfn_nik_cutoff is None:  # optimize lfn variant
             N_i_df = nijk_df_i_obj.get_N_i_df()
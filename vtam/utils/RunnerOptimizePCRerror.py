@@ -1,3 +1,5 @@
+import multiprocessing
+import os
 import pandas
 
 from vtam.models.Sample import Sample
@@ -7,6 +9,11 @@ from vtam.utils.RunnerFilterPCRerror import RunnerFilterPCRerror
 from vtam.utils.NameIdConverter import NameIdConverter
 
 
+def _init_worker(num_threads):
+    # vsearch threads of each worker process
+    os.environ['VTAM_THREADS'] = str(num_threads)
+
+
 class RunnerOptimizePCRerror:
     """Algorithm:
 
@@ -41,6 +48,8 @@ class RunnerOptimizePCRerror:
 
         known_occurrences_run_marker_sample_df = self.known_occurrences_df[
             ['run_id', 'marker_id', 'sample_id']].drop_duplicates()
+        # Variants of the run-marker-samples, read from the database in this process
+        pcr_error_job_list = []
         for row in known_occurrences_run_marker_sample_df.itertuples():
 
             run_id = row.run_id
@@ -69,23 +78,46 @@ class RunnerOptimizePCRerror:
 
             variant_unexpected_df = pandas.DataFrame({'sequence': sequence_unexpected}, index=variant_unexpected)
 
-            ########################################################################################
-            #
-            # Run vsearch and get alignement variant_read_count_input_df
-            #
-            ########################################################################################
+            pcr_error_job_list.append((variant_expected_df, variant_unexpected_df, variant_read_count_per_sample_df))
 
-            filter_pcr_error_runner = RunnerFilterPCRerror(
-                variant_expected_df=variant_expected_df, variant_unexpected_df=variant_unexpected_df,
-                variant_read_count_df=variant_read_count_per_sample_df)
-
-            pcr_error_df = filter_pcr_error_runner.get_variant_unexpected_to_expected_ratio_df()
+        ############################################################################################
+        #
+        # Run vsearch and get alignement variant_read_count_input_df of the run-marker-samples in parallel.
+        # The threads are shared between the vsearch processes
+        #
+        ############################################################################################
 
+        if os.getenv('VTAM_THREADS') is None:
+            num_threads = multiprocessing.cpu_count()
+        else:
+            num_threads = int(os.getenv('VTAM_THREADS'))
+        num_processes = max(1, min(num_threads, len(pcr_error_job_list)))
+        if num_processes > 1:
+            with multiprocessing.Pool(processes=num_processes, initializer=_init_worker,
+                                      initargs=(max(1, num_threads // num_processes),)) as pool:
+                pcr_error_df_list = pool.map(
+                    RunnerOptimizePCRerror.get_pcr_error_df, pcr_error_job_list, chunksize=1)
+        else:
+            pcr_error_df_list = [RunnerOptimizePCRerror.get_pcr_error_df(job) for job in pcr_error_job_list]
+
+        for pcr_error_df in pcr_error_df_list:
             optimize_df = pandas.concat(
                 [optimize_df, pcr_error_df], axis=0)
 
         return optimize_df
 
+    @staticmethod
+    def get_pcr_error_df(pcr_error_job):
+        """Returns the unexpected to expected ratio DataFrame of a run-marker-sample. Run in the worker processes
+
+        :param pcr_error_job: tuple with variant_expected_df, variant_unexpected_df and variant_read_count_df
+        :return: DataFrame of RunnerFilterPCRerror.get_variant_unexpected_to_expected_ratio_df
+        """
+        variant_expected_df, variant_unexpected_df, variant_read_count_df = pcr_error_job
+        filter_pcr_error_runner = RunnerFilterPCRerror(
+            variant_expected_df=variant_expected_df, variant_unexpected_df=variant_unexpected_df,
+            variant_read_count_df=variant_read_count_df)
+        return filter_pcr_error_runner.get_variant_unexpected_to_expected_ratio_df()
 
     def to_tsv(self, optimize_path, engine):
 
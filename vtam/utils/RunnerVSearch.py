@@ -1,7 +1,9 @@
 import shlex
 import subprocess
 import sys
+import tempfile
 
+from vtam.utils.FileCompression import FileCompression
 from vtam.utils.Logger import Logger
 
 
@@ -46,3 +48,30 @@ class RunnerVSearch(object):
                                     stderr=subprocess.STDOUT)
 
         Logger.instance().info(run_result.stdout.decode())
+
+    def run_compressed(self, out_param, compressed_path):
+        """Run the vsearch and pipe the output of the out_param argument (eg. fastaout) into a
+        compressor, so that only the compressed file is written to disk
+
+        :param out_param: vsearch argument of the output to compress
+        :param compressed_path: Path of the output file ending with .gz or .bz2
+        :return: void
+        """
+        self.parameters[out_param] = '/dev/stdout'
+        cmd = self.create_command()
+        num_threads = self.parameters.get('threads', 1)
+
+        # vsearch messages are written to a temporary file to leave stdout to the output
+        with tempfile.TemporaryFile() as ferr:
+            process = subprocess.Popen(args=shlex.split(cmd), stdout=subprocess.PIPE, stderr=ferr)
+            try:
+                FileCompression.stream_compression(fin=process.stdout,
+                                                   path_to_compressed_file=compressed_path,
+                                                   num_threads=num_threads)
+            finally:
+                process.stdout.close()
+                process.wait()
+            ferr.seek(0)
+            Logger.instance().info(ferr.read().decode())
+
+        self.parameters[out_param] = compressed_path
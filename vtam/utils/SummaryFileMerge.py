@@ -0,0 +1,23 @@
+class SummaryFileMerge(object):
+    """Writes the summary file of the merge command"""
+
+    def __init__(self, params_dic, stats_df):
+        """
+        :param params_dic: Dictionary with the vsearch merge parameters
+        :param stats_df: DataFrame with columns: FastqFwd, FastqRev, NbReadsFwd, NbReadsRev, FastaMerged, NbMergedReads
+        :return: void
+        """
+        self.params_dic = params_dic
+        self.stats_df = stats_df
+
+    def write(self, summary_path):
+        """Writes the merge parameters as '#' comment lines followed by the statistics in TSV format
+
+        :param summary_path: Path to the summary file
+        :return: void
+        """
+
+        with open(summary_path, 'w') as fout:
+            for param_name in self.params_dic:
+                fout.write("# {}: {}\n".format(param_name, self.params_dic[param_name]))
+            self.stats_df.to_csv(fout, sep="\t", header=True, index=False)
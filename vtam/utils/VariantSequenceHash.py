@@ -0,0 +1,76 @@
+import hashlib
+
+import sqlalchemy
+
+from vtam.models.Variant import Variant
+
+
+class VariantSequenceHash(object):
+    """64-bit hash of the variant sequences, stored in the indexed column Variant.sequence_hash.
+
+    Sequences are looked up through the small integer index and the sequences of the selected rows
+    are then compared, so that hash collisions do not give wrong ids."""
+
+    @staticmethod
+    def get_hash(sequence):
+        """Returns the 64-bit signed integer hash of an uppercase sequence, stable across processes"""
+
+        return int.from_bytes(hashlib.blake2b(sequence.encode(), digest_size=8).digest(), 'big', signed=True)
+
+    @staticmethod
+    def upgrade(conn):
+        """Adds the sequence_hash column and index to Variant tables created by previous VTAM versions
+        and fills the missing hashes
+
+        :param conn: SQLAlchemy connection
+        :return: void
+        """
+        variant_table = Variant.__table__
+        column_name_list = [row[1] for row in conn.execute(sqlalchemy.text("PRAGMA table_info(Variant)"))]
+        if len(column_name_list) == 0:  # No Variant table
+            return
+        if 'sequence_hash' not in column_name_list:
+            conn.execute(sqlalchemy.text("ALTER TABLE Variant ADD COLUMN sequence_hash BIGINT"))
+            conn.execute(sqlalchemy.text(
+                "CREATE INDEX IF NOT EXISTS ix_Variant_sequence_hash ON Variant (sequence_hash)"))
+
+        stmt_select = sqlalchemy.select([variant_table.c.id, variant_table.c.sequence])\
+            .where(variant_table.c.sequence_hash.is_(None))
+        record_list = [{'variant_id': row[0], 'sequence_hash': VariantSequenceHash.get_hash(row[1])}
+                       for row in conn.execute(stmt_select)]
+        if len(record_list) > 0:
+            stmt_update = variant_table.update()\
+                .where(variant_table.c.id == sqlalchemy.bindparam('variant_id'))\
+                .values(sequence_hash=sqlalchemy.bindparam('sequence_hash'))
+            conn.execute(stmt_update, record_list)
+
+    @staticmethod
+    def select_id_dic(conn, variant_sequence_list):
+        """Selects the ids of the sequences that are already in the Variant table. The hashes are
+        loaded into a temporary table that is joined once to the Variant table.
+
+        :param conn: SQLAlchemy connection. Temporary tables are visible only in this connection
+        :param variant_sequence_list: list of variant sequences
+        :return: dictionary with the sequences found in Variant as keys and their ids as values
+        """
+        VariantSequenceHash.upgrade(conn)
+
+        variant_sequence_set = set(variant_sequence_list)
+        variant_staging_table = sqlalchemy.Table(
+            'VariantSequenceHashStaging', sqlalchemy.MetaData(),
+            sqlalchemy.Column('sequence_hash', sqlalchemy.BigInteger, primary_key=True), prefixes=['TEMPORARY'])
+        variant_staging_table.create(conn, checkfirst=True)
+        try:
+            conn.execute(variant_staging_table.delete())
+            sequence_hash_set = {VariantSequenceHash.get_hash(sequence) for sequence in variant_sequence_set}
+            if len(sequence_hash_set) > 0:
+                conn.execute(variant_staging_table.insert(),
+                             [{'sequence_hash': sequence_hash} for sequence_hash in sequence_hash_set])
+            variant_table = Variant.__table__
+            stmt_select = sqlalchemy.select([variant_table.c.sequence, variant_table.c.id]).select_from(
+                variant_table.join(variant_staging_table,
+                                   variant_table.c.sequence_hash == variant_staging_table.c.sequence_hash))
+            # Sequences are compared because different sequences can have the same hash
+            return {row[0]: row[1] for row in conn.execute(stmt_select) if row[0] in variant_sequence_set}
+        finally:
+            variant_staging_table.drop(conn)
@@ -35,6 +35,13 @@ cutadapt_maximum_length: 500 # -M in cutadapt
 # This parameter sets the minimal number of reads of a variant in the whole run_name
 global_read_count_cutoff: 2
 
+################################################################################
+# Parameters of the SQLite database in the "filter" and "optimize" commands
+# For a description of these parameters see the PRAGMA statements of SQLite
+sqlite_journal_mode: DELETE # DELETE, TRUNCATE, PERSIST, MEMORY, WAL or OFF
+sqlite_synchronous: NORMAL # OFF, NORMAL, FULL or EXTRA
+sqlite_cache_size: -262144 # Number of pages if positive or KiB if negative
+
 ################################################################################
 # Parameters of the "FilterLFN" filter in the "filter" command
 # These parameters set the cutoffs for the low frequency noise (LFN) filters
@@ -47,6 +54,9 @@ lfn_variant_replicate_cutoff: 0.001
 lfn_sample_replicate_cutoff: 0.001
 # Occurrence is deleted if N_ijk < lfn_ lfn_read_count_cutoff
 lfn_read_count_cutoff: 10
+# Storage of the FilterLFN table: 'full' stores one row per occurrence and LFN filter, 'bitmask'
+# stores one row per occurrence with filter_id 8 and the bitmask of the filters that deleted it
+filter_lfn_storage: full
 
 ################################################################################
 # Parameters of the "FilterMinReplicateNumber" filter in the "filter" command
@@ -88,6 +98,14 @@ genetic_code: 5
 # Cluster identity value to clusterize sequences
 cluster_identity: 0.97
 
+################################################################################
+# Parameters of the "OptimizeLFNreadCountAndLFNvariant" step in the "optimize" command
+# Number of lfn_read_count_cutoff values tested between lfn_read_count_cutoff and its maximum
+lfn_read_count_cutoff_lst_size: 10
+# Number of lfn_variant_cutoff (Or lfn_variant_replicate_cutoff) values tested between
+# lfn_variant_cutoff (Or lfn_variant_replicate_cutoff) and its maximum
+lfn_variant_cutoff_lst_size: 10
+
 ################################################################################
 # Parameters of the "taxassign" command
 # Blast parameter for the minimum query coverage
@@ -132,6 +150,15 @@ header_known_occurrences = {'run', 'marker', 'sample', 'mock', 'variant', 'actio
 header_cutoff_specific_variant_replicate = {'run', 'marker', 'variant', 'lfn_variant_replicate_cutoff'}
 header_cutoff_specific_variant = {'run', 'marker', 'variant', 'lfn_variant_cutoff'}
 
+####################################################################################################
+#
+#  Database
+#
+####################################################################################################
+
+# Number of values per IN clause of a SELECT, below the SQLite limit of 999 bound parameters
+sqlite_in_batch_size = 900
+
 ####################################################################################################
 #
 #  Tax_assign parameters_numerical_default
@@ -1,5 +1,6 @@
 import sys
 
+from vtam.utils.SqliteTuning import SqliteTuning
 from vtam.utils.RunnerFilterChimera import RunnerFilterChimera
 from vtam.utils.Logger import Logger
 from vtam.utils.FileSampleInformation import FileSampleInformation
@@ -53,6 +54,7 @@ class FilterChimera(ToolWrapper):
     def run(self):
         session = self.session
         engine = session._session().get_bind()
+        SqliteTuning.listen(engine)
 
         #######################################################################
         #
@@ -105,7 +107,8 @@ class FilterChimera(ToolWrapper):
         #######################################################################
 
         variant_df = sample_info_tsv_obj.get_variant_df(
-            variant_read_count_like_model=input_filter_pcr_error_model, engine=engine)
+            variant_read_count_like_model=input_filter_pcr_error_model, engine=engine,
+            variant_read_count_like_df=variant_read_count_df)
         filter_chimera_runner = RunnerFilterChimera(
             variant_read_count_df=variant_read_count_df)
         filter_output_chimera_df, filter_borderline_output_df = \
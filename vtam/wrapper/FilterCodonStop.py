@@ -1,3 +1,4 @@
+from vtam.utils.SqliteTuning import SqliteTuning
 from vtam.utils.RunnerFilterCodonStop import RunnerFilterCodonStop
 from vtam.utils.Logger import Logger
 from vtam.utils.FileSampleInformation import FileSampleInformation
@@ -51,6 +52,7 @@ class FilterCodonStop(ToolWrapper):
     def run(self):
         session = self.session
         engine = session._session().get_bind()
+        SqliteTuning.listen(engine)
 
         ##########################################################
         #
@@ -96,7 +98,8 @@ class FilterCodonStop(ToolWrapper):
         #######################################################################
 
         variant_df = sample_info_tsv_obj.get_variant_df(
-            variant_read_count_like_model=input_filter_indel_model, engine=engine)
+            variant_read_count_like_model=input_filter_indel_model, engine=engine,
+            variant_read_count_like_df=variant_read_count_df)
         variant_read_count_delete_df = RunnerFilterCodonStop(
             variant_read_count_df=variant_read_count_df).get_variant_read_count_delete_df(
             variant_df=variant_df,
@@ -1,3 +1,4 @@
+from vtam.utils.SqliteTuning import SqliteTuning
 from vtam.utils.RunnerFilterIndel import RunnerFilterIndel
 from vtam.utils.FileSampleInformation import FileSampleInformation
 from vtam.utils.DataframeVariantReadCountLike import DataframeVariantReadCountLike
@@ -52,6 +53,7 @@ class FilterIndel(ToolWrapper):
     def run(self):
         session = self.session
         engine = session._session().get_bind()
+        SqliteTuning.listen(engine)
 
         ##########################################################
         #
@@ -99,7 +101,8 @@ class FilterIndel(ToolWrapper):
         #######################################################################
 
         variant_df = sample_info_tsv_obj.get_variant_df(
-            variant_read_count_like_model=input_filter_renkonen_model, engine=engine)
+            variant_read_count_like_model=input_filter_renkonen_model, engine=engine,
+            variant_read_count_like_df=variant_read_count_df)
         variant_read_count_delete_df = RunnerFilterIndel(
             variant_read_count_df).get_variant_read_count_delete_df(variant_df, skip_filter_indel)
 
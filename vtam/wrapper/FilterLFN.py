@@ -1,8 +1,10 @@
 import pathlib
 
+from vtam.utils.SqliteTuning import SqliteTuning
 from vtam.utils.FileCutoffSpecific import FileCutoffSpecific
 
 from vtam.utils.RunnerFilterLFN import RunnerFilterLFN
+from vtam.utils.RunnerFilterLFN import filter_lfn_storage_list
 from vtam.utils.Logger import Logger
 from vtam.utils.FileSampleInformation import FileSampleInformation
 from vtam.utils.VTAMexception import VTAMexception
@@ -55,12 +57,14 @@ class FilterLFN(ToolWrapper):
             "lfn_variant_replicate_specific_cutoff": "str",
             "lfn_sample_replicate_cutoff": "required|float",
             "lfn_read_count_cutoff": "required|float",
+            "filter_lfn_storage": "str",
         }
 
     def run(self):
 
         session = self.session
         engine = session._session().get_bind()
+        SqliteTuning.listen(engine)
 
         ############################################################################################
 
@@ -88,6 +92,13 @@ class FilterLFN(ToolWrapper):
         lfn_variant_replicate_specific_cutoff = self.option("lfn_variant_replicate_specific_cutoff")
         lfn_sample_replicate_cutoff = self.option("lfn_sample_replicate_cutoff")
         lfn_read_count_cutoff = self.option("lfn_read_count_cutoff")
+        filter_lfn_storage = self.option("filter_lfn_storage")
+        if filter_lfn_storage is None:
+            filter_lfn_storage = 'full'
+        if not (filter_lfn_storage in filter_lfn_storage_list):
+            Logger.instance().error(VTAMexception(
+                "The filter_lfn_storage parameter must be one of: {}".format(', '.join(filter_lfn_storage_list))))
+            sys.exit(1)
 
         ############################################################################################
         #
@@ -125,7 +136,8 @@ class FilterLFN(ToolWrapper):
             lfn_variant_replicate_cutoff=lfn_variant_replicate_cutoff,
             lfn_variant_replicate_specific_cutoff=lfn_variant_replicate_specific_cutoff_df,
             lfn_sample_replicate_cutoff=lfn_sample_replicate_cutoff,
-            lfn_read_count_cutoff=lfn_read_count_cutoff)
+            lfn_read_count_cutoff=lfn_read_count_cutoff,
+            filter_lfn_storage=filter_lfn_storage)
 
         DataframeVariantReadCountLike(variant_read_count_delete_df).to_sql(
             engine=engine, variant_read_count_like_model=output_filter_lfn_model)
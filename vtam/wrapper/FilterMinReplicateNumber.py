@@ -1,3 +1,4 @@
+from vtam.utils.SqliteTuning import SqliteTuning
 from vtam.utils.RunnerFilterMinReplicateNumber import RunnerFilterMinReplicateNumber
 from vtam.utils.FileSampleInformation import FileSampleInformation
 from vtam.utils.DataframeVariantReadCountLike import DataframeVariantReadCountLike
@@ -50,6 +51,7 @@ class FilterMinReplicateNumber(ToolWrapper):
     def run(self):
         session = self.session
         engine = session._session().get_bind()
+        SqliteTuning.listen(engine)
 
         #######################################################################
         #
@@ -1,5 +1,6 @@
 from wopmars.models.ToolWrapper import ToolWrapper
 from vtam import Logger
+from vtam.utils.SqliteTuning import SqliteTuning
 from vtam.utils.RunnerFilterPCRerror import RunnerFilterPCRerror
 from vtam.utils.FileSampleInformation import FileSampleInformation
 from vtam.utils.DataframeVariantReadCountLike import DataframeVariantReadCountLike
@@ -56,6 +57,7 @@ class FilterPCRerror(ToolWrapper):
     def run(self):
         session = self.session
         engine = session._session().get_bind()
+        SqliteTuning.listen(engine)
 
         this_temp_dir = os.path.join(
             PathManager.instance().get_tempdir(),
@@ -102,54 +104,51 @@ class FilterPCRerror(ToolWrapper):
 
         ############################################################################################
         #
-        # Run per sample_id
+        # Run per run_id and marker_id
         #
         ############################################################################################
 
         variant_df = sample_info_tsv_obj.get_variant_df(
-            variant_read_count_like_model=input_filter_min_replicate_model, engine=engine)
+            variant_read_count_like_model=input_filter_min_replicate_model, engine=engine,
+            variant_read_count_like_df=variant_read_count_df)
 
         record_list = []
 
-        run_marker_sample_df = variant_read_count_df[[
-            'run_id', 'marker_id', 'sample_id']].drop_duplicates()
-        for row in run_marker_sample_df.itertuples():
+        run_marker_df = variant_read_count_df[['run_id', 'marker_id']].drop_duplicates()
+        for row in run_marker_df.itertuples():
             run_id = row.run_id
             marker_id = row.marker_id
-            sample_id = row.sample_id
 
-            # Get variant read for the current run-marker-sample
-            variant_read_count_per_sample_df = variant_read_count_df.loc[(variant_read_count_df.run_id == run_id) & (
-                variant_read_count_df.marker_id == marker_id) & (variant_read_count_df.sample_id == sample_id)]
+            # Get variant read for the current run-marker
+            variant_read_count_per_run_marker_df = variant_read_count_df.loc[
+                (variant_read_count_df.run_id == run_id) & (variant_read_count_df.marker_id == marker_id)]
 
-            variant_per_sample_df = variant_df.loc[variant_df.index.isin(variant_read_count_per_sample_df.variant_id.unique().tolist())]
-            this_step_tmp_per_sample_dir = os.path.join(
-                this_temp_dir, "run_{}_marker_{}_sample{}".format(
-                    run_id, marker_id, sample_id))
-            pathlib.Path(this_step_tmp_per_sample_dir).mkdir(exist_ok=True)
+            variant_per_run_marker_df = variant_df.loc[variant_df.index.isin(
+                variant_read_count_per_run_marker_df.variant_id.unique().tolist())]
 
             ########################################################################################
             #
-            # Run vsearch and get alignement variant_read_count_input_df
+            # Run vsearch once on all variants of the run-marker and join the variant pairs
+            # to the N_ij of each sample
             #
             ########################################################################################
 
             filter_pcr_error_runner = RunnerFilterPCRerror(
-                variant_expected_df=variant_per_sample_df,
-                variant_unexpected_df=variant_per_sample_df,
-                variant_read_count_df=variant_read_count_per_sample_df)
-            filter_output_per_sample_df = filter_pcr_error_runner.get_variant_read_count_delete_df(
+                variant_expected_df=variant_per_run_marker_df,
+                variant_unexpected_df=variant_per_run_marker_df,
+                variant_read_count_df=variant_read_count_per_run_marker_df)
+            filter_output_per_run_marker_df = filter_pcr_error_runner.get_variant_read_count_delete_df(
                 pcr_error_var_prop)
 
             ########################################################################################
             #
-            # Per sample add to record list
+            # Per run-marker add to record list
             #
             ########################################################################################
 
-            record_per_sample_list = ModelVariantReadCountLike.filter_delete_df_to_dict(
-                filter_output_per_sample_df)
-            record_list = record_list + record_per_sample_list
+            record_per_run_marker_list = ModelVariantReadCountLike.filter_delete_df_to_dict(
+                filter_output_per_run_marker_df)
+            record_list = record_list + record_per_run_marker_list
 
         variant_read_count_delete_df = pandas.DataFrame.from_records(
             data=record_list)
@@ -1,6 +1,7 @@
 import pandas
 import sys
 
+from vtam.utils.SqliteTuning import SqliteTuning
 from vtam.utils.RunnerFilterRenkonen import RunnerFilterRenkonen
 from vtam.utils.Logger import Logger
 from vtam.utils.FileSampleInformation import FileSampleInformation
@@ -50,6 +51,7 @@ class FilterRenkonen(ToolWrapper):
     def run(self):
         session = self.session
         engine = session._session().get_bind()
+        SqliteTuning.listen(engine)
 
         ############################################################################################
         #
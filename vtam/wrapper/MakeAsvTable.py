@@ -1,5 +1,6 @@
 from wopmars.models.ToolWrapper import ToolWrapper
 
+from vtam.utils.SqliteTuning import SqliteTuning
 from vtam.utils.RunnerAsvTable import RunnerAsvTable
 from vtam.utils.FileKnownOccurrences import FileKnownOccurrences
 from vtam.utils.FileSampleInformation import FileSampleInformation
@@ -56,6 +57,7 @@ class MakeAsvTable(ToolWrapper):
     def run(self):
         session = self.session
         engine = session._session().get_bind()
+        SqliteTuning.listen(engine)
 
         #######################################################################
         #
@@ -1,7 +1,9 @@
 import numpy
+from vtam.utils.SqliteTuning import SqliteTuning
 from vtam.utils.RunnerOptimizeLFNreadCountAndVariantRunMarker import \
     RunnerOptimizeLFNreadCountAndVariantRunMarker
 
+from vtam.utils import constants
 from vtam.utils.constants import lfn_ni_njk_cutoff_global_max, lfn_nijk_cutoff_global_max, \
     lfn_nijk_cutoff_lst_size
 
@@ -63,6 +65,8 @@ class OptimizeLFNreadCountAndLFNvariant(ToolWrapper):
             "lfn_sample_replicate_cutoff": "required|float",
             "lfn_read_count_cutoff": "required|float",
             "min_replicate_number": "required|int",
+            "lfn_read_count_cutoff_lst_size": "int",
+            "lfn_variant_cutoff_lst_size": "int",
         }
 
     def run(self):
@@ -92,6 +96,7 @@ class OptimizeLFNreadCountAndLFNvariant(ToolWrapper):
         """
         session = self.session
         engine = session._session().get_bind()
+        SqliteTuning.listen(engine)
 
         ############################################################################################
         #
@@ -115,12 +120,20 @@ class OptimizeLFNreadCountAndLFNvariant(ToolWrapper):
         min_replicate_number = self.option("min_replicate_number")
         lfn_njk_cutoff = self.option("lfn_sample_replicate_cutoff")
         lfn_nijk_cutoff = int(self.option("lfn_read_count_cutoff"))
+        lfn_nijk_cutoff_lst_size = self.option("lfn_read_count_cutoff_lst_size")
+        if lfn_nijk_cutoff_lst_size is None:
+            lfn_nijk_cutoff_lst_size = constants.lfn_nijk_cutoff_lst_size
+        lfn_ni_njk_cutoff_lst_size = self.option("lfn_variant_cutoff_lst_size")
+        if lfn_ni_njk_cutoff_lst_size is None:
+            lfn_ni_njk_cutoff_lst_size = constants.lfn_ni_njk_cutoff_lst_size
 
         filter_kwargs = {"lfn_ni_cutoff": lfn_ni_cutoff,
                          "lfn_nik_cutoff": lfn_nik_cutoff,
                          "lfn_njk_cutoff": lfn_njk_cutoff,
                          "lfn_nijk_cutoff": lfn_nijk_cutoff,
                          'min_replicate_number': min_replicate_number,
+                         'lfn_nijk_cutoff_lst_size': lfn_nijk_cutoff_lst_size,
+                         'lfn_ni_njk_cutoff_lst_size': lfn_ni_njk_cutoff_lst_size,
                       }
 
         ############################################################################################
@@ -1,3 +1,4 @@
+from vtam.utils.SqliteTuning import SqliteTuning
 from vtam.utils.RunnerOptimizeLFNsampleReplicate import RunnerOptimizeLFNsampleReplicate
 from vtam.utils.FileSampleInformation import FileSampleInformation
 from vtam.utils.FileKnownOccurrences import FileKnownOccurrences
@@ -49,6 +50,7 @@ class OptimizeLFNsampleReplicate(ToolWrapper):
     def run(self):
         session = self.session
         engine = session._session().get_bind()
+        SqliteTuning.listen(engine)
 
         ############################################################################################
         #
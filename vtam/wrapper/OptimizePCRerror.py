@@ -1,6 +1,7 @@
 import os
 import pathlib
 
+from vtam.utils.SqliteTuning import SqliteTuning
 from vtam.models.VariantReadCount import VariantReadCount
 from vtam.utils.FileKnownOccurrences import FileKnownOccurrences
 from vtam.utils.RunnerOptimizePCRerror import RunnerOptimizePCRerror
@@ -56,6 +57,7 @@ class OptimizePCRerror(ToolWrapper):
     def run(self):
         session = self.session
         engine = session._session().get_bind()
+        SqliteTuning.listen(engine)
 
         this_temp_dir = os.path.join(
             PathManager.instance().get_tempdir(),
@@ -2,6 +2,7 @@
 import pandas
 
 from wopmars.models.ToolWrapper import ToolWrapper
+from vtam.utils.SqliteTuning import SqliteTuning
 from vtam.utils.FileSampleInformation import FileSampleInformation
 from vtam.utils.ModelVariantReadCountLike import ModelVariantReadCountLike
 
@@ -49,6 +50,7 @@ class ReadCountAverageOverReplicates(ToolWrapper):
     def run(self):
         session = self.session
         engine = session._session().get_bind()
+        SqliteTuning.listen(engine)
         #
         # Input file output
         fasta_info_tsv = self.input_file(
@@ -139,10 +141,8 @@ class ReadCountAverageOverReplicates(ToolWrapper):
 
         record_list = ModelVariantReadCountLike.filter_delete_df_to_dict(
             variant_read_count_delete_df)
-        with engine.connect() as conn:
-
-            # Insert new instances
-            conn.execute(consensus_model.__table__.insert(), record_list)
+        ModelVariantReadCountLike(engine=engine, variant_read_count_like_model=consensus_model)\
+            .bulk_insert(record_list)
 
         #######################################################################
         #
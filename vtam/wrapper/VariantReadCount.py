@@ -1,5 +1,7 @@
 #standard imports
+import collections
 import inspect
+import multiprocessing
 import os
 import sys
 import gzip 
@@ -7,15 +9,16 @@ import bz2
 from functools import partial
 
 #third party imports
-from Bio import SeqIO
 import pandas
 import sqlalchemy
 from sqlalchemy import select, bindparam, func
 
 
 #local imports
+from vtam.utils.SqliteTuning import SqliteTuning
 from vtam.utils.Logger import Logger
 from vtam.utils.FileSampleInformation import FileSampleInformation
+from vtam.utils.VariantSequenceHash import VariantSequenceHash
 from vtam.utils.VTAMexception import VTAMexception
 from vtam.utils.DataframeVariantReadCountLike import DataframeVariantReadCountLike
 from wopmars.models.ToolWrapper import ToolWrapper
@@ -23,13 +26,6 @@ from wopmars.models.ToolWrapper import ToolWrapper
 
 
 
-# Compatible with both pre- and post Biopython 1.78:
-try:
-    from Bio.Alphabet import generic_dna
-except ImportError:
-    generic_dna = None
-
-
 class VariantReadCount(ToolWrapper):
 
     __mapper_args__ = {
@@ -78,26 +74,99 @@ class VariantReadCount(ToolWrapper):
         }
 
     @staticmethod
-    def get_sorted_read_list(file_path, generic_dna=None):
-        """
-        handles reading file from compressed or uncompressed file
+    def get_sorted_read_count_dic(file_path):
+        """Counts the reads of a sorted FASTA file, compressed or not. The file is parsed as bytes
+        by blocks of lines, so memory depends on the number of unique sequences, not reads.
+        Sequences can span several lines.
+
+        :param file_path: Path to the sorted FASTA file
+        :return: collections.Counter with uppercase sequences as keys and read counts as values
         """
         if file_path.endswith(".gz"):
-            _open = partial(gzip.open, mode='rt')
+            _open = partial(gzip.open)
         elif file_path.endswith(".bz2"):
-            _open = partial(bz2.open, mode='rt') 
+            _open = partial(bz2.open)
         else:
             _open = open
 
-        with _open(file_path) as handle:
-            res = [str(seq_record.seq).upper() for seq_record in SeqIO.parse(handle, "fasta", alphabet=generic_dna)]
-            return res
+        read_count_bytes_dic = collections.Counter()
+        sequence_list = None  # Lines of the current sequence
+        with _open(file_path, 'rb') as fin:
+            line_list = fin.readlines(1024 * 1024)
+            while line_list:
+                for line in line_list:
+                    if line.startswith(b'>'):
+                        if sequence_list is not None:
+                            read_count_bytes_dic[b''.join(sequence_list)] += 1
+                        sequence_list = []
+                    elif sequence_list is not None:  # Lines before the first header are ignored
+                        sequence_list.append(line.strip())
+                line_list = fin.readlines(1024 * 1024)
+        if sequence_list is not None:
+            read_count_bytes_dic[b''.join(sequence_list)] += 1
+
+        # Sequences are normalized once per unique sequence
+        read_count_dic = collections.Counter()
+        for sequence in read_count_bytes_dic:
+            read_count_dic[sequence.replace(b' ', b'').decode().upper()] += read_count_bytes_dic[sequence]
+        return read_count_dic
+
+    @staticmethod
+    def get_read_count_df(read_file):
+        """Dereplicates one sorted file
+
+        :param read_file: tuple (run_id, marker_id, sample_id, replicate, FASTA path, dereplicated path or None)
+        :return: DataFrame with columns run_id, marker_id, sample_id, replicate, read_sequence, read_count
+            or None if the file does not exist
+        """
+        run_id, marker_id, sample_id, replicate, read_fasta_path, read_derep_path = read_file
+
+        if read_derep_path is not None and os.path.exists(read_derep_path):
+
+            Logger.instance().debug(
+                "file: {}; line: {}; Read dereplicated file: {}".format(
+                    __file__, inspect.currentframe().f_lineno, read_derep_path))
+
+            read_count_df = VariantReadCount.get_derep_read_count_df(read_derep_path)
+
+        elif os.path.exists(read_fasta_path):
+
+            Logger.instance().debug(
+                "file: {}; line: {}; Read FASTA: {}".format(
+                    __file__, inspect.currentframe().f_lineno, read_fasta_path))
+
+            read_count_dic = VariantReadCount.get_sorted_read_count_dic(read_fasta_path)
+            read_count_df = pandas.DataFrame({'read_sequence': list(read_count_dic.keys()),
+                                              'read_count': list(read_count_dic.values())})
+
+        else:
+            Logger.instance().warning('This file {} doest not exists'.format(read_fasta_path))
+            return None
+
+        read_count_df.insert(0, 'replicate', replicate)
+        read_count_df.insert(0, 'sample_id', sample_id)
+        read_count_df.insert(0, 'marker_id', marker_id)
+        read_count_df.insert(0, 'run_id', run_id)
+        return read_count_df
+
+    @staticmethod
+    def get_derep_read_count_df(file_path):
+        """Reads the dereplicated file written by 'vtam sortreads --dereplicate'
+
+        :param file_path: TSV file (Possibly compressed) with columns sequence and count
+        :return: DataFrame with columns read_sequence, read_count
+        """
+        derep_df = pandas.read_csv(file_path, sep="\t", header=0, dtype={'sequence': str, 'count': int},
+                                   keep_default_na=False)
+        derep_df.columns = ['read_sequence', 'read_count']
+        return derep_df
   
 
 
     def run(self):
         session = self.session
         engine = session._session().get_bind()
+        SqliteTuning.listen(engine)
 
         #######################################################################
         #
@@ -215,54 +284,34 @@ class VariantReadCount(ToolWrapper):
             "file: {}; line: {}; Read demultiplexed FASTA files".format(
                 __file__, inspect.currentframe().f_lineno))
 
-        variant_read_count_df = pandas.DataFrame()
-
+        # One job per sorted file: (run_id, marker_id, sample_id, replicate, FASTA path, dereplicated path or None)
+        read_file_list = []
         for row in sample_info_ids_df.itertuples():
-            run_id = row.run_id
-            marker_id = row.marker_id
-            sample_id = row.sample_id
-            replicate = row.replicate
-            read_fasta = row.sortedfasta
+            # Prefer the dereplicated file of 'vtam sortreads --dereplicate' if available
+            read_derep_path = None
+            if 'sortedderep' in sample_info_ids_df.columns and isinstance(row.sortedderep, str):
+                read_derep_path = os.path.join(read_dir, row.sortedderep)
+            read_file_list.append((row.run_id, row.marker_id, row.sample_id, row.replicate,
+                                   os.path.join(read_dir, row.sortedfasta), read_derep_path))
+
+        # Files are dereplicated in parallel and the partial counts are concatenated once
+        if os.getenv('VTAM_THREADS') is None:
+            num_threads = multiprocessing.cpu_count()
+        else:
+            num_threads = int(os.getenv('VTAM_THREADS'))
+        num_processes = max(1, min(num_threads, len(read_file_list)))
+        if num_processes > 1:
+            with multiprocessing.Pool(processes=num_processes) as pool:
+                variant_read_count_df_list = pool.map(VariantReadCount.get_read_count_df, read_file_list, chunksize=1)
+        else:
+            variant_read_count_df_list = [VariantReadCount.get_read_count_df(read_file) for read_file in read_file_list]
 
-            Logger.instance().debug(
-                "file: {}; line: {}; Read FASTA: {}".format(
-                    __file__, inspect.currentframe().f_lineno, read_fasta))
-
-            read_fasta_path = os.path.join(read_dir, read_fasta)
-
-            if os.path.exists(read_fasta_path):
-
-                ####################################################################################
-                #
-                # Read FASTA
-                #
-                ####################################################################################
-                
-                sorted_read_list = VariantReadCount.get_sorted_read_list(read_fasta_path, generic_dna)
-
-                variant_read_count_df_sorted_i = pandas.DataFrame(
-                    {
-                        'run_id': [run_id] *
-                        len(sorted_read_list),
-                        'marker_id': [marker_id] *
-                        len(sorted_read_list),
-                        'sample_id': [sample_id] *
-                        len(sorted_read_list),
-                        'replicate': [replicate] *
-                        len(sorted_read_list),
-                        'read_sequence': sorted_read_list,
-                        'read_count': [1] *
-                        len(sorted_read_list)})
-                #  Compute read count
-                variant_read_count_df_sorted_i = variant_read_count_df_sorted_i.groupby(
-                    ['run_id', 'marker_id', 'sample_id', 'replicate', 'read_sequence']).sum().reset_index()
-
-                #variant_read_count_df = variant_read_count_df.append(
-                #    variant_read_count_df_sorted_i)
-                variant_read_count_df = pandas.concat([variant_read_count_df, variant_read_count_df_sorted_i], axis=0)
-
-            else:
-                Logger.instance().warning('This file {} doest not exists'.format(read_fasta_path))
+        variant_read_count_df_list = [df for df in variant_read_count_df_list if df is not None]
+        if len(variant_read_count_df_list) > 0:
+            variant_read_count_df = pandas.concat(variant_read_count_df_list, axis=0)
+        else:
+            variant_read_count_df = pandas.DataFrame(
+                columns=['run_id', 'marker_id', 'sample_id', 'replicate', 'read_sequence', 'read_count'])
 
         #######################################################################
         #
@@ -308,43 +357,31 @@ class VariantReadCount(ToolWrapper):
 
         Logger.instance().debug("file: {}; line: {}; Insert variants".format(
                 __file__, inspect.currentframe().f_lineno))
-        variant_read_count_instance_list = []
         variant_read_count_df.sort_values(
             by=['variant_sequence', 'run_id', 'marker_id', 'sample_id', 'replicate'], inplace=True)
-        variant_new_set = set()
-        variant_new_instance_list = []
+        # Unique sequences in sorted order, so that new variants get increasing ids in this order
+        variant_sequence_list = variant_read_count_df.variant_sequence.unique().tolist()
         with engine.connect() as conn:
             # Retrieve maximal variant id if possible
             select_variant_id_max = conn.execute(sqlalchemy.select(
                 [func.max(variant_model.__table__.c.id)])).first()[0]
             if select_variant_id_max is None:
                 select_variant_id_max = 0  # If no variants, then maximal variant id is 0
-            for row in variant_read_count_df.itertuples():
-                run_id = row.run_id
-                marker_id = row.marker_id
-                sample_id = row.sample_id
-                replicate = row.replicate
-                variant_sequence = row.variant_sequence
-                read_count = row.read_count
-                select_row = conn.execute(sqlalchemy.select([variant_model.__table__.c.id]) .where(
-                    variant_model.__table__.c.sequence == variant_sequence)).first()
-                if select_row is None:  # variant_sequence IS NOT in the database, so will INSERT it
-                    if not (variant_sequence in variant_new_set):
-                        variant_id = select_variant_id_max + \
-                            len(variant_new_instance_list) + 1
-                        variant_new_set.add(variant_sequence)
-                        variant_new_instance_list.append(
-                            {'id': variant_id, 'sequence': variant_sequence})
-                else:  # variant_sequence IS in the database
-                    variant_id = select_row[0]
-                variant_read_count_instance_list.append(
-                    {
-                        'run_id': run_id,
-                        'marker_id': marker_id,
-                        'variant_id': variant_id,
-                        'sample_id': sample_id,
-                        'replicate': replicate,
-                        'read_count': read_count})
+            # Ids of the sequences already in the database, with one join against a temporary table of hashes
+            variant_id_dic = VariantSequenceHash.select_id_dic(conn=conn, variant_sequence_list=variant_sequence_list)
+
+        # Sequences not in the database will be inserted
+        variant_new_instance_list = []
+        for variant_sequence in variant_sequence_list:
+            if not (variant_sequence in variant_id_dic):
+                variant_id = select_variant_id_max + len(variant_new_instance_list) + 1
+                variant_id_dic[variant_sequence] = variant_id
+                variant_new_instance_list.append({'id': variant_id, 'sequence': variant_sequence,
+                                                  'sequence_hash': VariantSequenceHash.get_hash(variant_sequence)})
+
+        variant_read_count_df['variant_id'] = variant_read_count_df.variant_sequence.map(variant_id_dic)
+        variant_read_count_instance_list = variant_read_count_df[
+            ['run_id', 'marker_id', 'variant_id', 'sample_id', 'replicate', 'read_count']].to_dict('records')
 
         #######################################################################
         #